@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Batch Compare - One-to-many and all-pairs UI comparison
+
+Scores one reference against many candidates, or builds an N×N similarity
+matrix over a library of .ui files. Every file is parsed exactly once; the
+extracted widget models are handed to the worker processes when the pool
+starts, and pairs are compared in parallel and streamed as JSONL records.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from ui_comparator import UIComparator, WidgetInfo, load_scoring_profile
+
+
+Model = Tuple[str, Dict[str, WidgetInfo]]  # (content hash, widgets)
+
+# Models available to the current (worker) process, keyed by path
+_WORKER_MODELS: Dict[str, Model] = {}
+_WORKER_OPTIONS: Dict[str, Any] = {}
+
+
+def expand_ui_paths(paths: Iterable[str]) -> List[str]:
+    """
+    Expand directories into the .ui files they contain.
+
+    Args:
+        paths: .ui files and/or directories
+
+    Returns:
+        Sorted, de-duplicated list of .ui file paths
+    """
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files.extend(str(p) for p in sorted(path.rglob("*.ui")))
+        else:
+            files.append(str(path))
+    return list(dict.fromkeys(files))
+
+
+def parse_model(ui_file: str) -> Model:
+    """Parse a .ui file into (content hash, widgets)."""
+    return UIComparator()._load_model(ui_file)
+
+
+def _parse_entry(ui_file: str) -> Tuple[str, Optional[Model], Optional[str]]:
+    """Pool task: parse one file, returning an error message instead of raising."""
+    try:
+        return ui_file, parse_model(ui_file), None
+    except Exception as e:
+        return ui_file, None, str(e)
+
+
+def _init_worker(models: Dict[str, Model], options: Dict[str, Any]):
+    """Pool initializer: receive the shared widget models once per worker."""
+    _WORKER_MODELS.update(models)
+    _WORKER_OPTIONS.update(options)
+
+
+def _model(ui_file: str) -> Model:
+    """Shared model from _init_worker, else a fresh parse that is not kept."""
+    model = _WORKER_MODELS.get(ui_file)
+    if model is None:
+        model = parse_model(ui_file)
+    return model
+
+
+def _compare_pair(pair: Tuple[str, str]) -> Dict[str, Any]:
+    """Pool task: compare one reference/target pair into a JSON record."""
+    reference, target = pair
+    record = {"reference": reference, "target": target}
+    try:
+        comparator = UIComparator(_WORKER_OPTIONS.get("profile"))
+        comparator.reference_hash, comparator.reference_widgets = _model(reference)
+        comparator.target_hash, comparator.target_widgets = _model(target)
+        result = comparator.compare(match=_WORKER_OPTIONS.get("match", "name"))
+    except Exception as e:
+        record.update({"status": "error", "message": str(e)})
+        return record
+
+    record.update({
+        "status": "success",
+        "similarity_score": result.similarity_score,
+        "identical": comparator.reference_hash == comparator.target_hash,
+        "matching": len(result.matching_widgets),
+        "missing": len(result.missing_widgets),
+        "extra": len(result.extra_widgets),
+        "changed": len(result.property_differences)
+    })
+    if _WORKER_OPTIONS.get("detailed"):
+        record["result"] = result.to_dict()
+    return record
+
+
+def _run_pairs(pairs: List[Tuple[str, str]], models: Dict[str, Model],
+               workers: Optional[int], options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Compare pairs (in order) serially or in a process pool."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(pairs) <= 1:
+        _init_worker(models, options)
+        try:
+            for pair in pairs:
+                yield _compare_pair(pair)
+        finally:
+            _WORKER_MODELS.clear()
+            _WORKER_OPTIONS.clear()
+        return
+
+    chunksize = max(1, len(pairs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(models, options)) as pool:
+        yield from pool.map(_compare_pair, pairs, chunksize=chunksize)
+
+
+def _parse_all(files: List[str], workers: Optional[int]) -> Tuple[Dict[str, Model], Dict[str, str]]:
+    """Parse every file once (in parallel); returns (models, errors)."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(files) <= 1:
+        entries = map(_parse_entry, files)
+        return _collect(entries)
+
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _collect(pool.map(_parse_entry, files, chunksize=chunksize))
+
+
+def _collect(entries) -> Tuple[Dict[str, Model], Dict[str, str]]:
+    models, errors = {}, {}
+    for ui_file, model, error in entries:
+        if model is None:
+            errors[ui_file] = error
+        else:
+            models[ui_file] = model
+    return models, errors
+
+
+def compare_one_to_many(reference_ui: str, target_uis: Iterable[str],
+                        workers: Optional[int] = None, match: str = "name",
+                        detailed: bool = False, profile: Optional[Any] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Compare one reference against many targets.
+
+    The reference is parsed once in this process and shared with the
+    workers; each target is parsed by the worker that compares it.
+
+    Args:
+        reference_ui: Reference .ui file path
+        target_uis: Target .ui file paths
+        workers: Worker processes (default: CPU count, 1 = in-process)
+        match: Widget matching mode passed to UIComparator.compare
+        detailed: Include the full ComparisonResult in each record
+        profile: Optional scoring profile (ScoringProfile, dict or JSON path)
+
+    Yields:
+        One record per target, in input order
+    """
+    if match not in ("name", "assignment"):
+        raise ValueError(f"Unknown match mode: {match}")
+
+    options = {"match": match, "detailed": detailed, "profile": load_scoring_profile(profile)}
+    models = {reference_ui: parse_model(reference_ui)}
+    pairs = [(reference_ui, target) for target in target_uis]
+    yield from _run_pairs(pairs, models, workers, options)
+
+
+def compare_all_pairs(ui_files: Iterable[str], workers: Optional[int] = None,
+                      match: str = "name", detailed: bool = False,
+                      profile: Optional[Any] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Compare every ordered pair of distinct files.
+
+    Similarity is normalized by the reference's widget count, so A→B and
+    B→A are both computed.
+
+    Args:
+        ui_files: .ui file paths
+        workers: Worker processes (default: CPU count, 1 = in-process)
+        match: Widget matching mode passed to UIComparator.compare
+        detailed: Include the full ComparisonResult in each record
+        profile: Optional scoring profile (ScoringProfile, dict or JSON path)
+
+    Yields:
+        One record per ordered pair (row-major), plus an error record per
+        file that failed to parse
+    """
+    if match not in ("name", "assignment"):
+        raise ValueError(f"Unknown match mode: {match}")
+
+    options = {"match": match, "detailed": detailed, "profile": load_scoring_profile(profile)}
+    files = list(dict.fromkeys(ui_files))
+    models, errors = _parse_all(files, workers)
+
+    for ui_file, message in errors.items():
+        yield {"reference": ui_file, "target": None, "status": "error", "message": message}
+
+    files = [f for f in files if f in models]
+    pairs = [(a, b) for a in files for b in files if a != b]
+    yield from _run_pairs(pairs, models, workers, options)
+
+
+def similarity_matrix(ui_files: Iterable[str], workers: Optional[int] = None,
+                      match: str = "name", profile: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    N×N similarity matrix (rows: reference, columns: target).
+
+    Returns:
+        {"files": [...], "matrix": [[...]]}; unparseable files are omitted
+        and listed under "errors"
+    """
+    files = list(dict.fromkeys(ui_files))
+    index = {f: i for i, f in enumerate(files)}
+    matrix = [[1.0 if i == j else None for j in range(len(files))] for i in range(len(files))]
+    errors = {}
+
+    for record in compare_all_pairs(files, workers=workers, match=match, profile=profile):
+        if record["status"] != "success":
+            errors[record["reference"]] = record["message"]
+            continue
+        matrix[index[record["reference"]]][index[record["target"]]] = record["similarity_score"]
+
+    keep = [i for i, f in enumerate(files) if f not in errors]
+    return {
+        "files": [files[i] for i in keep],
+        "matrix": [[matrix[i][j] for j in keep] for i in keep],
+        "errors": errors
+    }
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    """
+    Write records as JSON lines, flushing each one.
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        stream.flush()
+        count += 1
+    return count
+
+
+def main():
+    """Batch comparison CLI."""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Batch UI comparison")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--match", default="name", choices=("name", "assignment"))
+    parser.add_argument("--detailed", action="store_true", help="Include full comparison results")
+    parser.add_argument("--profile", help="Scoring profile JSON")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_one = sub.add_parser("one-to-many", help="Score a reference against many targets")
+    p_one.add_argument("reference")
+    p_one.add_argument("targets", nargs="+", help=".ui files or directories")
+
+    p_all = sub.add_parser("all-pairs", help="Compare every pair of files")
+    p_all.add_argument("paths", nargs="+", help=".ui files or directories")
+    p_all.add_argument("--matrix", help="Also write the N×N similarity matrix (JSON)")
+
+    args = parser.parse_args()
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+
+    try:
+        if args.command == "one-to-many":
+            targets = [t for t in expand_ui_paths(args.targets) if t != args.reference]
+            records = compare_one_to_many(args.reference, targets, workers=args.workers,
+                                          match=args.match, detailed=args.detailed,
+                                          profile=args.profile)
+            write_jsonl(records, out)
+
+        elif args.command == "all-pairs":
+            files = expand_ui_paths(args.paths)
+            if args.matrix:
+                files_index = {f: i for i, f in enumerate(files)}
+                matrix = [[1.0 if i == j else None for j in range(len(files))]
+                          for i in range(len(files))]
+
+                def tee(records):
+                    for record in records:
+                        if record["status"] == "success":
+                            i = files_index[record["reference"]]
+                            matrix[i][files_index[record["target"]]] = record["similarity_score"]
+                        yield record
+
+                write_jsonl(tee(compare_all_pairs(files, workers=args.workers, match=args.match,
+                                                  detailed=args.detailed, profile=args.profile)), out)
+                with open(args.matrix, "w", encoding="utf-8") as f:
+                    json.dump({"files": files, "matrix": matrix}, f, indent=1)
+            else:
+                write_jsonl(compare_all_pairs(files, workers=args.workers, match=args.match,
+                                              detailed=args.detailed, profile=args.profile), out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -100,18 +100,68 @@ class EditorClient:
         """Reload the .ui file in the editor."""
         return self.send_command("reload_ui")
 
-    def take_screenshot(self, output_path: str = "screenshots/screenshot.png") -> Dict:
+    def take_screenshot(self, output_path: str = "screenshots/screenshot.png",
+                        save: bool = True) -> Dict:
         """
         Take a screenshot of the UI.
 
         Args:
             output_path: Where to save screenshot
+            save: Write the screenshot to output_path (otherwise only return it)
 
         Returns:
-            Response with screenshot_base64 and path
+            Response with screenshot_base64 and path (None if not saved)
         """
+        if not save:
+            return self.send_command("take_screenshot", path=output_path, save=False)
         return self.send_command("take_screenshot", path=output_path)
 
+    def render_ui(self, ui_file: str, geometry: bool = False, transport: str = "base64") -> Dict:
+        """
+        Render a .ui file off-screen without replacing the displayed UI.
+
+        Args:
+            ui_file: Absolute path to .ui file
+            geometry: Also return the rendered widget rects
+            transport: "base64" (PNG in the response) or "shm" (raw RGBA in a
+                shared memory segment, same host only; map it with
+                image_utils.shared_frame)
+
+        Returns:
+            Response with width, height, screenshot_base64 or frame (and geometry)
+        """
+        params = {"ui_file": ui_file}
+        if geometry:
+            params["geometry"] = True
+        if transport != "base64":
+            params["transport"] = transport
+        return self.send_command("render_ui", **params)
+
+    def release_frame(self, name: str) -> Dict:
+        """
+        Free a shared memory frame from render_ui(transport="shm") that
+        could not be mapped here (editor on another host or /dev/shm
+        namespace). Mapped frames are freed by image_utils.shared_frame.
+
+        Args:
+            name: The frame's "shm" name
+
+        Returns:
+            Response with released (False if the segment was already gone)
+        """
+        return self.send_command("release_frame", shm=name)
+
+    def get_widget_geometry(self) -> Dict:
+        """
+        Get rendered widget rects of the displayed UI.
+
+        Returns:
+            Response with geometry: {width, height, device_pixel_ratio,
+            widgets: [{name, class, parent, x, y, width, height, visible, enabled,
+            text?, font_point_size?, bold?}]}
+        """
+        return self.send_command("get_widget_geometry")
+
     def get_widget_tree(self) -> Dict:
         """
         Get the widget hierarchy.
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Golden Store - Content-addressed screenshot storage
+
+Stores rendered screenshots by SHA-256 of their bytes, so identical frames
+are kept once no matter how many UI files or renders produce them. An index
+maps (ui file content hash, render params) to the image hash, which lets
+visual regression fetch a golden image without re-rendering.
+
+Layout:
+    <root>/objects/<first 2 hex>/<sha256>.png
+    <root>/index.json
+
+Reads only touch the image file; its mtime is the last use that retention
+goes by, so the index is written by put() and eviction only.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+DEFAULT_STORE_DIR = "screenshots/store"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Streaming SHA-256 of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class GoldenImageStore:
+    """Content-addressed image store with size-bounded LRU retention."""
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize golden image store.
+
+        Args:
+            root: Store directory (created on first write)
+            max_bytes: Total image bytes kept before least recently used
+                images are evicted
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.index_path = self.root / "index.json"
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Any]:
+        """Load index from disk (empty index if missing or corrupt)."""
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("version") == 1:
+                    return index
+            except (OSError, json.JSONDecodeError):
+                pass
+        return {"version": 1, "objects": {}, "entries": {}}
+
+    def _save_index(self):
+        """Write index atomically."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def _object_path(self, image_hash: str) -> Path:
+        return self.root / "objects" / image_hash[:2] / f"{image_hash}.png"
+
+    @staticmethod
+    def entry_key(ui_hash: str, render_params: Optional[Dict[str, Any]] = None) -> str:
+        """Index key for a UI content hash and render parameters."""
+        params = json.dumps(render_params or {}, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{ui_hash}\0{params}".encode("utf-8")).hexdigest()
+
+    def put(self, ui_file: str, image_data: bytes,
+            render_params: Optional[Dict[str, Any]] = None,
+            ui_hash: Optional[str] = None) -> str:
+        """
+        Store a rendered image for a UI file.
+
+        Args:
+            ui_file: Path to the .ui file that was rendered
+            image_data: PNG bytes
+            render_params: Parameters that affect rendering (size, style, ...)
+            ui_hash: Precomputed content hash of ui_file
+
+        Returns:
+            SHA-256 hash of the image
+        """
+        ui_hash = ui_hash or hash_file(ui_file)
+        image_hash = hashlib.sha256(image_data).hexdigest()
+        now = time.time()
+
+        # Dedupe: identical frames share one object
+        objects = self._index["objects"]
+        if image_hash not in objects or not self._object_path(image_hash).exists():
+            path = self._object_path(image_hash)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(image_data)
+            os.replace(tmp_path, path)
+            objects[image_hash] = {"size": len(image_data), "created": now}
+        self._touch(image_hash)
+
+        self._index["entries"][self.entry_key(ui_hash, render_params)] = {
+            "ui_file": str(ui_file),
+            "ui_hash": ui_hash,
+            "image_hash": image_hash,
+            "render_params": render_params or {},
+            "created": now
+        }
+
+        self.enforce_retention()
+        self._save_index()
+        return image_hash
+
+    def lookup(self, ui_file: str, render_params: Optional[Dict[str, Any]] = None,
+               ui_hash: Optional[str] = None) -> Optional[str]:
+        """
+        Find the image hash stored for a UI file's current content.
+
+        Returns:
+            Image hash or None if not stored
+        """
+        if ui_hash is None:
+            if not Path(ui_file).exists():
+                return None
+            ui_hash = hash_file(ui_file)
+
+        entry = self._index["entries"].get(self.entry_key(ui_hash, render_params))
+        if entry is None or not self._object_path(entry["image_hash"]).exists():
+            return None
+        return entry["image_hash"]
+
+    def get(self, ui_file: str, render_params: Optional[Dict[str, Any]] = None,
+            ui_hash: Optional[str] = None) -> Optional[bytes]:
+        """
+        Fetch the stored image for a UI file's current content.
+
+        Returns:
+            PNG bytes or None if not stored
+        """
+        image_hash = self.lookup(ui_file, render_params, ui_hash)
+        if image_hash is None:
+            return None
+        return self.get_image(image_hash)
+
+    def get_image(self, image_hash: str) -> Optional[bytes]:
+        """Fetch image bytes by image hash."""
+        path = self._object_path(image_hash)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        self._touch(image_hash)
+        return data
+
+    def _touch(self, image_hash: str):
+        """Mark an image as recently used (mtime, no index write)."""
+        # Explicit time: the kernel's default is only tick-accurate
+        now = time.time_ns()
+        try:
+            os.utime(self._object_path(image_hash), ns=(now, now))
+        except OSError:
+            pass
+
+    def _last_used(self, image_hash: str) -> int:
+        try:
+            return self._object_path(image_hash).stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def total_bytes(self) -> int:
+        """Total size of stored images."""
+        return sum(info["size"] for info in self._index["objects"].values())
+
+    def enforce_retention(self, max_bytes: Optional[int] = None) -> List[str]:
+        """
+        Evict least recently used images until the store fits.
+
+        Args:
+            max_bytes: Size bound (defaults to self.max_bytes)
+
+        Returns:
+            List of evicted image hashes
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        objects = self._index["objects"]
+        total = self.total_bytes()
+        if total <= limit:
+            return []
+
+        evicted = []
+        by_age = sorted(objects.items(), key=lambda item: self._last_used(item[0]))
+        for image_hash, info in by_age:
+            if total <= limit:
+                break
+            try:
+                self._object_path(image_hash).unlink()
+            except FileNotFoundError:
+                pass
+            total -= info["size"]
+            del objects[image_hash]
+            evicted.append(image_hash)
+
+        if evicted:
+            gone = set(evicted)
+            entries = self._index["entries"]
+            for key in [k for k, e in entries.items() if e["image_hash"] in gone]:
+                del entries[key]
+
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """Store statistics."""
+        return {
+            "root": str(self.root),
+            "entries": len(self._index["entries"]),
+            "images": len(self._index["objects"]),
+            "total_bytes": self.total_bytes(),
+            "max_bytes": self.max_bytes
+        }
+
+
+def main():
+    """Show store statistics or apply retention."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Golden screenshot store")
+    parser.add_argument("--root", default=DEFAULT_STORE_DIR, help="Store directory")
+    parser.add_argument("--max-mb", type=int, help="Apply retention with this size bound")
+    args = parser.parse_args()
+
+    store = GoldenImageStore(args.root)
+    if args.max_mb is not None:
+        evicted = store.enforce_retention(args.max_mb * 1024 * 1024)
+        store._save_index()
+        print(f"Evicted {len(evicted)} image(s)")
+
+    print(json.dumps(store.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+"""
+Image Utils - NumPy helpers for screenshot analysis
+
+Decodes/encodes the PNG screenshots produced by the Live UI Editor into
+RGBA uint8 arrays (H x W x 4) and provides small vectorized helpers shared
+by the visual comparison and verification stages.
+
+Pillow is used for PNG decoding when installed; otherwise a zlib + NumPy
+decoder handles the 8-bit, non-interlaced PNGs that Qt writes.
+"""
+
+import base64
+import struct
+import zlib
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:  # Optional dependency
+    Image = None
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG color type -> number of channels (8-bit samples only)
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# base64 of PNG_SIGNATURE; such strings are never treated as paths
+_PNG_BASE64_PREFIX = "iVBORw0KGgo"
+
+ImageSource = Union[np.ndarray, bytes, bytearray, memoryview, str, Path]
+
+
+def load_image(source: ImageSource) -> np.ndarray:
+    """
+    Load an image into an RGBA uint8 array.
+
+    Args:
+        source: ndarray, PNG bytes, base64 PNG string (or data: URI) or path
+            to a PNG file
+
+    Returns:
+        Array of shape (height, width, 4)
+    """
+    if isinstance(source, np.ndarray):
+        return to_rgba(source)
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return decode_png(bytes(source))
+
+    if isinstance(source, Path):
+        return decode_png(source.read_bytes())
+
+    if isinstance(source, str):
+        if source.startswith("data:"):
+            source = source.partition(",")[2]
+        elif not source.startswith(_PNG_BASE64_PREFIX) and _is_file(source):
+            return decode_png(Path(source).read_bytes())
+        return decode_png(base64.b64decode(source))
+
+    raise TypeError(f"Unsupported image source: {type(source).__name__}")
+
+
+def _is_file(path: str) -> bool:
+    """Path(path).is_file(), False for strings that can't be paths (too long, NUL)."""
+    try:
+        return Path(path).is_file()
+    except (OSError, ValueError):
+        return False
+
+
+@contextmanager
+def shared_frame(frame: Dict[str, Any]) -> Iterator[np.ndarray]:
+    """
+    Map a raw RGBA frame exported by the Live UI Editor (render_ui with
+    transport "shm") without copying it.
+
+    The segment is unlinked when the block exits, so copy anything that
+    must outlive it.
+
+    Args:
+        frame: Frame descriptor {shm, width, height, stride, format}
+
+    Yields:
+        Read-only array of shape (height, width, 4) over the shared memory
+    """
+    if frame.get("format", "rgba8888") != "rgba8888":
+        raise ValueError(f"Unsupported frame format: {frame.get('format')}")
+
+    segment = shared_memory.SharedMemory(name=frame["shm"])
+    view = np.ndarray((frame["height"], frame["width"], 4), dtype=np.uint8,
+                      buffer=segment.buf, strides=(frame["stride"], 4, 1))
+    view.flags.writeable = False
+    try:
+        yield view
+    finally:
+        del view
+        segment.unlink()
+        try:
+            segment.close()
+        except BufferError:  # a view escaped the block; unmapped once it is freed
+            pass
+
+
+def to_rgba(array: np.ndarray) -> np.ndarray:
+    """Normalize a gray/gray+alpha/RGB/RGBA array to RGBA uint8."""
+    array = np.asarray(array)
+    if array.dtype != np.uint8:
+        array = np.clip(array, 0, 255).astype(np.uint8)
+
+    if array.ndim == 2:
+        array = array[:, :, None]
+
+    channels = array.shape[2]
+    if channels == 4:
+        return array
+    if channels == 3:
+        alpha = np.full(array.shape[:2] + (1,), 255, dtype=np.uint8)
+        return np.concatenate([array, alpha], axis=2)
+    if channels == 2:
+        gray, alpha = array[:, :, :1], array[:, :, 1:]
+        return np.concatenate([gray, gray, gray, alpha], axis=2)
+    if channels == 1:
+        alpha = np.full(array.shape[:2] + (1,), 255, dtype=np.uint8)
+        return np.concatenate([array, array, array, alpha], axis=2)
+
+    raise ValueError(f"Unsupported channel count: {channels}")
+
+
+def decode_png(data: bytes) -> np.ndarray:
+    """
+    Decode PNG bytes into an RGBA uint8 array.
+
+    Args:
+        data: PNG file contents
+
+    Returns:
+        Array of shape (height, width, 4)
+    """
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("Not a PNG image")
+
+    if Image is not None:
+        from io import BytesIO
+        with Image.open(BytesIO(data)) as img:
+            return np.asarray(img.convert("RGBA"))
+
+    return _decode_png_numpy(data)
+
+
+def _decode_png_numpy(data: bytes) -> np.ndarray:
+    """Fallback PNG decoder (8-bit depth, non-interlaced)."""
+    offset = len(PNG_SIGNATURE)
+    header = None
+    palette = None
+    transparency = None
+    idat = []
+
+    while offset < len(data):
+        length, chunk_type = struct.unpack(">I4s", data[offset:offset + 8])
+        chunk = data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+
+        if chunk_type == b"IHDR":
+            header = struct.unpack(">IIBBBBB", chunk)
+        elif chunk_type == b"PLTE":
+            palette = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, 3)
+        elif chunk_type == b"tRNS":
+            transparency = np.frombuffer(chunk, dtype=np.uint8)
+        elif chunk_type == b"IDAT":
+            idat.append(chunk)
+        elif chunk_type == b"IEND":
+            break
+
+    if header is None:
+        raise ValueError("PNG is missing IHDR chunk")
+
+    width, height, bit_depth, color_type, _, _, interlace = header
+    if bit_depth != 8 or interlace != 0 or color_type not in _PNG_CHANNELS:
+        raise ValueError(
+            f"Unsupported PNG format (depth={bit_depth}, color={color_type}, "
+            f"interlace={interlace}); install Pillow for full PNG support"
+        )
+
+    channels = _PNG_CHANNELS[color_type]
+    stride = width * channels
+    raw = np.frombuffer(zlib.decompress(b"".join(idat)), dtype=np.uint8)
+    raw = raw.reshape(height, stride + 1)
+
+    filters = raw[:, 0]
+    if filters.max() > 4:
+        raise ValueError(f"Invalid PNG filter type: {filters.max()}")
+
+    if filters.max() <= 2:
+        # None/Sub/Up only: each row is vectorized given the one above
+        pixels = np.empty((height, stride), dtype=np.uint8)
+        prior = np.zeros(stride, dtype=np.uint8)
+        for y in range(height):
+            pixels[y] = _unfilter_row(filters[y], raw[y, 1:], prior, channels)
+            prior = pixels[y]
+        pixels = pixels.reshape(height, width, channels)
+    else:
+        pixels = _unfilter_diagonals(raw[:, 1:], filters, height, width, channels)
+
+    if color_type == 3:
+        if palette is None:
+            raise ValueError("Palette PNG is missing PLTE chunk")
+        alpha = np.full(len(palette), 255, dtype=np.uint8)
+        if transparency is not None:
+            alpha[:len(transparency)] = transparency[:len(alpha)]
+        lut = np.concatenate([palette, alpha[:, None]], axis=1)
+        return lut[pixels[:, :, 0]]
+
+    return to_rgba(pixels)
+
+
+def _unfilter_row(filter_type: int, row: np.ndarray, prior: np.ndarray, bpp: int) -> np.ndarray:
+    """Reverse a None, Sub or Up scanline filter."""
+    if filter_type == 0:
+        return row
+    if filter_type == 1:
+        # Sub: running sum per channel (mod 256)
+        return np.cumsum(row.reshape(-1, bpp), axis=0, dtype=np.uint8).reshape(-1)
+    return row + prior
+
+
+def _unfilter_diagonals(data: np.ndarray, filters: np.ndarray, height: int, width: int,
+                        bpp: int) -> np.ndarray:
+    """
+    Reverse any mix of scanline filters, one anti-diagonal at a time.
+
+    Average and Paeth predict a pixel from the already decoded pixel to its
+    left, so rows can't be vectorized. Every filter only looks left, up and
+    up-left though, so all pixels with the same x + y are independent once
+    the previous diagonal is decoded: height + width - 1 vectorized steps
+    instead of a Python loop per pixel.
+
+    Args:
+        data: Filtered scanlines without the filter byte (height x width * bpp)
+        filters: Filter type per scanline
+        height, width, bpp: Image size and bytes per pixel
+
+    Returns:
+        Array of shape (height, width, bpp)
+    """
+    # Decoded pixels with a zero row above and a zero column to the left;
+    # (y, x) is at (y + 1) * (width + 1) + x + 1, so a diagonal is a slice
+    # with step width
+    out = np.zeros(((height + 1) * (width + 1), bpp), dtype=np.int16)
+    pixels = data.reshape(height * width, bpp).astype(np.int16)
+    source_step = max(width - 1, 1)
+    masks = {kind: (filters == kind)[:, None] for kind in range(1, 5) if (filters == kind).any()}
+    uniform = len(masks) == 1 and next(iter(masks.values())).all()
+
+    for k in range(height + width - 1):
+        y0, y1 = max(0, k - width + 1), min(height, k + 1)
+        start = (y0 + 1) * (width + 1) + k - y0 + 1
+        stop = start + (y1 - y0 - 1) * width + 1
+        left = out[start - 1:stop - 1:width]
+        up = out[start - width - 1:stop - width - 1:width]
+        up_left = out[start - width - 2:stop - width - 2:width]
+
+        source = y0 * width + k - y0
+        value = pixels[source:source + (y1 - y0 - 1) * source_step + 1:source_step].copy()
+        for kind, mask in masks.items():
+            if kind == 1:
+                prediction = left
+            elif kind == 2:
+                prediction = up
+            elif kind == 3:
+                prediction = (left + up) >> 1
+            else:
+                pa = np.abs(up - up_left)
+                pb = np.abs(left - up_left)
+                pc = np.abs(left + up - up_left - up_left)
+                prediction = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+            if uniform:
+                value += prediction
+            else:
+                np.add(value, prediction, out=value, where=mask[y0:y1])
+        np.bitwise_and(value, 0xFF, out=out[start:stop:width])
+
+    return out.reshape(height + 1, width + 1, bpp)[1:, 1:].astype(np.uint8)
+
+
+def encode_png(image: np.ndarray, compress_level: int = 6) -> bytes:
+    """
+    Encode an RGBA (or RGB/gray) uint8 array as PNG bytes.
+
+    Args:
+        image: Array of shape (height, width[, channels])
+        compress_level: zlib compression level
+
+    Returns:
+        PNG file contents
+    """
+    image = to_rgba(image)
+    height, width = image.shape[:2]
+
+    # Filter type 0 for every scanline
+    raw = np.empty((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 0] = 0
+    raw[:, 1:] = image.reshape(height, -1)
+
+    def chunk(chunk_type: bytes, payload: bytes) -> bytes:
+        crc = zlib.crc32(chunk_type + payload) & 0xFFFFFFFF
+        return struct.pack(">I", len(payload)) + chunk_type + payload + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"".join([
+        PNG_SIGNATURE,
+        chunk(b"IHDR", header),
+        chunk(b"IDAT", zlib.compress(raw.tobytes(), compress_level)),
+        chunk(b"IEND", b""),
+    ])
+
+
+def luminance(image: np.ndarray) -> np.ndarray:
+    """Rec. 601 luma of an RGBA array as float32 in 0..255."""
+    rgb = image[:, :, :3].astype(np.float32)
+    return rgb[:, :, 0] * 0.299 + rgb[:, :, 1] * 0.587 + rgb[:, :, 2] * 0.114
+
+
+# sRGB 8-bit value -> linear light (WCAG 2.x definition)
+_SRGB_TO_LINEAR = np.array([c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+                            for c in np.arange(256) / 255.0], dtype=np.float32)
+
+
+def relative_luminance(image: np.ndarray) -> np.ndarray:
+    """WCAG relative luminance of an RGBA array as float32 in 0..1."""
+    linear = _SRGB_TO_LINEAR
+    return (linear[image[:, :, 0]] * 0.2126 + linear[image[:, :, 1]] * 0.7152
+            + linear[image[:, :, 2]] * 0.0722)
+
+
+def contrast_ratio(a, b):
+    """WCAG contrast ratio (1..21) of relative luminances (arrays or floats)."""
+    return (np.maximum(a, b) + 0.05) / (np.minimum(a, b) + 0.05)
+
+
+def integral_image(values: np.ndarray) -> np.ndarray:
+    """Summed-area table padded with a leading zero row/column."""
+    table = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(values, axis=0, dtype=np.float64), axis=1, out=table[1:, 1:])
+    return table
+
+
+def box_filter(values: np.ndarray, size: int) -> np.ndarray:
+    """
+    Mean over every size x size window (valid region only).
+
+    Returns:
+        Array of shape (H - size + 1, W - size + 1)
+    """
+    table = integral_image(values)
+    total = (table[size:, size:] - table[:-size, size:]
+             - table[size:, :-size] + table[:-size, :-size])
+    return total / float(size * size)
+
+
+def find_regions(mask: np.ndarray, block: int = 8,
+                 min_pixels: int = 1) -> List[Tuple[int, int, int, int]]:
+    """
+    Find bounding boxes of connected regions in a boolean mask.
+
+    The mask is first reduced to a block grid so labelling only touches
+    (H / block) x (W / block) cells; boxes are then tightened to the
+    actual pixels.
+
+    Args:
+        mask: Boolean array (H x W)
+        block: Grid cell size in pixels
+        min_pixels: Drop regions with fewer set pixels
+
+    Returns:
+        List of (x, y, width, height) boxes, largest first
+    """
+    height, width = mask.shape
+    if not mask.any():
+        return []
+
+    grid_h = -(-height // block)
+    grid_w = -(-width // block)
+    padded = np.zeros((grid_h * block, grid_w * block), dtype=bool)
+    padded[:height, :width] = mask
+    grid = padded.reshape(grid_h, block, grid_w, block).any(axis=(1, 3))
+
+    labels = np.zeros(grid.shape, dtype=np.int32)
+    boxes = []
+    for start_y, start_x in np.argwhere(grid):
+        if labels[start_y, start_x]:
+            continue
+        label = len(boxes) + 1
+        labels[start_y, start_x] = label
+        stack = [(start_y, start_x)]
+        min_y, min_x, max_y, max_x = start_y, start_x, start_y, start_x
+        while stack:
+            cy, cx = stack.pop()
+            min_y, max_y = min(min_y, cy), max(max_y, cy)
+            min_x, max_x = min(min_x, cx), max(max_x, cx)
+            for ny, nx in ((cy - 1, cx), (cy + 1, cx), (cy, cx - 1), (cy, cx + 1)):
+                if 0 <= ny < grid_h and 0 <= nx < grid_w and grid[ny, nx] and not labels[ny, nx]:
+                    labels[ny, nx] = label
+                    stack.append((ny, nx))
+        boxes.append((min_y, min_x, max_y, max_x))
+
+    regions = []
+    for min_y, min_x, max_y, max_x in boxes:
+        y0, x0 = min_y * block, min_x * block
+        y1, x1 = min((max_y + 1) * block, height), min((max_x + 1) * block, width)
+        sub = mask[y0:y1, x0:x1]
+        count = int(sub.sum())
+        if count < min_pixels:
+            continue
+        rows = np.flatnonzero(sub.any(axis=1))
+        cols = np.flatnonzero(sub.any(axis=0))
+        regions.append((count, (int(x0 + cols[0]), int(y0 + rows[0]),
+                                int(cols[-1] - cols[0] + 1), int(rows[-1] - rows[0] + 1))))
+
+    regions.sort(key=lambda item: item[0], reverse=True)
+    return [box for _, box in regions]
@@ -5,18 +5,19 @@ Maya commandPort-style socket server for Qt UI manipulation.
 Run with: rez-env pyside6 -- python live_ui_editor.py --ui myfile.ui --port 7001
 """
 
+import os
 import sys
 import socket
 import json
 import threading
 import argparse
 import base64
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
-from io import BytesIO
 
 from PySide6.QtWidgets import QApplication, QWidget, QDialog, QMainWindow
-from PySide6.QtCore import Qt, QTimer, Signal, QObject, QFile
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import Qt, QTimer, Signal, QObject, QFile, QBuffer, QIODevice, QPoint
+from PySide6.QtGui import QPixmap, QImage
 from PySide6.QtUiTools import QUiLoader
 
 from ui_manager import UIManager
@@ -27,6 +28,8 @@ class EditorSignals(QObject):
     reload_requested = Signal()
     screenshot_requested = Signal(str)  # output path
     command_received = Signal(dict)
+    render_requested = Signal(object)  # render job dict (ui_file, result, done event)
+    geometry_requested = Signal(object)  # geometry job dict (result, done event)
 
 
 class LiveUIEditor:
@@ -51,11 +54,14 @@ class LiveUIEditor:
         self.server_socket = None
         self.running = True
         self.signals = EditorSignals()
+        self._exported_frames = []  # shared memory names handed to clients
 
         # Connect signals
         self.signals.reload_requested.connect(self._reload_ui)
         self.signals.screenshot_requested.connect(self._take_screenshot)
         self.signals.command_received.connect(self._handle_command)
+        self.signals.render_requested.connect(self._render_ui)
+        self.signals.geometry_requested.connect(self._get_widget_geometry)
 
     def start(self):
         """Start the editor and socket server."""
@@ -80,7 +86,9 @@ class LiveUIEditor:
             self.widget.show()
 
         # Run Qt event loop
-        return self.app.exec_()
+        exit_code = self.app.exec_()
+        self._release_frames()
+        return exit_code
 
     def _load_ui(self):
         """Load .ui file and display widget."""
@@ -127,19 +135,206 @@ class LiveUIEditor:
             print(f"[ERROR] Screenshot failed: {e}")
             return None
 
-    def _get_screenshot_base64(self) -> str:
-        """Get screenshot as base64 string."""
+    def _get_screenshot_png(self) -> bytes:
+        """Get screenshot as PNG bytes (encoded once)."""
         if not self.widget:
-            return ""
+            return b""
 
         try:
-            pixmap = self.widget.grab()
-            byte_array = BytesIO()
-            pixmap.save(byte_array, "PNG")
-            return base64.b64encode(byte_array.getvalue()).decode('utf-8')
+            return self._encode_png(self.widget.grab())
         except Exception as e:
             print(f"[ERROR] Screenshot encoding failed: {e}")
-            return ""
+            return b""
+
+    @staticmethod
+    def _encode_png(pixmap: QPixmap) -> bytes:
+        """Encode a pixmap as PNG in memory."""
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+        pixmap.save(buffer, "PNG")
+        return bytes(buffer.data())
+
+    def _export_frame(self, pixmap: QPixmap) -> dict:
+        """
+        Copy a grabbed frame into shared memory as raw RGBA.
+
+        A local client maps the segment and analyzes the pixels in place,
+        skipping the PNG encode/decode and base64 round trip. The client
+        unlinks the segment when done; segments never picked up are
+        unlinked when the editor stops.
+
+        Args:
+            pixmap: Grabbed frame
+
+        Returns:
+            Frame descriptor: {shm, width, height, stride, format}
+        """
+        image = pixmap.toImage().convertToFormat(QImage.Format_RGBA8888)
+        size = image.sizeInBytes()
+        segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            segment.buf[:size] = image.constBits()[:size]
+        except Exception:
+            segment.close()
+            segment.unlink()
+            raise
+
+        # The client owns the segment from here on (the tracker only watches
+        # POSIX segments, keyed by their slash-prefixed name)
+        if os.name == "posix":
+            resource_tracker.unregister(f"/{segment.name}", "shared_memory")
+        self._exported_frames.append(segment.name)
+        segment.close()
+        return {
+            "shm": segment.name,
+            "width": image.width(),
+            "height": image.height(),
+            "stride": image.bytesPerLine(),
+            "format": "rgba8888"
+        }
+
+    def _release_frame(self, name: str) -> bool:
+        """
+        Unlink an exported frame.
+
+        Args:
+            name: Shared memory name from _export_frame
+
+        Returns:
+            True if the segment still existed
+        """
+        try:
+            segment = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return False  # already mapped and unlinked by the client
+        segment.close()
+        segment.unlink()
+        return True
+
+    def _release_frames(self):
+        """Unlink exported frames that no client picked up."""
+        for name in self._exported_frames:
+            self._release_frame(name)
+        self._exported_frames.clear()
+
+    def _render_ui(self, job: dict):
+        """
+        Render a .ui file off-screen (runs in Qt main thread).
+
+        The displayed widget is left untouched, so reference and target
+        files can be rendered back to back for visual comparison.
+
+        The frame is returned as base64 PNG, or with transport "shm" as a
+        raw RGBA shared memory segment (see _export_frame).
+
+        Args:
+            job: Dict with 'ui_file', 'geometry' and 'transport'; 'result'
+                is filled in and 'done' set
+        """
+        widget = None
+        try:
+            loader = QUiLoader()
+            ui_file = QFile(job["ui_file"])
+            if not ui_file.open(QFile.ReadOnly):
+                job["result"] = {"status": "error", "message": f"Cannot open {job['ui_file']}"}
+                return
+            widget = loader.load(ui_file)
+            ui_file.close()
+
+            if widget is None:
+                job["result"] = {"status": "error", "message": loader.errorString()}
+                return
+
+            widget.setAttribute(Qt.WA_DontShowOnScreen, True)
+            widget.show()
+            QApplication.processEvents()
+
+            pixmap = widget.grab()
+            job["result"] = {
+                "status": "success",
+                "ui_file": job["ui_file"],
+                "width": pixmap.width(),
+                "height": pixmap.height()
+            }
+            if job.get("transport") == "shm":
+                job["result"]["frame"] = self._export_frame(pixmap)
+            else:
+                png_data = self._encode_png(pixmap)
+                job["result"]["screenshot_base64"] = base64.b64encode(png_data).decode('utf-8')
+            if job.get("geometry"):
+                job["result"]["geometry"] = self._widget_geometry(widget)
+        except Exception as e:
+            job["result"] = {"status": "error", "message": f"Render failed: {e}"}
+        finally:
+            if widget is not None:
+                widget.close()
+                widget.deleteLater()
+            job["done"].set()
+
+    @staticmethod
+    def _widget_geometry(root: QWidget) -> dict:
+        """
+        Rendered rects of a widget and its named descendants.
+
+        Rects are in the root widget's coordinates (the grabbed frame's
+        logical pixels); Qt-internal children (unnamed or qt_*) are skipped
+        and named widgets report their nearest named ancestor as parent.
+        """
+        def named(widget):
+            name = widget.objectName()
+            return bool(name) and not name.startswith("qt_")
+
+        widgets = []
+        for widget in [root] + root.findChildren(QWidget):
+            if widget is not root and not named(widget):
+                continue
+            parent = widget.parentWidget() if widget is not root else None
+            while parent is not None and parent is not root and not named(parent):
+                parent = parent.parentWidget()
+            position = widget.mapTo(root, QPoint(0, 0)) if widget is not root else QPoint(0, 0)
+            entry = {
+                "name": widget.objectName(),
+                "class": widget.metaObject().className(),
+                "parent": parent.objectName() if parent is not None else None,
+                "x": position.x(),
+                "y": position.y(),
+                "width": widget.width(),
+                "height": widget.height(),
+                "visible": widget is root or widget.isVisibleTo(root),
+                "enabled": widget.isEnabled()
+            }
+            text = getattr(widget, "text", None)
+            if callable(text):
+                try:
+                    value = text()
+                except TypeError:
+                    value = None
+                if isinstance(value, str) and value:
+                    font = widget.font()
+                    entry["text"] = value
+                    entry["font_point_size"] = font.pointSizeF()
+                    entry["bold"] = font.bold()
+            widgets.append(entry)
+
+        return {
+            "width": root.width(),
+            "height": root.height(),
+            "device_pixel_ratio": root.devicePixelRatioF(),
+            "widgets": widgets
+        }
+
+    def _get_widget_geometry(self, job: dict):
+        """Collect rendered widget rects of the displayed UI (runs in Qt main thread)."""
+        try:
+            if not self.widget:
+                job["result"] = {"status": "error", "message": "No widget loaded"}
+                return
+            QApplication.processEvents()
+            job["result"] = {"status": "success", "geometry": self._widget_geometry(self.widget)}
+        except Exception as e:
+            job["result"] = {"status": "error", "message": f"Geometry failed: {e}"}
+        finally:
+            job["done"].set()
 
     def _get_widget_tree(self) -> dict:
         """Get widget hierarchy from loaded UI."""
@@ -232,24 +427,44 @@ class LiveUIEditor:
 
         elif action == "take_screenshot":
             output_path = command.get("path", "screenshots/screenshot.png")
-            # Ensure directory exists
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-            # Take screenshot (runs in Qt thread via signal)
-            screenshot_base64 = self._get_screenshot_base64()
-
-            # Also save to file
-            if screenshot_base64:
-                import base64
-                with open(output_path, "wb") as f:
-                    f.write(base64.b64decode(screenshot_base64))
+            # Encode once; the same bytes go to disk and into the response
+            png_data = self._get_screenshot_png()
+            if png_data and command.get("save", True):
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                Path(output_path).write_bytes(png_data)
+            else:
+                output_path = None
 
             return {
                 "status": "success",
                 "path": output_path,
-                "screenshot_base64": screenshot_base64
+                "screenshot_base64": base64.b64encode(png_data).decode('utf-8')
             }
 
+        elif action == "render_ui":
+            ui_file = command.get("ui_file")
+            if not ui_file or not Path(ui_file).exists():
+                return {"status": "error", "message": f"UI file not found: {ui_file}"}
+
+            # Rendering must happen in the Qt main thread
+            job = {"ui_file": ui_file, "geometry": bool(command.get("geometry")),
+                   "transport": command.get("transport", "base64"),
+                   "result": None, "done": threading.Event()}
+            self.signals.render_requested.emit(job)
+            if not job["done"].wait(timeout=30.0):
+                return {"status": "error", "message": f"Render timed out: {ui_file}"}
+            return job["result"]
+
+        elif action == "release_frame":
+            # Frame the client could not map (no shared /dev/shm)
+            name = command.get("shm")
+            if name not in self._exported_frames:
+                return {"status": "error", "message": f"Unknown frame: {name}"}
+            self._exported_frames.remove(name)
+            released = self._release_frame(name)
+            return {"status": "success", "released": released}
+
         elif action == "get_widget_tree":
             tree = self._get_widget_tree()
             return {
@@ -257,6 +472,14 @@ class LiveUIEditor:
                 "widget_tree": tree
             }
 
+        elif action == "get_widget_geometry":
+            # Widget geometry must be read in the Qt main thread
+            job = {"result": None, "done": threading.Event()}
+            self.signals.geometry_requested.emit(job)
+            if not job["done"].wait(timeout=10.0):
+                return {"status": "error", "message": "Geometry request timed out"}
+            return job["result"]
+
         elif action == "get_ui_file":
             return {
                 "status": "success",
@@ -285,6 +508,7 @@ class LiveUIEditor:
         self.running = False
         if self.server_socket:
             self.server_socket.close()
+        self._release_frames()
 
 
 def main():
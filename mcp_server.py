@@ -4,20 +4,48 @@ MCP Server for QtLiveDevTools
 Provides MCP tools for Claude CLI to create and manipulate Qt UIs.
 """
 
+import base64
+import binascii
 import json
+import os
+import shutil
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 from ui_manager import UIManager, create_template_ui
 from editor_client import EditorClient
-from ui_comparator import UIComparator
+from ui_comparator import UIComparator, ComparisonSession
 from pyside_converter import PySideConverter
+from golden_store import GoldenImageStore, hash_file
+from tree_edit_distance import tree_similarity
+from batch_compare import compare_one_to_many, expand_ui_paths
+from ui_lint import lint_paths
 
 
 # MCP Server configuration
 EDITOR_PORT = 7001
 EDITOR_HOST = "localhost"
 
+# Comparison sessions reused across compare_with_reference calls
+_SESSIONS: Dict[tuple, ComparisonSession] = {}
+MAX_SESSIONS = 16
+
+
+def _store_screenshot(ui_file: str, screenshot_base64: Optional[str], renderer: str) -> Optional[str]:
+    """Keep a content-addressed copy of a screenshot; returns image hash."""
+    try:
+        if screenshot_base64:
+            store = GoldenImageStore()
+            return store.put(ui_file, base64.b64decode(screenshot_base64), {"renderer": renderer})
+    except (OSError, binascii.Error):
+        pass
+    return None
+
+
+def _integrity_errors(manager: UIManager) -> List[Dict[str, Any]]:
+    """Integrity errors of a just-edited tree, for mutating tool responses."""
+    return [issue.to_dict() for issue in manager.check_integrity() if issue.severity == "error"]
+
 
 def create_ui_file(name: str, template: str = "dialog",
                    width: int = 400, height: int = 300) -> Dict[str, Any]:
@@ -80,12 +108,16 @@ def add_widget_to_ui(ui_file: str, widget_type: str, object_name: str,
         manager.add_widget(widget_type, object_name, parent_name, properties or {})
         manager.save()
 
-        return {
+        result = {
             "status": "success",
             "message": f"Added {widget_type} '{object_name}' to {ui_file}",
             "widget_type": widget_type,
             "object_name": object_name
         }
+        integrity_errors = _integrity_errors(manager)
+        if integrity_errors:
+            result["integrity_errors"] = integrity_errors
+        return result
     except Exception as e:
         return {
             "status": "error",
@@ -118,12 +150,16 @@ def add_layout_to_ui(ui_file: str, layout_type: str, object_name: str,
         manager.add_layout(layout_type, object_name, parent_name)
         manager.save()
 
-        return {
+        result = {
             "status": "success",
             "message": f"Added {layout_type} '{object_name}' to {ui_file}",
             "layout_type": layout_type,
             "object_name": object_name
         }
+        integrity_errors = _integrity_errors(manager)
+        if integrity_errors:
+            result["integrity_errors"] = integrity_errors
+        return result
     except Exception as e:
         return {
             "status": "error",
@@ -156,13 +192,17 @@ def modify_widget_property(ui_file: str, widget_name: str,
         manager.modify_property(widget_name, property_name, value)
         manager.save()
 
-        return {
+        result = {
             "status": "success",
             "message": f"Modified {widget_name}.{property_name} = {value}",
             "widget_name": widget_name,
             "property_name": property_name,
             "value": value
         }
+        integrity_errors = _integrity_errors(manager)
+        if integrity_errors:
+            result["integrity_errors"] = integrity_errors
+        return result
     except Exception as e:
         return {
             "status": "error",
@@ -243,6 +283,7 @@ def preview_ui(ui_file: str, port: int = EDITOR_PORT) -> Dict[str, Any]:
                 "status": "success",
                 "screenshot_path": result.get("path"),
                 "screenshot_base64": result.get("screenshot_base64"),
+                "image_hash": _store_screenshot(ui_file, result.get("screenshot_base64"), "window"),
                 "ui_file": ui_file
             }
         else:
@@ -294,6 +335,10 @@ def analyze_ui(ui_file: str, port: int = EDITOR_PORT) -> Dict[str, Any]:
                 if screenshot_result.get("status") == "success":
                     runtime_info["screenshot_path"] = screenshot_result.get("path")
                     runtime_info["screenshot_base64"] = screenshot_result.get("screenshot_base64")
+                    # Only a screenshot of this file may be stored under its hash
+                    if client.get_ui_file() == str(Path(ui_file).absolute()):
+                        runtime_info["image_hash"] = _store_screenshot(
+                            ui_file, screenshot_result.get("screenshot_base64"), "window")
             except:
                 pass  # Editor is running but couldn't get info
 
@@ -311,7 +356,10 @@ def analyze_ui(ui_file: str, port: int = EDITOR_PORT) -> Dict[str, Any]:
         }
 
 
-def compare_with_reference(reference_ui: str, target_ui: str, detailed: bool = True) -> Dict[str, Any]:
+def compare_with_reference(reference_ui: str, target_ui: str, detailed: bool = True,
+                           similarity_mode: str = "name", match: str = "name",
+                           scoring_profile: Optional[str] = None,
+                           output_jsonl: Optional[str] = None) -> Dict[str, Any]:
     """
     Compare target UI with reference UI.
 
@@ -319,11 +367,31 @@ def compare_with_reference(reference_ui: str, target_ui: str, detailed: bool = T
         reference_ui: Reference .ui file path
         target_ui: Target .ui file path
         detailed: Show detailed differences
+        similarity_mode: "name" (object-name matching) or "tree"
+            (tree edit distance over the widget/layout hierarchy)
+        match: "name" (exact object names) or "assignment"
+            (rename-tolerant matching by type, geometry, text and parent)
+        scoring_profile: Optional scoring profile JSON (property weights,
+            geometry tolerances, type-equivalence classes)
+        output_jsonl: Optional path for the full, untruncated per-widget
+            diff stream (JSON lines ending with a summary record)
 
     Returns:
         Comparison result with similarity score and differences
     """
     try:
+        if similarity_mode not in ("name", "tree"):
+            return {
+                "status": "error",
+                "message": f"Unknown similarity mode: {similarity_mode}. Use 'name' or 'tree'"
+            }
+
+        if match not in ("name", "assignment"):
+            return {
+                "status": "error",
+                "message": f"Unknown match mode: {match}. Use 'name' or 'assignment'"
+            }
+
         if not Path(reference_ui).exists():
             return {
                 "status": "error",
@@ -336,11 +404,25 @@ def compare_with_reference(reference_ui: str, target_ui: str, detailed: bool = T
                 "message": f"Target UI file not found: {target_ui}"
             }
 
-        comparator = UIComparator()
-        comparator.load_reference(reference_ui)
-        comparator.load_target(target_ui)
+        if match == "name":
+            # Incremental: only widgets changed since the last call are re-diffed
+            key = (str(Path(reference_ui).resolve()), str(Path(target_ui).resolve()), scoring_profile)
+            session = _SESSIONS.pop(key, None)
+            if session is None:
+                session = ComparisonSession(reference_ui, target_ui, scoring_profile)
+                result = session.result
+            else:
+                result = session.update()
+            _SESSIONS[key] = session
+            while len(_SESSIONS) > MAX_SESSIONS:
+                del _SESSIONS[next(iter(_SESSIONS))]
+            comparator = session.comparator
+        else:
+            comparator = UIComparator(scoring_profile)
+            comparator.load_reference(reference_ui)
+            comparator.load_target(target_ui)
+            result = comparator.compare(match=match)
 
-        result = comparator.compare()
         report = comparator.generate_report(result)
 
         response = {
@@ -348,16 +430,38 @@ def compare_with_reference(reference_ui: str, target_ui: str, detailed: bool = T
             "reference_ui": reference_ui,
             "target_ui": target_ui,
             "similarity_score": result.similarity_score,
+            "similarity_mode": similarity_mode,
             "report": report
         }
 
+        if output_jsonl:
+            with open(output_jsonl, "w", encoding="utf-8") as f:
+                response["summary"] = comparator.write_jsonl(f, match=match, result=result)
+            response["jsonl_path"] = output_jsonl
+
+        if similarity_mode == "tree":
+            tree_result = tree_similarity(reference_ui, target_ui)
+            response["name_similarity_score"] = result.similarity_score
+            response["similarity_score"] = tree_result.similarity
+            response["tree_distance"] = tree_result.to_dict()
+            # The report above scores by name; state which score is returned
+            approximate = "" if tree_result.exact else ", approximate"
+            response["report"] = "\n".join([
+                report,
+                f"\n🌳 Tree Similarity: {tree_result.similarity:.1%} "
+                f"(returned as similarity_score; the report above is name-based)",
+                f"   Edit distance: {tree_result.distance:g} ({tree_result.method}{approximate})",
+                f"   Nodes: {tree_result.reference_nodes} reference, {tree_result.target_nodes} target",
+            ])
+
         if detailed:
             response.update({
                 "matching_widgets": result.matching_widgets,
                 "missing_widgets": result.missing_widgets,
                 "extra_widgets": result.extra_widgets,
+                "renamed_widgets": result.renamed_widgets,
                 "property_differences": result.property_differences,
-                "missing_specs": comparator.get_missing_widget_specs()
+                "missing_specs": comparator.get_missing_widget_specs(result)
             })
 
         return response
@@ -369,6 +473,271 @@ def compare_with_reference(reference_ui: str, target_ui: str, detailed: bool = T
         }
 
 
+def batch_compare_with_reference(reference_ui: str, target_uis: List[str],
+                                 workers: Optional[int] = None, match: str = "name",
+                                 top: Optional[int] = None,
+                                 scoring_profile: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Score one reference UI against many target UIs.
+
+    Args:
+        reference_ui: Reference .ui file path
+        target_uis: Target .ui files and/or directories
+        workers: Worker processes (default: CPU count)
+        match: "name" or "assignment"
+        top: Only return the best N targets
+        scoring_profile: Optional scoring profile JSON path
+
+    Returns:
+        Targets ranked by similarity score
+    """
+    try:
+        if not Path(reference_ui).exists():
+            return {
+                "status": "error",
+                "message": f"Reference UI file not found: {reference_ui}"
+            }
+
+        targets = [t for t in expand_ui_paths(target_uis) if t != reference_ui]
+        records = list(compare_one_to_many(reference_ui, targets, workers=workers,
+                                           match=match, profile=scoring_profile))
+        ranked = sorted((r for r in records if r["status"] == "success"),
+                        key=lambda r: r["similarity_score"], reverse=True)
+
+        return {
+            "status": "success",
+            "reference_ui": reference_ui,
+            "compared": len(ranked),
+            "results": ranked[:top] if top else ranked,
+            "errors": [r for r in records if r["status"] != "success"]
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+def lint_ui_files(paths: List[str], workers: Optional[int] = None,
+                  severities: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Run the structural verification rules on .ui files (no editor needed).
+
+    Args:
+        paths: .ui files and/or directories
+        workers: Worker processes (default: CPU count)
+        severities: Rule id -> severity override ("error", "warning", "info", "off")
+
+    Returns:
+        Per-file findings and severity totals
+    """
+    try:
+        records = list(lint_paths(paths, workers=workers, severities=severities))
+        totals = {"error": 0, "warning": 0, "info": 0}
+        for record in records:
+            for severity, count in record.get("counts", {}).items():
+                totals[severity] += count
+
+        return {
+            "status": "success",
+            "files": len(records),
+            "totals": totals,
+            "results": [r for r in records if r["status"] == "success" and r["findings"]],
+            "errors": [r for r in records if r["status"] != "success"]
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+def check_ui_integrity(ui_file: str) -> Dict[str, Any]:
+    """
+    Check a .ui file's schema and object references (no editor needed).
+
+    Reports duplicate object names, buddies/tab stops/connections/actions
+    naming missing objects, and widgets outside their parent's layout.
+
+    Args:
+        ui_file: Path to .ui file
+
+    Returns:
+        Schema violations, integrity issues and error/warning totals
+    """
+    try:
+        if not Path(ui_file).exists():
+            return {
+                "status": "error",
+                "message": f"UI file not found: {ui_file}"
+            }
+
+        manager = UIManager(ui_file)
+        schema = manager.validate()
+        integrity = manager.check_integrity()
+        severities = [v.severity for v in schema + integrity]
+
+        return {
+            "status": "success",
+            "valid": "error" not in severities,
+            "errors": severities.count("error"),
+            "warnings": severities.count("warning"),
+            "schema": [v.to_dict() for v in schema],
+            "integrity": [issue.to_dict() for issue in integrity]
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+def analyze_ui_performance(ui_file: str, item_threshold: int = 100,
+                           page_threshold: int = 50) -> Dict[str, Any]:
+    """
+    Report widget count and nesting of a .ui file with ranked optimization hints.
+
+    Args:
+        ui_file: Path to .ui file
+        item_threshold: Static items from which a QListWidget/QTableWidget is reported
+        page_threshold: Objects on hidden tab pages from which lazy pages are recommended
+
+    Returns:
+        QObject count, max depth, redundant layouts, large item widgets and
+        recommendations sorted by estimated cost
+    """
+    try:
+        if not Path(ui_file).exists():
+            return {
+                "status": "error",
+                "message": f"UI file not found: {ui_file}"
+            }
+
+        report = UIManager(ui_file).analyze_performance(
+            item_threshold=item_threshold, page_threshold=page_threshold)
+        return {"status": "success", **report.to_dict()}
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+def visual_compare_with_reference(reference_ui: str, target_ui: str,
+                                  port: int = EDITOR_PORT,
+                                  heatmap_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compare rendered target UI with rendered reference UI (pixel level).
+
+    Args:
+        reference_ui: Reference .ui file path
+        target_ui: Target .ui file path
+        port: Editor port used for rendering
+        heatmap_path: Optional path to write the difference heat-map PNG
+
+    Returns:
+        Comparison result with SSIM, changed ratio and changed regions
+    """
+    try:
+        for label, path in (("Reference", reference_ui), ("Target", target_ui)):
+            if not Path(path).exists():
+                return {
+                    "status": "error",
+                    "message": f"{label} UI file not found: {path}"
+                }
+
+        from visual_comparator import VisualComparator
+
+        comparator = VisualComparator(editor_port=port, client=EditorClient(EDITOR_HOST, port),
+                                      store=GoldenImageStore())
+        if not comparator.client.ping():
+            return {
+                "status": "error",
+                "message": f"Live UI Editor not running on port {port}. "
+                          f"Start with: rez-env pyside6 -- python live_ui_editor.py --ui {reference_ui} --port {port}"
+            }
+
+        result = comparator.compare_files(reference_ui, target_ui, heatmap_path=heatmap_path)
+
+        return {
+            "status": "success",
+            "reference_ui": reference_ui,
+            "target_ui": target_ui,
+            **result.to_dict(),
+            "report": comparator.generate_report(result)
+        }
+
+    except (ConnectionError, TimeoutError) as e:
+        return {
+            "status": "error",
+            "message": f"Cannot connect to editor: {e}"
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+# Linux FICLONE ioctl (reflink copy on btrfs/XFS/overlayfs)
+FICLONE = 0x40049409
+
+
+def _copy_file(source: str, destination: str) -> Tuple[str, str]:
+    """
+    Copy a file with the cheapest mechanism available.
+
+    Tries a reflink (shared extents), then in-kernel copy_file_range, then
+    a plain buffered copy. Like shutil.copy, a directory destination
+    receives a file of the same name and permission bits are copied.
+
+    Returns:
+        (destination file path, method used: "reflink", "copy_file_range" or "copy")
+
+    Raises:
+        shutil.SameFileError: If destination is the source file
+    """
+    if Path(destination).is_dir():
+        destination = str(Path(destination) / Path(source).name)
+    if Path(destination).exists() and Path(destination).samefile(source):
+        raise shutil.SameFileError(f"{source!r} and {destination!r} are the same file")
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        method = None
+        try:
+            import fcntl
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            method = "reflink"
+        except (ImportError, OSError):
+            pass
+
+        if method is None and hasattr(os, "copy_file_range"):
+            try:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    method = "copy_file_range"
+            except OSError:
+                pass
+            if method is None:
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+
+        if method is None:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+            method = "copy"
+
+    shutil.copymode(source, destination)
+    return destination, method
+
+
 def clone_from_reference(reference_ui: str, target_ui: str, verify: bool = True) -> Dict[str, Any]:
     """
     Clone UI from reference file.
@@ -388,28 +757,45 @@ def clone_from_reference(reference_ui: str, target_ui: str, verify: bool = True)
                 "message": f"Reference UI file not found: {reference_ui}"
             }
 
-        # Load reference
-        import shutil
-        shutil.copy(reference_ui, target_ui)
+        try:
+            target_ui, copy_method = _copy_file(reference_ui, target_ui)
+        except shutil.SameFileError:
+            return {
+                "status": "error",
+                "message": f"Target is the reference file: {target_ui}"
+            }
 
         result = {
             "status": "success",
             "message": f"Cloned {reference_ui} to {target_ui}",
             "reference_ui": reference_ui,
-            "target_ui": target_ui
+            "target_ui": target_ui,
+            "copy_method": copy_method
         }
 
-        # Verify if requested
+        # Verify if requested: byte-identical clones are confirmed by hash,
+        # the structural compare is only needed if the bytes differ
         if verify:
-            comparator = UIComparator()
-            comparator.load_reference(reference_ui)
-            comparator.load_target(target_ui)
-            comparison = comparator.compare()
-
-            result["verification"] = {
-                "similarity_score": comparison.similarity_score,
-                "verified": comparison.similarity_score >= 0.99
-            }
+            reference_hash = hash_file(reference_ui)
+            target_hash = hash_file(target_ui)
+            if reference_hash == target_hash:
+                result["verification"] = {
+                    "similarity_score": 1.0,
+                    "verified": True,
+                    "method": "hash",
+                    "sha256": reference_hash
+                }
+            else:
+                comparator = UIComparator()
+                comparator.load_reference(reference_ui)
+                comparator.load_target(target_ui)
+                comparison = comparator.compare()
+
+                result["verification"] = {
+                    "similarity_score": comparison.similarity_score,
+                    "verified": comparison.similarity_score >= 0.99,
+                    "method": "structural"
+                }
 
         return result
 
@@ -597,7 +983,58 @@ MCP_TOOLS = {
         "parameters": {
             "reference_ui": "Reference .ui file path",
             "target_ui": "Target .ui file path",
-            "detailed": "Show detailed differences (default: True)"
+            "detailed": "Show detailed differences (default: True)",
+            "similarity_mode": "'name' or 'tree' (tree edit distance, rename tolerant)",
+            "match": "'name' or 'assignment' (rename-tolerant widget pairing)",
+            "scoring_profile": "Scoring profile JSON path (optional)",
+            "output_jsonl": "Write full per-widget diffs as JSON lines (optional)"
+        }
+    },
+    "batch_compare_with_reference": {
+        "function": batch_compare_with_reference,
+        "description": "Rank many target UIs by similarity to one reference UI (parallel)",
+        "parameters": {
+            "reference_ui": "Reference .ui file path",
+            "target_uis": "List of target .ui files or directories",
+            "workers": "Worker processes (default: CPU count)",
+            "match": "'name' or 'assignment' (rename-tolerant widget pairing)",
+            "top": "Only return the best N targets (optional)",
+            "scoring_profile": "Scoring profile JSON path (optional)"
+        }
+    },
+    "lint_ui_files": {
+        "function": lint_ui_files,
+        "description": "Static lint of .ui files/directories with the verification rules (no editor, cached)",
+        "parameters": {
+            "paths": "List of .ui files or directories",
+            "workers": "Worker processes (default: CPU count)",
+            "severities": "Rule id -> 'error', 'warning', 'info' or 'off' (optional)"
+        }
+    },
+    "check_ui_integrity": {
+        "function": check_ui_integrity,
+        "description": "Check .ui schema and object references (duplicate names, dangling buddies/tab stops/connections, layout membership)",
+        "parameters": {
+            "ui_file": "Path to .ui file"
+        }
+    },
+    "analyze_ui_performance": {
+        "function": analyze_ui_performance,
+        "description": "Widget count, nesting depth and ranked performance hints (flatten layouts, model/view, lazy tabs)",
+        "parameters": {
+            "ui_file": "Path to .ui file",
+            "item_threshold": "Static items from which item widgets are reported (default 100)",
+            "page_threshold": "Objects on hidden pages from which lazy tabs are suggested (default 50)"
+        }
+    },
+    "visual_compare_with_reference": {
+        "function": visual_compare_with_reference,
+        "description": "Pixel-level comparison of rendered target UI with reference UI (SSIM, heat-map, changed regions)",
+        "parameters": {
+            "reference_ui": "Reference .ui file path",
+            "target_ui": "Target .ui file path",
+            "port": "Editor port (default 7001)",
+            "heatmap_path": "Write difference heat-map PNG (optional)"
         }
     },
     "clone_from_reference": {
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+MinHash Index - Near-duplicate .ui detection at repository scale
+
+Each UI's widget model (from UIComparator) is shingled into tokens: widget
+type paths, property/value pairs and parent/child type pairs. MinHash
+signatures (NumPy) approximate the Jaccard similarity of those token sets
+and are kept in a persistent JSON index. Locality-sensitive hashing over
+signature bands returns candidate duplicates without looking at every file,
+and only those candidates are verified with UIComparator.compare().
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ui_comparator import UIComparator, WidgetInfo
+
+
+DEFAULT_INDEX_PATH = ".ui_cache/minhash_index.json"
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 16  # 16 bands x 8 rows: candidates from ~0.7 Jaccard upward
+
+_PRIME = np.uint64((1 << 61) - 1)
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def shingles(widgets: Dict[str, WidgetInfo]) -> Set[str]:
+    """
+    Tokenize a widget model.
+
+    Tokens are independent of object names, so renamed copies of a UI
+    still share their shingles.
+
+    Args:
+        widgets: Widget model from UIComparator
+
+    Returns:
+        Set of string tokens
+    """
+    tokens = set()
+    paths: Dict[str, str] = {}
+
+    for name, widget in widgets.items():  # pre-order: parents come first
+        parent = widgets.get(widget.parent) if widget.parent else None
+        path = f"{paths[parent.name]}/{widget.type}" if parent is not None else widget.type
+        paths[name] = path
+
+        tokens.add(f"path:{path}")
+        if parent is not None:
+            tokens.add(f"edge:{parent.type}>{widget.type}")
+        if widget.geometry:
+            # Coarse size bucket: tolerant to small layout shifts
+            tokens.add(f"size:{widget.type}:{widget.geometry.get('width', 0) // 50}"
+                       f"x{widget.geometry.get('height', 0) // 50}")
+        for prop, value in widget.properties.items():
+            if isinstance(value, dict):
+                value = json.dumps(value, sort_keys=True)
+            tokens.add(f"prop:{widget.type}.{prop}={value}")
+
+    return tokens
+
+
+def _token_hashes(tokens: Iterable[str]) -> np.ndarray:
+    """32-bit hashes of tokens."""
+    return np.array([int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=4).digest(), "little")
+                     for t in tokens], dtype=np.uint64)
+
+
+class MinHasher:
+    """MinHash signatures with universal hashing (a * x + b) mod p."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        # a < 2^31 and x < 2^32 keep a * x + b within uint64
+        self._a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        """
+        MinHash signature of a token set.
+
+        Returns:
+            uint32 array of length num_perm (all 0xFFFFFFFF for an empty set)
+        """
+        x = _token_hashes(tokens)
+        if x.size == 0:
+            return np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32)
+        hashed = ((x[:, None] * self._a[None, :] + self._b[None, :]) % _PRIME) & _MASK32
+        return hashed.min(axis=0).astype(np.uint32)
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+class MinHashIndex:
+    """Persistent MinHash/LSH index of .ui files."""
+
+    def __init__(self, index_path: str = DEFAULT_INDEX_PATH,
+                 num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS, seed: int = 1):
+        """
+        Initialize index.
+
+        Args:
+            index_path: JSON index file
+            num_perm: Signature length
+            bands: LSH bands (num_perm must be divisible by bands)
+            seed: Hash function seed
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.index_path = Path(index_path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.signatures: Dict[str, np.ndarray] = {}
+
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            num_perm, bands, seed = data["num_perm"], data["bands"], data["seed"]
+            self.entries = data.get("entries", {})
+            self.signatures = {key: np.frombuffer(bytes.fromhex(entry["signature"]), dtype=np.uint32)
+                               for key, entry in self.entries.items()}
+
+        self.num_perm, self.bands, self.seed = num_perm, bands, seed
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, seed)
+        self._buckets: Optional[Dict[Tuple[int, bytes], List[str]]] = None
+
+    def save(self):
+        """Write index to disk."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": 1,
+                "num_perm": self.num_perm,
+                "bands": self.bands,
+                "seed": self.seed,
+                "entries": self.entries
+            }, f, indent=1, sort_keys=True)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.bands)]
+
+    @property
+    def buckets(self) -> Dict[Tuple[int, bytes], List[str]]:
+        """LSH buckets (band, band bytes) -> keys (built lazily)."""
+        if self._buckets is None:
+            self._buckets = {}
+            for key, signature in self.signatures.items():
+                for band_key in self._band_keys(signature):
+                    self._buckets.setdefault(band_key, []).append(key)
+        return self._buckets
+
+    def signature_of(self, ui_file: str) -> Tuple[str, np.ndarray]:
+        """Content hash and signature of a .ui file."""
+        content_hash, widgets = UIComparator()._load_model(ui_file)
+        return content_hash, self.hasher.signature(shingles(widgets))
+
+    def add_file(self, ui_file: str) -> bool:
+        """
+        Add or refresh a .ui file.
+
+        Returns:
+            True if the signature was (re)computed, False if unchanged
+        """
+        key = str(Path(ui_file))
+        content_hash = hashlib.sha256(Path(ui_file).read_bytes()).hexdigest()
+        if self.entries.get(key, {}).get("ui_hash") == content_hash:
+            return False
+
+        _, signature = self.signature_of(ui_file)
+        self.entries[key] = {"ui_hash": content_hash, "signature": signature.tobytes().hex()}
+        self.signatures[key] = signature
+        self._buckets = None
+        return True
+
+    def add_directory(self, directory: str) -> Dict[str, Any]:
+        """
+        Index all .ui files under a directory; drop entries whose files are gone.
+
+        Returns:
+            {"updated": entries (re)computed, "pruned": entries removed,
+             "skipped": [{"ui_file", "message"}] for files that couldn't be read}
+        """
+        updated = 0
+        skipped = []
+        for ui_file in sorted(Path(directory).rglob("*.ui")):
+            try:
+                if self.add_file(str(ui_file)):
+                    updated += 1
+            except Exception as e:
+                skipped.append({"ui_file": str(ui_file), "message": str(e)})
+        return {"updated": updated, "pruned": self.prune(), "skipped": skipped}
+
+    def prune(self) -> int:
+        """Remove entries for files that no longer exist."""
+        stale = [key for key in self.entries if not Path(key).exists()]
+        for key in stale:
+            del self.entries[key]
+            del self.signatures[key]
+        if stale:
+            self._buckets = None
+        return len(stale)
+
+    def candidates(self, signature: np.ndarray) -> Set[str]:
+        """Keys sharing at least one LSH band with a signature."""
+        buckets = self.buckets
+        found = set()
+        for band_key in self._band_keys(signature):
+            found.update(buckets.get(band_key, ()))
+        return found
+
+    def query(self, ui_file: str, threshold: float = 0.8, verify: bool = True,
+              match: str = "assignment") -> List[Dict[str, Any]]:
+        """
+        Find indexed UIs similar to a .ui file.
+
+        Args:
+            ui_file: Query .ui file
+            threshold: Minimum similarity (structural when verifying,
+                estimated Jaccard otherwise)
+            verify: Confirm candidates with UIComparator.compare()
+            match: Matching mode used for verification ("assignment" pairs
+                renamed widgets, like the name-free shingles do)
+
+        Returns:
+            List of {"key", "estimated", "similarity"} sorted by similarity
+        """
+        key = str(Path(ui_file))
+        _, signature = self.signature_of(ui_file)
+        matches = []
+        for other in self.candidates(signature):
+            if other == key:
+                continue
+            scored = self._score(ui_file, other, signature, self.signatures[other],
+                                 threshold, verify, match)
+            if scored is not None:
+                matches.append({"key": other, **scored})
+        return sorted(matches, key=lambda m: (-m["similarity"], m["key"]))
+
+    def near_duplicates(self, threshold: float = 0.8, verify: bool = True,
+                        match: str = "assignment") -> List[Dict[str, Any]]:
+        """
+        All candidate pairs from shared LSH buckets that pass the threshold.
+
+        Returns:
+            List of {"a", "b", "estimated", "similarity"} sorted by similarity
+        """
+        pairs = set()
+        for keys in self.buckets.values():
+            if len(keys) > 1:
+                ordered = sorted(keys)
+                pairs.update((a, b) for i, a in enumerate(ordered) for b in ordered[i + 1:])
+
+        results = []
+        for a, b in sorted(pairs):
+            scored = self._score(a, b, self.signatures[a], self.signatures[b],
+                                 threshold, verify, match)
+            if scored is not None:
+                results.append({"a": a, "b": b, **scored})
+        return sorted(results, key=lambda m: (-m["similarity"], m["a"], m["b"]))
+
+    def _score(self, a: str, b: str, sig_a: np.ndarray, sig_b: np.ndarray,
+               threshold: float, verify: bool, match: str) -> Optional[Dict[str, float]]:
+        estimated = estimate_similarity(sig_a, sig_b)
+        if not verify:
+            return {"estimated": estimated, "similarity": estimated} if estimated >= threshold else None
+
+        similarity = verify_pair(a, b, match)
+        if similarity < threshold:
+            return None
+        return {"estimated": estimated, "similarity": similarity}
+
+
+def verify_pair(a: str, b: str, match: str = "assignment") -> float:
+    """Symmetric structural similarity: the lower of both compare() directions."""
+    comparator = UIComparator()
+    comparator.load_reference(a)
+    comparator.load_target(b)
+    forward = comparator.compare(match=match).similarity_score
+    comparator.load_reference(b)
+    comparator.load_target(a)
+    return min(forward, comparator.compare(match=match).similarity_score)
+
+
+def main():
+    """Build and query the MinHash index."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MinHash/LSH near-duplicate index of .ui files")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="Index file")
+    parser.add_argument("--no-verify", action="store_true", help="Report estimated similarity only")
+    parser.add_argument("--match", default="assignment", choices=("name", "assignment"),
+                        help="Matching mode used to verify candidates")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_index = sub.add_parser("index", help="Index .ui files in a directory")
+    p_index.add_argument("directory")
+
+    p_query = sub.add_parser("query", help="Find UIs similar to a .ui file")
+    p_query.add_argument("ui_file")
+    p_query.add_argument("--threshold", type=float, default=0.8)
+
+    p_dups = sub.add_parser("duplicates", help="List near-duplicate pairs")
+    p_dups.add_argument("--threshold", type=float, default=0.8)
+
+    args = parser.parse_args()
+    index = MinHashIndex(args.index)
+
+    if args.command == "index":
+        result = index.add_directory(args.directory)
+        index.save()
+        for skipped in result["skipped"]:
+            print(f"Skipping {skipped['ui_file']}: {skipped['message']}", file=sys.stderr)
+        print(f"Indexed {result['updated']} file(s), {len(index.entries)} total")
+
+    elif args.command == "query":
+        print(json.dumps(index.query(args.ui_file, args.threshold,
+                                     verify=not args.no_verify, match=args.match), indent=2))
+
+    elif args.command == "duplicates":
+        print(json.dumps(index.near_duplicates(args.threshold, verify=not args.no_verify,
+                                               match=args.match), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Perceptual Hash Index - Find visually similar UIs
+
+Computes aHash/dHash/pHash fingerprints (NumPy) of UIs rendered through the
+Live UI Editor and keeps them in an on-disk JSON index. Hamming-distance
+queries go through a BK-tree, so "find UIs that look like this one" only
+visits the branches that can still be within range.
+"""
+
+import base64
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from editor_client import EditorClient
+from golden_store import GoldenImageStore, hash_file
+from image_utils import ImageSource, load_image, luminance, integral_image
+
+
+HASH_KINDS = ("ahash", "dhash", "phash")
+DEFAULT_INDEX_PATH = "screenshots/phash_index.json"
+
+
+def resize_area(gray: np.ndarray, height: int, width: int) -> np.ndarray:
+    """Downscale by averaging each output cell's source area (integral image)."""
+    table = integral_image(gray)
+    ys = np.linspace(0, gray.shape[0], height + 1).round().astype(int)
+    xs = np.linspace(0, gray.shape[1], width + 1).round().astype(int)
+    ys[1:] = np.maximum(ys[1:], ys[:-1] + 1)
+    xs[1:] = np.maximum(xs[1:], xs[:-1] + 1)
+    ys = np.minimum(ys, gray.shape[0])
+    xs = np.minimum(xs, gray.shape[1])
+
+    y0, y1 = ys[:-1, None], ys[1:, None]
+    x0, x1 = xs[None, :-1], xs[None, 1:]
+    total = table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+    area = np.maximum((y1 - y0) * (x1 - x0), 1)
+    return total / area
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    """Pack a boolean array (row-major) into an integer."""
+    return int("".join("1" if b else "0" for b in bits.ravel()), 2)
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix."""
+    n = np.arange(size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+    matrix[0] *= 1 / np.sqrt(2)
+    return matrix * np.sqrt(2 / size)
+
+
+_DCT_32 = _dct_matrix(32)
+
+
+def ahash(gray: np.ndarray) -> int:
+    """Average hash (64 bit)."""
+    small = resize_area(gray, 8, 8)
+    return _bits_to_int(small > small.mean())
+
+
+def dhash(gray: np.ndarray) -> int:
+    """Difference hash (64 bit): horizontal gradient signs."""
+    small = resize_area(gray, 8, 9)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def phash(gray: np.ndarray) -> int:
+    """DCT perceptual hash (64 bit)."""
+    small = resize_area(gray, 32, 32)
+    coeffs = (_DCT_32 @ small @ _DCT_32.T)[:8, :8]
+    median = np.median(coeffs.ravel()[1:])
+    return _bits_to_int(coeffs > median)
+
+
+def compute_hashes(image: ImageSource) -> Dict[str, int]:
+    """
+    Compute all perceptual hashes of an image.
+
+    Args:
+        image: Image (array, PNG bytes, base64 or path)
+
+    Returns:
+        Dict of hash kind -> 64-bit integer
+    """
+    gray = luminance(load_image(image))
+    return {"ahash": ahash(gray), "dhash": dhash(gray), "phash": phash(gray)}
+
+
+def render_png(ui_file: str, client: EditorClient) -> bytes:
+    """
+    Render a .ui file off-screen in the Live UI Editor.
+
+    Args:
+        ui_file: Path to .ui file
+        client: Editor client used for rendering
+
+    Returns:
+        PNG bytes
+    """
+    response = client.render_ui(str(Path(ui_file).absolute()))
+    if response.get("status") != "success":
+        raise RuntimeError(f"Failed to render {ui_file}: {response.get('message')}")
+    return base64.b64decode(response["screenshot_base64"])
+
+
+def hamming(a: int, b: int) -> int:
+    """Hamming distance between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """Burkhard-Keller tree over Hamming distance."""
+
+    def __init__(self):
+        # node: [hash, keys, {distance: child}]
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, value: int, key: str):
+        """Insert a hash with its key (keys with equal hashes share a node)."""
+        self._size += 1
+        if self._root is None:
+            self._root = [value, [key], {}]
+            return
+
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(key)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [key], {}]
+                return
+            node = child
+
+    def query(self, value: int, max_distance: int) -> List[Tuple[int, str]]:
+        """
+        Find all keys within max_distance.
+
+        Returns:
+            List of (distance, key) sorted by distance
+        """
+        results = []
+        if self._root is None:
+            return results
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= max_distance:
+                results.extend((distance, key) for key in node[1])
+            # Triangle inequality: only children in [d - r, d + r] can match
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for edge, child in node[2].items() if low <= edge <= high)
+
+        results.sort()
+        return results
+
+
+class PerceptualHashIndex:
+    """On-disk perceptual hash index of rendered UI files."""
+
+    def __init__(self, index_path: str = DEFAULT_INDEX_PATH, kind: str = "phash"):
+        """
+        Initialize index.
+
+        Args:
+            index_path: JSON index file
+            kind: Hash used for queries (ahash, dhash or phash)
+        """
+        if kind not in HASH_KINDS:
+            raise ValueError(f"Unknown hash kind: {kind}")
+
+        self.index_path = Path(index_path)
+        self.kind = kind
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._tree: Optional[BKTree] = None
+
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+
+    def save(self):
+        """Write index to disk."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self.entries}, f, indent=1, sort_keys=True)
+
+    @property
+    def tree(self) -> BKTree:
+        """BK-tree over the selected hash kind (built lazily)."""
+        if self._tree is None:
+            self._tree = BKTree()
+            for key, entry in self.entries.items():
+                self._tree.add(int(entry[self.kind], 16), key)
+        return self._tree
+
+    def add_image(self, key: str, image: ImageSource, ui_hash: Optional[str] = None):
+        """
+        Add or replace an entry from an image.
+
+        Args:
+            key: Entry key (usually the .ui file path)
+            image: Rendered image
+            ui_hash: Content hash of the .ui file
+        """
+        hashes = compute_hashes(image)
+        self.entries[key] = {kind: f"{value:016x}" for kind, value in hashes.items()}
+        self.entries[key]["ui_hash"] = ui_hash
+        self._tree = None
+
+    def add_ui(self, ui_file: str, client: EditorClient,
+               store: Optional[GoldenImageStore] = None) -> bool:
+        """
+        Render a .ui file in the Live Editor and index it.
+
+        Unchanged files (same content hash) are skipped.
+
+        Args:
+            ui_file: Path to .ui file
+            client: Editor client used for rendering
+            store: Optional golden store to reuse rendered frames
+
+        Returns:
+            True if the entry was (re)computed
+        """
+        key = str(Path(ui_file))
+        ui_hash = hash_file(ui_file)
+        if self.entries.get(key, {}).get("ui_hash") == ui_hash:
+            return False
+
+        params = {"renderer": "offscreen"}
+        image = store.get(ui_file, params, ui_hash=ui_hash) if store else None
+        if image is None:
+            image = render_png(ui_file, client)
+            if store is not None:
+                store.put(ui_file, image, params, ui_hash=ui_hash)
+
+        self.add_image(key, image, ui_hash)
+        return True
+
+    def add_directory(self, directory: str, client: EditorClient,
+                      store: Optional[GoldenImageStore] = None) -> int:
+        """
+        Index all .ui files under a directory.
+
+        Returns:
+            Number of entries (re)computed
+        """
+        updated = 0
+        for ui_file in sorted(Path(directory).rglob("*.ui")):
+            if self.add_ui(str(ui_file), client, store):
+                updated += 1
+        return updated
+
+    def query(self, image: ImageSource, max_distance: int = 8) -> List[Dict[str, Any]]:
+        """
+        Find indexed UIs that look like an image.
+
+        Args:
+            image: Query image
+            max_distance: Maximum Hamming distance (0-64)
+
+        Returns:
+            List of {"key", "distance"} sorted by distance
+        """
+        value = compute_hashes(image)[self.kind]
+        return [{"key": key, "distance": distance}
+                for distance, key in self.tree.query(value, max_distance)]
+
+    def query_key(self, key: str, max_distance: int = 8) -> List[Dict[str, Any]]:
+        """Find entries similar to an already indexed entry (excluding itself)."""
+        value = int(self.entries[key][self.kind], 16)
+        return [{"key": other, "distance": distance}
+                for distance, other in self.tree.query(value, max_distance)
+                if other != key]
+
+    def near_duplicates(self, max_distance: int = 4) -> List[List[str]]:
+        """
+        Group entries whose hashes are within max_distance of each other.
+
+        Returns:
+            Groups (size >= 2) of entry keys
+        """
+        parent = {key: key for key in self.entries}
+
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for key in self.entries:
+            for match in self.query_key(key, max_distance):
+                root_a, root_b = find(key), find(match["key"])
+                if root_a != root_b:
+                    parent[root_b] = root_a
+
+        groups: Dict[str, List[str]] = {}
+        for key in self.entries:
+            groups.setdefault(find(key), []).append(key)
+        return sorted((sorted(g) for g in groups.values() if len(g) > 1), key=len, reverse=True)
+
+
+def main():
+    """Build and query the perceptual hash index."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Perceptual hash index of rendered UIs")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="Index file")
+    parser.add_argument("--kind", default="phash", choices=HASH_KINDS, help="Hash used for queries")
+    parser.add_argument("--port", type=int, default=7010, help="Live Editor port")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_index = sub.add_parser("index", help="Render and index .ui files in a directory")
+    p_index.add_argument("directory")
+    p_index.add_argument("--store", help="Golden image store directory")
+
+    p_query = sub.add_parser("query", help="Find UIs similar to a .ui or .png")
+    p_query.add_argument("path")
+    p_query.add_argument("--max-distance", type=int, default=8)
+
+    p_dups = sub.add_parser("duplicates", help="List near-duplicate groups")
+    p_dups.add_argument("--max-distance", type=int, default=4)
+
+    args = parser.parse_args()
+    index = PerceptualHashIndex(args.index, kind=args.kind)
+    client = EditorClient(port=args.port)
+
+    if args.command == "index":
+        store = GoldenImageStore(args.store) if args.store else None
+        updated = index.add_directory(args.directory, client, store)
+        index.save()
+        print(f"Indexed {updated} file(s), {len(index.entries)} total")
+
+    elif args.command == "query":
+        key = str(Path(args.path))
+        if key in index.entries:
+            matches = index.query_key(key, args.max_distance)
+        elif args.path.endswith(".ui"):
+            matches = index.query(render_png(args.path, client), args.max_distance)
+        else:
+            matches = index.query(args.path, args.max_distance)
+        print(json.dumps(matches, indent=2))
+
+    elif args.command == "duplicates":
+        print(json.dumps(index.near_duplicates(args.max_distance), indent=2))
+
+
+if __name__ == "__main__":
+    main()
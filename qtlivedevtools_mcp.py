@@ -34,6 +34,8 @@ try:
         add_layout_to_ui,
         modify_widget_property,
         get_ui_structure,
+        check_ui_integrity,
+        analyze_ui_performance,
         preview_ui,
         analyze_ui,
         send_command_to_editor
@@ -177,6 +179,46 @@ async def list_tools() -> list[Tool]:
                 "required": ["ui_file"]
             }
         ),
+        Tool(
+            name="check_ui_integrity",
+            description="Check .ui schema and object references: duplicate names, dangling buddies, "
+                        "tab stops, connections and actions, widgets outside their parent's layout",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ui_file": {
+                        "type": "string",
+                        "description": "Path to .ui file"
+                    }
+                },
+                "required": ["ui_file"]
+            }
+        ),
+        Tool(
+            name="analyze_ui_performance",
+            description="Report QObject count and nesting depth of a .ui file with ranked performance "
+                        "recommendations (flatten redundant layouts, model/view for static items, lazy tabs)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ui_file": {
+                        "type": "string",
+                        "description": "Path to .ui file"
+                    },
+                    "item_threshold": {
+                        "type": "integer",
+                        "description": "Static items from which item widgets are reported",
+                        "default": 100
+                    },
+                    "page_threshold": {
+                        "type": "integer",
+                        "description": "Objects on hidden pages from which lazy tabs are suggested",
+                        "default": 50
+                    }
+                },
+                "required": ["ui_file"]
+            }
+        ),
         Tool(
             name="preview_ui",
             description="Preview UI in Live Editor and take screenshot (requires Live Editor running)",
@@ -283,6 +325,16 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         elif name == "get_ui_structure":
             result = get_ui_structure(arguments["ui_file"])
 
+        elif name == "check_ui_integrity":
+            result = check_ui_integrity(arguments["ui_file"])
+
+        elif name == "analyze_ui_performance":
+            result = analyze_ui_performance(
+                arguments["ui_file"],
+                arguments.get("item_threshold", 100),
+                arguments.get("page_threshold", 50)
+            )
+
         elif name == "preview_ui":
             result = preview_ui(
                 arguments["ui_file"],
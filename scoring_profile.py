@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Scoring Profile - Weighted similarity scoring for UIComparator
+
+A scoring profile (JSON) controls how much each difference costs:
+- per-property weights (0 ignores a property)
+- geometry tolerances: differences up to the tolerance are free, the
+  penalty then grows linearly and saturates at tolerance + scale
+- per-type widget weights (a missing QTableView can matter more than a
+  missing QLabel)
+- type-equivalence classes (QPushButton ~ QToolButton) that are not
+  penalized as type changes and are used to block assignment matching
+
+Scores for all matched widgets are computed in one NumPy pass.
+"""
+
+import json
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+
+GEOMETRY_KEYS = ("x", "y", "width", "height")
+
+
+@dataclass
+class ScoringProfile:
+    """Weights and tolerances for similarity scoring."""
+    name: str = "default"
+    match_weight: float = 0.7  # share of the score from widgets being present
+    content_weight: float = 0.3  # share from matched widgets being equal
+    geometry_weight: float = 1.0  # geometry vs properties within one widget
+    properties_weight: float = 1.0
+    default_property_weight: float = 1.0
+    property_weights: Dict[str, float] = field(default_factory=dict)
+    position_tolerance: int = 0  # px
+    size_tolerance: int = 0  # px
+    geometry_scale: int = 50  # px beyond tolerance for a full geometry penalty
+    type_weights: Dict[str, float] = field(default_factory=dict)
+    type_classes: List[List[str]] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScoringProfile":
+        """Build a profile from a dict, rejecting unknown keys."""
+        known = set(cls.__dataclass_fields__)
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown scoring profile keys: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    @classmethod
+    def load(cls, path: str) -> "ScoringProfile":
+        """Load a profile from a JSON file."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
+
+    def type_class_map(self) -> Dict[str, str]:
+        """Widget type -> equivalence class name (first type of the class)."""
+        return {widget_type: group[0] for group in self.type_classes for widget_type in group}
+
+    def score(self, reference_widgets: Dict[str, Any], target_widgets: Dict[str, Any],
+              pairs: List[Tuple[str, str]]) -> float:
+        """
+        Weighted similarity of a comparison.
+
+        Args:
+            reference_widgets: Reference widget model
+            target_widgets: Target widget model
+            pairs: Matched (reference name, target name) pairs
+
+        Returns:
+            Similarity 0.0 to 1.0
+        """
+        if not reference_widgets:
+            return 0.0
+
+        total_weight = self.total_weight(reference_widgets)
+        matched_weight, weighted_penalty = self.partial_score(
+            [reference_widgets[r] for r, _ in pairs], [target_widgets[t] for _, t in pairs])
+        return self.combine(total_weight, matched_weight, weighted_penalty)
+
+    def total_weight(self, reference_widgets: Dict[str, Any]) -> float:
+        """Sum of type weights over all reference widgets."""
+        type_weights = self.type_weights
+        return float(sum(type_weights.get(w.type, 1.0) for w in reference_widgets.values()))
+
+    def partial_score(self, refs: List[Any], tgts: List[Any]) -> Tuple[float, float]:
+        """
+        Score contribution of a batch of matched pairs.
+
+        Batches can be accumulated (summed) and passed to combine(), so
+        huge comparisons can be scored in chunks.
+
+        Returns:
+            (matched type weight, type-weighted penalty)
+        """
+        if not refs:
+            return 0.0, 0.0
+        weights = np.array([self.type_weights.get(w.type, 1.0) for w in refs])
+        return float(weights.sum()), float(weights @ self.widget_penalties(refs, tgts))
+
+    def combine(self, total_weight: float, matched_weight: float, weighted_penalty: float) -> float:
+        """Final similarity from accumulated partial scores."""
+        if matched_weight <= 0 or total_weight <= 0:
+            return 0.0
+        matching_score = matched_weight / total_weight
+        content_score = 1.0 - weighted_penalty / matched_weight
+        norm = self.match_weight + self.content_weight
+        return float((self.match_weight * matching_score + self.content_weight * content_score) / norm)
+
+    def widget_penalties(self, refs: List[Any], tgts: List[Any]) -> np.ndarray:
+        """
+        Content penalty (0.0 equal to 1.0 unrelated) of each matched pair.
+
+        Args:
+            refs: Reference WidgetInfo objects
+            tgts: Target WidgetInfo objects (same length)
+
+        Returns:
+            Array of penalties
+        """
+        n = len(refs)
+        identical = np.array([r.content_hash == t.content_hash and r.content_hash != ""
+                              for r, t in zip(refs, tgts)], dtype=bool)
+
+        # Type: different equivalence class means a different widget
+        classes = self.type_class_map()
+        type_mismatch = np.array([classes.get(r.type, r.type) != classes.get(t.type, t.type)
+                                  for r, t in zip(refs, tgts)], dtype=bool)
+
+        geometry_penalty = self._geometry_penalties(refs, tgts)
+        property_penalty, has_properties = self._property_penalties(refs, tgts, identical)
+
+        geometry_w = self.geometry_weight
+        properties_w = self.properties_weight * has_properties
+        denom = geometry_w + properties_w
+        with np.errstate(invalid="ignore", divide="ignore"):
+            penalty = np.where(denom > 0,
+                               (geometry_w * geometry_penalty + properties_w * property_penalty) / denom,
+                               0.0)
+
+        penalty[identical] = 0.0
+        penalty[type_mismatch] = 1.0
+        return penalty if n else np.zeros(0)
+
+    def _geometry_penalties(self, refs: List[Any], tgts: List[Any]) -> np.ndarray:
+        """Tolerance-aware geometry penalties; one side without geometry costs 1."""
+        def rects(widgets):
+            return np.array([[w.geometry.get(k, 0) for k in GEOMETRY_KEYS] if w.geometry
+                             else [np.nan] * 4 for w in widgets], dtype=float).reshape(-1, 4)
+
+        a, b = rects(refs), rects(tgts)
+        delta = np.abs(a - b)
+        position = np.max(delta[:, :2], axis=1)
+        size = np.max(delta[:, 2:], axis=1)
+        scale = max(self.geometry_scale, 1)
+        penalty = np.maximum(np.clip((position - self.position_tolerance) / scale, 0, 1),
+                             np.clip((size - self.size_tolerance) / scale, 0, 1))
+
+        missing_a, missing_b = np.isnan(a[:, 0]), np.isnan(b[:, 0])
+        penalty[missing_a & missing_b] = 0.0
+        penalty[missing_a ^ missing_b] = 1.0
+        return penalty
+
+    def _property_penalties(self, refs: List[Any], tgts: List[Any],
+                            identical: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Weighted share of differing properties; skips identical pairs."""
+        n = len(refs)
+        weights = self.property_weights
+        default = self.default_property_weight
+
+        index, prop_weight, differs = [], [], []
+        for i in np.flatnonzero(~identical):
+            ref_props, tgt_props = refs[i].properties, tgts[i].properties
+            for prop in ref_props.keys() | tgt_props.keys():
+                index.append(i)
+                prop_weight.append(weights.get(prop, default))
+                differs.append(ref_props.get(prop) != tgt_props.get(prop))
+
+        index = np.array(index, dtype=np.int64)
+        prop_weight = np.array(prop_weight, dtype=float)
+        differs = np.array(differs, dtype=bool)
+
+        present = np.bincount(index, weights=prop_weight, minlength=n)
+        changed = np.bincount(index, weights=prop_weight * differs, minlength=n)
+        has_properties = (present > 0).astype(float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            penalty = np.where(present > 0, changed / present, 0.0)
+        return penalty, has_properties
+
+
+def load_profile(profile: Optional[Any]) -> Optional[ScoringProfile]:
+    """
+    Normalize a profile argument.
+
+    Args:
+        profile: None, a ScoringProfile, a dict, or a JSON file path
+
+    Returns:
+        ScoringProfile or None
+    """
+    if profile is None or isinstance(profile, ScoringProfile):
+        return profile
+    if isinstance(profile, dict):
+        return ScoringProfile.from_dict(profile)
+    return ScoringProfile.load(str(profile))
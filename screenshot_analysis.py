@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Screenshot Analysis - Pixel checks on rendered UIs
+
+Verification rules that look at the frame grabbed by the Live UI Editor,
+using the rendered widget rects it reports (get_widget_geometry, or
+render_ui with geometry=True):
+
+- clipped-text: text widgets whose ink runs into opposite edges of their
+  rect (the text is wider or taller than the widget)
+- empty-region: large blank areas of the window not covered by any widget
+- zero-size-widget: visible widgets laid out at zero width or height
+- text-contrast: text whose foreground/background contrast fails WCAG
+
+Frame-wide work (luminance, gradient masks, summed-area tables, block
+statistics) is done once with NumPy; per-widget checks are O(1) table
+lookups vectorized over all widgets.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from image_utils import contrast_ratio, integral_image, luminance, relative_luminance
+from ui_rules import Rule, RuleContext, RuleEngine, register_rule
+
+
+# Widgets whose text is expected to fit (line edits scroll, views elide)
+TEXT_CLASSES = frozenset({
+    "QLabel", "QPushButton", "QToolButton", "QCheckBox", "QRadioButton", "QCommandLinkButton"
+})
+
+# Widgets that only hold other widgets; their area doesn't count as content
+CONTAINER_CLASSES = frozenset({
+    "QWidget", "QFrame", "QGroupBox", "QScrollArea", "QTabWidget", "QStackedWidget",
+    "QToolBox", "QSplitter", "QDialog", "QMainWindow", "QDockWidget"
+})
+
+
+def frame_luminance(context: RuleContext) -> np.ndarray:
+    """Luminance of the context frame, computed once per run."""
+    if "luminance" not in context.cache:
+        context.cache["luminance"] = luminance(context.frame)
+    return context.cache["luminance"]
+
+
+def frame_rects(geometry: Dict[str, Any], frame_shape: Tuple[int, ...],
+                widgets: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Widget rects in frame pixels, clipped to the frame.
+
+    Frames grabbed on high-DPI screens are larger than the logical window
+    size, so rects are scaled by frame width / window width.
+
+    Returns:
+        int array (n, 4) of x0, y0, x1, y1
+    """
+    height, width = frame_shape[:2]
+    scale = width / geometry["width"] if geometry.get("width") else 1.0
+    rects = np.array([[w["x"], w["y"], w["x"] + w["width"], w["y"] + w["height"]]
+                      for w in widgets], dtype=np.float64).reshape(-1, 4)
+    rects = np.rint(rects * scale).astype(np.int64)
+    np.clip(rects[:, 0::2], 0, width, out=rects[:, 0::2])
+    np.clip(rects[:, 1::2], 0, height, out=rects[:, 1::2])
+    return rects
+
+
+def _box_sums(table: np.ndarray, x0, y0, x1, y1) -> np.ndarray:
+    """Sums over many boxes of a summed-area table (vectorized)."""
+    return table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+
+
+def clipped_text(lum: np.ndarray, rects: np.ndarray, threshold: float = 48.0,
+                 edge: int = 2, reach: int = 6, trim: int = 4, min_ink: int = 2) -> np.ndarray:
+    """
+    Detect text running past widget borders.
+
+    Text "ink" is where luminance changes sharply along an edge: vertical
+    changes inside the left/right strips, horizontal changes inside the
+    top/bottom strips. Frame lines drawn along an edge are uniform in that
+    direction and don't count. Text is clipped horizontally when ink is in
+    the outermost columns on one side and near the opposite side too
+    (fitting left- or right-aligned text leaves a gap on the other side);
+    likewise vertically.
+
+    Args:
+        lum: Frame luminance (H x W)
+        rects: int array (n, 4) of x0, y0, x1, y1 in frame pixels
+        threshold: Luminance step counted as ink
+        edge: Width of the outermost strip (pixels)
+        reach: Width of the opposite-side strip
+        trim: Pixels skipped at strip ends (rounded corners)
+        min_ink: Ink pixels needed in a strip
+
+    Returns:
+        bool array (n, 4): clipped at left, top, right, bottom
+    """
+    if not len(rects):
+        return np.zeros((0, 4), dtype=bool)
+
+    along_y = np.zeros(lum.shape, dtype=np.float32)
+    along_y[1:] = np.abs(np.diff(lum, axis=0)) > threshold
+    along_x = np.zeros(lum.shape, dtype=np.float32)
+    along_x[:, 1:] = np.abs(np.diff(lum, axis=1)) > threshold
+    table_y, table_x = integral_image(along_y), integral_image(along_x)
+
+    x0, y0, x1, y1 = rects.T
+    width, height = x1 - x0, y1 - y0
+    trim_x = np.minimum(trim, width // 4)
+    trim_y = np.minimum(trim, height // 4)
+    edge_x, edge_y = np.minimum(edge, width // 2), np.minimum(edge, height // 2)
+    reach_x, reach_y = np.minimum(reach, width // 2), np.minimum(reach, height // 2)
+    rows = (y0 + trim_y, y1 - trim_y)
+    cols = (x0 + trim_x, x1 - trim_x)
+
+    def ink(table, a0, b0, a1, b1):
+        return _box_sums(table, a0, b0, a1, b1) >= min_ink
+
+    left_edge = ink(table_y, x0, rows[0], x0 + edge_x, rows[1])
+    right_edge = ink(table_y, x1 - edge_x, rows[0], x1, rows[1])
+    left_near = ink(table_y, x0, rows[0], x0 + reach_x, rows[1])
+    right_near = ink(table_y, x1 - reach_x, rows[0], x1, rows[1])
+    top_edge = ink(table_x, cols[0], y0, cols[1], y0 + edge_y)
+    bottom_edge = ink(table_x, cols[0], y1 - edge_y, cols[1], y1)
+    top_near = ink(table_x, cols[0], y0, cols[1], y0 + reach_y)
+    bottom_near = ink(table_x, cols[0], y1 - reach_y, cols[1], y1)
+
+    horizontal = (left_edge & right_near) | (right_edge & left_near)
+    vertical = (top_edge & bottom_near) | (bottom_edge & top_near)
+    valid = (width > 2 * edge) & (height > 2 * edge)
+    return np.stack([horizontal & left_edge, vertical & top_edge,
+                     horizontal & right_edge, vertical & bottom_edge], axis=1) & valid[:, None]
+
+
+def text_contrast(lum: np.ndarray, rel_lum: np.ndarray, rects: np.ndarray, bins: int = 32,
+                  inset: int = 2, min_share: float = 0.01,
+                  min_pixels: int = 5) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Foreground/background contrast of text widgets.
+
+    Pixels of every rect (inset to skip frames) are gathered once and
+    binned by luma; one bincount over (widget, bin) keys yields per-widget
+    histograms and mean relative luminance per bin. The dominant bin is the
+    background; the foreground is the significant bin with the highest
+    contrast to it (glyph cores rather than anti-aliased edges).
+
+    Args:
+        lum: Frame luma (H x W, 0..255), used for binning
+        rel_lum: Frame relative luminance (H x W, 0..1)
+        rects: int array (n, 4) of x0, y0, x1, y1 in frame pixels
+        bins: Luma histogram bins
+        inset: Pixels dropped at each rect border
+        min_share: Minimum share of a rect's pixels for a foreground bin
+        min_pixels: Minimum pixel count for a foreground bin
+
+    Returns:
+        (contrast ratio, foreground luminance, background luminance) arrays;
+        NaN where a rect has no distinct foreground
+    """
+    n = len(rects)
+    nan = np.full(n, np.nan)
+    if not n:
+        return nan, nan, nan
+
+    inner = rects + np.array([inset, inset, -inset, -inset])
+    inner[:, 2] = np.maximum(inner[:, 2], inner[:, 0])
+    inner[:, 3] = np.maximum(inner[:, 3], inner[:, 1])
+    areas = (inner[:, 2] - inner[:, 0]) * (inner[:, 3] - inner[:, 1])
+
+    quantized = np.minimum(lum * (bins / 256.0), bins - 1).astype(np.int64)
+    slices = [(slice(y0, y1), slice(x0, x1)) for x0, y0, x1, y1 in inner.tolist()]
+    keys = np.concatenate([quantized[s].ravel() for s in slices] or [np.zeros(0, np.int64)])
+    keys += np.repeat(np.arange(n, dtype=np.int64) * bins, areas)
+    values = np.concatenate([rel_lum[s].ravel() for s in slices] or [np.zeros(0, np.float32)])
+
+    counts = np.bincount(keys, minlength=n * bins).reshape(n, bins)
+    sums = np.bincount(keys, weights=values, minlength=n * bins).reshape(n, bins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+
+    rows = np.arange(n)
+    background_bin = counts.argmax(axis=1)
+    background = means[rows, background_bin]
+
+    significant = counts >= np.maximum(min_pixels, min_share * areas)[:, None]
+    significant[rows, background_bin] = False
+    ratios = np.where(significant, contrast_ratio(means, background[:, None]), -np.inf)
+    foreground_bin = ratios.argmax(axis=1)
+    has_text = significant.any(axis=1)
+
+    ratio = np.where(has_text, ratios[rows, foreground_bin], np.nan)
+    foreground = np.where(has_text, means[rows, foreground_bin], np.nan)
+    return ratio, foreground, np.where(has_text, background, np.nan)
+
+
+def _largest_rectangle(grid: np.ndarray) -> Tuple[int, int, int, int, int]:
+    """Largest all-True rectangle in a small bool grid: (area, x, y, w, h) in cells."""
+    best = (0, 0, 0, 0, 0)
+    heights = np.zeros(grid.shape[1] + 1, dtype=np.int64)  # trailing 0 flushes the stack
+    for row in range(grid.shape[0]):
+        heights[:-1] = np.where(grid[row], heights[:-1] + 1, 0)
+        stack = []
+        for col, h in enumerate(heights.tolist()):
+            start = col
+            while stack and stack[-1][1] >= h:
+                start, top = stack.pop()
+                area = top * (col - start)
+                if area > best[0]:
+                    best = (area, start, row - top + 1, col - start, top)
+            stack.append((start, h))
+    return best
+
+
+def empty_regions(lum: np.ndarray, rects: np.ndarray, block: int = 16,
+                  flat_tolerance: float = 6.0, min_area_ratio: float = 0.1,
+                  min_side: int = 96, max_regions: int = 3) -> List[Tuple[int, int, int, int]]:
+    """
+    Find large blank areas not covered by content widgets.
+
+    The frame is reduced to block x block cells; a cell is blank when its
+    luminance range is within flat_tolerance and no content rect touches it.
+    The largest blank rectangles are then extracted greedily.
+
+    Args:
+        lum: Frame luminance (H x W)
+        rects: int array (n, 4) of content widget rects (x0, y0, x1, y1)
+        block: Cell size in pixels
+        flat_tolerance: Max luminance range of a blank cell
+        min_area_ratio: Minimum region area as a share of the frame
+        min_side: Minimum region width and height in pixels
+        max_regions: Maximum number of regions returned
+
+    Returns:
+        (x, y, width, height) regions in frame pixels, largest first
+    """
+    height, width = lum.shape
+    grid_h, grid_w = height // block, width // block
+    if not grid_h or not grid_w:
+        return []
+
+    cells = lum[:grid_h * block, :grid_w * block].reshape(grid_h, block, grid_w, block)
+    blank = (cells.max(axis=(1, 3)) - cells.min(axis=(1, 3))) <= flat_tolerance
+
+    for x0, y0, x1, y1 in rects.tolist():
+        if x1 > x0 and y1 > y0:
+            blank[y0 // block:-(-y1 // block), x0 // block:-(-x1 // block)] = False
+
+    regions = []
+    min_cells = min_area_ratio * height * width / (block * block)
+    for _ in range(max_regions):
+        area, x, y, w, h = _largest_rectangle(blank)
+        if area < min_cells or w * block < min_side or h * block < min_side:
+            break
+        regions.append((x * block, y * block, w * block, h * block))
+        blank[y:y + h, x:x + w] = False
+    return regions
+
+
+@register_rule
+class ClippedTextRule(Rule):
+    """Text cut off at the borders of its widget (from the rendered frame)."""
+    id = "clipped-text"
+    category = "content"
+    default_severity = "warning"
+    node_types = ()
+
+    def finish(self, context):
+        if context.frame is None or not context.geometry:
+            return
+        widgets = [w for w in context.geometry["widgets"]
+                   if w.get("text") and w.get("visible", True) and w["class"] in TEXT_CLASSES]
+        if not widgets:
+            return
+        rects = frame_rects(context.geometry, context.frame.shape, widgets)
+        clipped = clipped_text(frame_luminance(context), rects)
+        for widget, sides in zip(widgets, clipped):
+            if sides.any():
+                names = [side for side, hit in zip(("left", "top", "right", "bottom"), sides) if hit]
+                yield self.finding(
+                    f"Text of '{widget['name']}' is clipped ({', '.join(names)})",
+                    "Enlarge the widget, shorten the text, or let a layout size it",
+                    widget=widget["name"], sides=names, text=widget["text"])
+
+
+@register_rule
+class EmptyRegionRule(Rule):
+    """Large blank areas in the rendered window."""
+    id = "empty-region"
+    category = "layout"
+    default_severity = "info"
+    node_types = ()
+
+    def finish(self, context):
+        if context.frame is None or not context.geometry:
+            return
+        widgets = context.geometry["widgets"]
+        parents = {w.get("parent") for w in widgets}
+        content = [w for w in widgets if w.get("visible", True) and w["name"] not in parents
+                   and w["class"] not in CONTAINER_CLASSES]
+        frame_height, frame_width = context.frame.shape[:2]
+        scale = frame_width / context.geometry["width"] if context.geometry.get("width") else 1.0
+
+        regions = empty_regions(frame_luminance(context),
+                                frame_rects(context.geometry, context.frame.shape, content))
+        for x, y, w, h in regions:
+            share = w * h / float(frame_width * frame_height)
+            rect = {key: int(round(value / scale)) for key, value in
+                    zip(("x", "y", "width", "height"), (x, y, w, h))}
+            yield self.finding(
+                f"Empty region of {rect['width']}x{rect['height']}px ({share:.0%} of the window)",
+                "Resize the window, distribute widgets with a layout, or add a spacer intentionally",
+                region=rect)
+
+
+@register_rule
+class ZeroSizeWidgetRule(Rule):
+    """Visible widgets rendered with zero width or height."""
+    id = "zero-size-widget"
+    category = "size"
+    default_severity = "warning"
+    node_types = ()
+
+    def finish(self, context):
+        if not context.geometry:
+            return
+        for widget in context.geometry["widgets"][1:]:  # root first
+            if widget.get("visible", True) and (widget["width"] <= 0 or widget["height"] <= 0):
+                yield self.finding(
+                    f"'{widget['name']}' is rendered at {widget['width']}x{widget['height']}",
+                    "Check its size policy, minimum size and the space its layout gets",
+                    widget=widget["name"], width=widget["width"], height=widget["height"])
+
+
+# WCAG 2.x minimum contrast: level -> (normal text, large text)
+WCAG_LEVELS = {"AA": (4.5, 3.0), "AAA": (7.0, 4.5)}
+
+
+def is_large_text(widget: Dict[str, Any]) -> bool:
+    """WCAG large text: at least 18pt, or 14pt bold."""
+    size = widget.get("font_point_size") or 0
+    return size >= 18 or (size >= 14 and bool(widget.get("bold")))
+
+
+@register_rule
+class TextContrastRule(Rule):
+    """Text failing the WCAG contrast minimum against its background."""
+    id = "text-contrast"
+    category = "accessibility"
+    default_severity = "warning"
+    node_types = ()
+    level = "AA"
+
+    def finish(self, context):
+        if context.frame is None or not context.geometry:
+            return
+        widgets = context.geometry["widgets"]
+        parents = {w.get("parent") for w in widgets}
+        # Leaf text widgets only (children would pollute the histogram); disabled text is exempt
+        widgets = [w for w in widgets if w.get("text") and w.get("visible", True)
+                   and w.get("enabled", True) and w["name"] not in parents]
+        if not widgets:
+            return
+
+        if "relative_luminance" not in context.cache:
+            context.cache["relative_luminance"] = relative_luminance(context.frame)
+        ratios, foreground, background = text_contrast(
+            frame_luminance(context), context.cache["relative_luminance"],
+            frame_rects(context.geometry, context.frame.shape, widgets))
+
+        normal, large = WCAG_LEVELS[self.level]
+        required = np.array([large if is_large_text(w) else normal for w in widgets])
+        for i in np.flatnonzero(ratios < required):
+            widget = widgets[i]
+            yield self.finding(
+                f"Low contrast text in '{widget['name']}' ({ratios[i]:.2f}:1, "
+                f"WCAG {self.level} needs {required[i]:g}:1)",
+                "Use a darker/lighter text color or background to increase contrast",
+                widget=widget["name"], ratio=round(float(ratios[i]), 2), required=float(required[i]),
+                foreground_luminance=round(float(foreground[i]), 4),
+                background_luminance=round(float(background[i]), 4))
+
+
+def analyze_frame(frame: np.ndarray, geometry: Dict[str, Any],
+                  rules: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Run only the screenshot rules on a frame.
+
+    Args:
+        frame: RGBA frame (H x W x 4 uint8)
+        geometry: Rendered widget rects from the Live Editor
+        rules: Rule ids (default: all screenshot rules)
+
+    Returns:
+        Finding dicts
+    """
+    engine = RuleEngine(rules or [ClippedTextRule, EmptyRegionRule, ZeroSizeWidgetRule, TextContrastRule])
+    return [finding.to_dict() for finding in engine.run({}, frame=frame, geometry=geometry)]
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Streaming Comparator - Bounded-memory comparison of huge .ui files
+
+UIComparator materializes both trees and a WidgetInfo per widget, which for
+generated 100k-widget files means gigabytes of Python objects. This mode
+streams each file with iterparse (freeing every element once processed),
+writes one row per widget into a temporary SQLite table keyed by widget
+name, and merge-joins the two tables in name order. Memory stays constant
+regardless of file size; the per-widget records and the similarity score
+are the same as UIComparator's (records come in name order).
+"""
+
+import json
+import sqlite3
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, TextIO, Tuple
+
+from ui_comparator import UIComparator, ComparisonSummary, WidgetInfo, _digest, load_scoring_profile
+
+
+# Elements removed from their parent once processed
+_STREAMED_TAGS = ("widget", "layout", "item", "spacer", "action", "actiongroup", "addaction")
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def iter_widget_rows(ui_file: str) -> Iterator[Tuple[str, str, Optional[str], int, str, str, str]]:
+    """
+    Stream widget rows from a .ui file.
+
+    Each widget is emitted when its end tag is parsed, with the same parent,
+    depth, geometry and direct properties UIComparator extracts; processed
+    elements are detached so the parsed tree never grows.
+
+    Yields:
+        (name, class, parent, depth, content_hash, geometry JSON, properties JSON)
+    """
+    comparator = UIComparator()
+    elements = []  # open elements
+    widget_names = []  # open widget names (parent chain)
+
+    for event, elem in ET.iterparse(ui_file, events=("start", "end")):
+        if event == "start":
+            elements.append(elem)
+            if elem.tag == "widget":
+                widget_names.append(elem.get("name", "unnamed"))
+            continue
+
+        elements.pop()
+        if elem.tag == "widget":
+            widget_names.pop()
+            parent = widget_names[-1] if widget_names else None
+            info = comparator._process_widget(elem, parent, len(widget_names))
+            content_hash = _digest([info.type, info.geometry, info.properties])
+            yield (info.name, info.type, parent, info.depth, content_hash,
+                   json.dumps(info.geometry), json.dumps(info.properties, ensure_ascii=False))
+
+        if elem.tag in _STREAMED_TAGS and elements:
+            elements[-1].remove(elem)
+            elem.clear()
+
+
+class StreamingComparator:
+    """Compares two .ui files through on-disk SQLite tables."""
+
+    def __init__(self, profile: Optional[Any] = None, db_path: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize comparator.
+
+        Args:
+            profile: Optional ScoringProfile (or dict / JSON path)
+            db_path: SQLite file (default: a temporary file, removed on close)
+            batch_size: Rows inserted per transaction batch
+        """
+        self.profile = load_scoring_profile(profile)
+        self.batch_size = batch_size
+        self._tmpdir = None
+        if db_path is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="ui_stream_")
+            db_path = str(Path(self._tmpdir.name) / "compare.db")
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("PRAGMA journal_mode = OFF")
+        self.db.execute("PRAGMA synchronous = OFF")
+        self.db.execute("PRAGMA cache_size = -16000")  # ~16 MB page cache
+        self.db.execute("PRAGMA temp_store = FILE")
+        self._differ = UIComparator()
+
+    def close(self):
+        """Close the database (and remove the temporary file)."""
+        self.db.close()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def load(self, table: str, ui_file: str) -> int:
+        """
+        Stream a .ui file into a table ("reference" or "target").
+
+        Duplicate names keep the last widget, as UIComparator does.
+
+        Returns:
+            Number of widgets
+        """
+        if table not in ("reference", "target"):
+            raise ValueError(f"Unknown table: {table}")
+
+        db = self.db
+        db.execute(f"DROP TABLE IF EXISTS {table}")
+        db.execute(f"""CREATE TABLE {table} (
+            name TEXT PRIMARY KEY, type TEXT, parent TEXT, depth INTEGER,
+            content_hash TEXT, geometry TEXT, properties TEXT) WITHOUT ROWID""")
+
+        insert = f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?, ?, ?, ?)"
+        batch = []
+        for row in iter_widget_rows(ui_file):
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                db.executemany(insert, batch)
+                batch = []
+        if batch:
+            db.executemany(insert, batch)
+        db.commit()
+        return db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    @staticmethod
+    def _widget(row) -> WidgetInfo:
+        name, widget_type, parent, depth, content_hash, geometry, properties = row
+        return WidgetInfo(name=name, type=widget_type, geometry=json.loads(geometry),
+                          properties=json.loads(properties), parent=parent, depth=depth,
+                          content_hash=content_hash)
+
+    def iter_events(self) -> Iterator[Tuple[str, Optional[str], Optional[str], Dict[str, Any],
+                                            Optional[Tuple[WidgetInfo, WidgetInfo]]]]:
+        """
+        Merge-join the loaded tables in name order.
+
+        Yields:
+            (kind, reference name, target name, differences, matched pair)
+            with kind "match", "changed", "missing" or "extra"; the pair is
+            only decoded when needed (differing content or profile scoring)
+        """
+        columns = "name, type, parent, depth, content_hash, geometry, properties"
+        ref_rows = self.db.execute(f"SELECT {columns} FROM reference ORDER BY name")
+        tgt_rows = self.db.cursor().execute(f"SELECT {columns} FROM target ORDER BY name")
+        need_pair = self.profile is not None
+
+        ref, tgt = next(ref_rows, None), next(tgt_rows, None)
+        while ref is not None or tgt is not None:
+            if tgt is None or (ref is not None and ref[0] < tgt[0]):
+                yield "missing", ref[0], None, {}, None
+                ref = next(ref_rows, None)
+            elif ref is None or tgt[0] < ref[0]:
+                yield "extra", None, tgt[0], {}, None
+                tgt = next(tgt_rows, None)
+            else:
+                diffs = {}
+                pair = None
+                if ref[4] != tgt[4] or need_pair:
+                    pair = (self._widget(ref), self._widget(tgt))
+                    if ref[4] != tgt[4]:
+                        diffs = self._differ._compare_widgets(*pair)
+                yield ("changed" if diffs else "match"), ref[0], tgt[0], diffs, pair
+                ref, tgt = next(ref_rows, None), next(tgt_rows, None)
+
+    def _total_weight(self) -> Optional[float]:
+        if self.profile is None:
+            return None
+        type_weights = self.profile.type_weights
+        return float(sum(type_weights.get(widget_type, 1.0) * count for widget_type, count in
+                         self.db.execute("SELECT type, COUNT(*) FROM reference GROUP BY type")))
+
+    def compare(self, reference_ui: str, target_ui: str, stream: Optional[TextIO] = None,
+                include_matches: bool = False, sample_size: int = 20) -> Dict[str, Any]:
+        """
+        Compare two files, optionally streaming JSON-line records.
+
+        Records have the same shape as UIComparator.write_jsonl().
+
+        Args:
+            reference_ui: Reference .ui file path
+            target_ui: Target .ui file path
+            stream: Optional text stream for header/diff/summary records
+            include_matches: Also emit unchanged matched widgets
+            sample_size: Widget names kept per category in the summary
+
+        Returns:
+            Summary record
+        """
+        reference_count = self.load("reference", reference_ui)
+        target_count = self.load("target", target_ui)
+        summary = ComparisonSummary(reference_count, target_count, self.profile,
+                                    self._total_weight(), sample_size)
+        write = stream.write if stream is not None else None
+
+        if write:
+            write(json.dumps({"record": "header", "match": "name", "mode": "streaming",
+                              "reference": reference_ui, "target": target_ui,
+                              "profile": self.profile.name if self.profile else None}) + "\n")
+
+        type_of = self.db.cursor()
+        for kind, name, target_name, diffs, pair in self.iter_events():
+            summary.add(kind, name, target_name, diffs, pair)
+            if not write or (kind == "match" and not include_matches):
+                continue
+            widget = target_name if kind == "extra" else name
+            if pair is not None:
+                widget_type = pair[0].type
+            else:
+                table = "target" if kind == "extra" else "reference"
+                widget_type = type_of.execute(f"SELECT type FROM {table} WHERE name = ?",
+                                              (widget,)).fetchone()[0]
+            record = {"record": kind, "widget": widget, "class": widget_type}
+            if diffs:
+                record["differences"] = diffs
+            write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        result = {"record": "summary", **summary.to_dict()}
+        if write:
+            write(json.dumps(result, ensure_ascii=False) + "\n")
+        return result
+
+
+def compare_streaming(reference_ui: str, target_ui: str, stream: Optional[TextIO] = None,
+                      profile: Optional[Any] = None, include_matches: bool = False) -> Dict[str, Any]:
+    """
+    Bounded-memory comparison of two .ui files.
+
+    Args:
+        reference_ui: Reference .ui file path
+        target_ui: Target .ui file path
+        stream: Optional text stream for JSON-line records
+        profile: Optional scoring profile
+        include_matches: Also emit unchanged matched widgets
+
+    Returns:
+        Summary record
+    """
+    with StreamingComparator(profile) as comparator:
+        return comparator.compare(reference_ui, target_ui, stream, include_matches)
+
+
+def main():
+    """Streaming comparison CLI."""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Bounded-memory comparison of huge .ui files")
+    parser.add_argument("reference")
+    parser.add_argument("target")
+    parser.add_argument("--profile", help="Scoring profile JSON")
+    parser.add_argument("--include-matches", action="store_true", help="Emit unchanged widgets too")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            summary = compare_streaming(args.reference, args.target, f, args.profile, args.include_matches)
+        print(json.dumps(summary, indent=2))
+    else:
+        compare_streaming(args.reference, args.target, sys.stdout, args.profile, args.include_matches)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test: Batch Compare
+
+Tests:
+1. One-to-many scores equal single comparisons; workers keep only the reference
+2. All-pairs similarity matrix
+3. Process pool output equals in-process output, streamed as JSONL
+"""
+
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import batch_compare
+from batch_compare import compare_one_to_many, compare_all_pairs, similarity_matrix, write_jsonl
+from ui_comparator import UIComparator
+from ui_manager import UIManager
+
+
+def create_ui(path: Path, buttons: int, title: str = "Dialog"):
+    """Dialog with a row of buttons."""
+    manager = UIManager()
+    manager.create_empty_ui("QDialog", "Dialog", 400, 300)
+    manager.add_widget("QLabel", "titleLabel", properties={"text": title})
+    for i in range(buttons):
+        manager.add_widget("QPushButton", f"button{i}", properties={
+            "text": f"Button {i}",
+            "geometry": {"x": 10 + i * 90, "y": 250, "width": 80, "height": 30}
+        })
+    manager.save(str(path))
+
+
+def create_library(tmp: Path):
+    """Reference plus three candidates of decreasing similarity and a broken file."""
+    create_ui(tmp / "reference.ui", 4)
+    create_ui(tmp / "same.ui", 4)
+    create_ui(tmp / "retitled.ui", 4, title="Other")
+    create_ui(tmp / "smaller.ui", 1)
+    (tmp / "broken.ui").write_text("<ui><widget", encoding="utf-8")
+
+
+def test_one_to_many():
+    """Records match UIComparator results, in input order."""
+    print("\n=== Test 1: One-to-many ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        create_library(tmp)
+        reference = str(tmp / "reference.ui")
+        targets = [str(tmp / name) for name in ("same.ui", "retitled.ui", "smaller.ui", "broken.ui")]
+
+        stream = compare_one_to_many(reference, targets, workers=1)
+        records = [next(stream) for _ in targets[:3]]
+        # Targets are parsed per comparison, only the reference stays cached
+        assert list(batch_compare._WORKER_MODELS) == [reference]
+        records.extend(stream)
+        assert [r["target"] for r in records] == targets
+        assert batch_compare._WORKER_MODELS == {}
+
+        for record in records[:3]:
+            comparator = UIComparator()
+            comparator.load_reference(reference)
+            comparator.load_target(record["target"])
+            assert record["status"] == "success"
+            assert record["similarity_score"] == comparator.compare().similarity_score
+
+        assert records[0]["identical"] and records[0]["similarity_score"] == 1.0
+        assert records[1]["changed"] == 1
+        assert records[2]["missing"] == 3
+        assert records[3]["status"] == "error"
+
+    print("✓ Scores equal single comparisons; parse errors reported per target")
+
+
+def test_similarity_matrix():
+    """N×N matrix with unit diagonal; broken files listed as errors."""
+    print("\n=== Test 2: Similarity Matrix ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        create_library(tmp)
+        files = sorted(str(p) for p in tmp.glob("*.ui"))
+
+        result = similarity_matrix(files, workers=1)
+        n = len(result["files"])
+        assert n == 4
+        assert list(result["errors"]) == [str(tmp / "broken.ui")]
+        assert all(result["matrix"][i][i] == 1.0 for i in range(n))
+        assert all(value is not None for row in result["matrix"] for value in row)
+
+        ref = result["files"].index(str(tmp / "reference.ui"))
+        same = result["files"].index(str(tmp / "same.ui"))
+        assert result["matrix"][ref][same] == 1.0
+
+    print(f"✓ {n}×{n} matrix built")
+
+
+def test_parallel_streaming():
+    """Worker pool produces the same records, streamed as JSONL."""
+    print("\n=== Test 3: Parallel Streaming ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        create_library(tmp)
+        files = sorted(str(p) for p in tmp.glob("*.ui"))
+
+        serial = list(compare_all_pairs(files, workers=1))
+        stream = io.StringIO()
+        count = write_jsonl(compare_all_pairs(files, workers=2), stream)
+
+        parallel = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert count == len(parallel) == len(serial) == 1 + 4 * 3
+        assert parallel == serial
+
+    print(f"✓ {count} records identical across 2 workers")
+
+
+def main():
+    """Run all tests."""
+    test_one_to_many()
+    test_similarity_matrix()
+    test_parallel_streaming()
+
+    print("\n✓ All batch compare tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
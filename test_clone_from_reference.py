@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test: clone_from_reference
+
+Tests:
+1. Byte-identical clones are verified by hash, without parsing; directory targets
+   resolve to a file of the reference's name
+2. Structural compare is used when the bytes differ
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import mcp_server
+from mcp_server import clone_from_reference
+from ui_manager import UIManager
+
+
+def create_reference(path: Path):
+    """Dialog with a label and a button."""
+    manager = UIManager()
+    manager.create_empty_ui("QDialog", "ReferenceDialog", 400, 300)
+    manager.add_widget("QLabel", "titleLabel", properties={"text": "Reference"})
+    manager.add_widget("QPushButton", "okButton", properties={"text": "OK"})
+    manager.save(str(path))
+
+
+class _NoCompare:
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("UIComparator should not be used for identical clones")
+
+
+def test_hash_verification():
+    """Identical bytes are verified by SHA-256 alone."""
+    print("\n=== Test 1: Hash Verification ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        reference, target = tmp / "reference.ui", tmp / "clone.ui"
+        create_reference(reference)
+
+        comparator = mcp_server.UIComparator
+        mcp_server.UIComparator = _NoCompare
+        try:
+            result = clone_from_reference(str(reference), str(target))
+        finally:
+            mcp_server.UIComparator = comparator
+
+        assert result["status"] == "success", result
+        assert target.read_bytes() == reference.read_bytes()
+        assert result["copy_method"] in ("reflink", "copy_file_range", "copy")
+        assert result["verification"]["method"] == "hash"
+        assert result["verification"]["verified"] is True
+        assert result["verification"]["similarity_score"] == 1.0
+
+        # Cloning onto the reference itself must not truncate it
+        same = clone_from_reference(str(reference), str(reference))
+        assert same["status"] == "error"
+        assert clone_from_reference(str(reference), str(tmp))["status"] == "error"
+        assert reference.read_bytes() == target.read_bytes()
+
+        # Directory target: cloned under the reference's name, like shutil.copy
+        (tmp / "clones").mkdir()
+        into_dir = clone_from_reference(str(reference), str(tmp / "clones"))
+        assert into_dir["status"] == "success", into_dir
+        assert into_dir["target_ui"] == str(tmp / "clones" / "reference.ui")
+        assert (tmp / "clones" / "reference.ui").read_bytes() == reference.read_bytes()
+        assert into_dir["verification"]["verified"] is True
+
+    print(f"✓ Verified by hash ({result['copy_method']}); directory targets resolved")
+
+
+def test_structural_fallback():
+    """Differing bytes fall back to the structural comparison."""
+    print("\n=== Test 2: Structural Fallback ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        reference, clones = tmp / "reference.ui", tmp / "clones"
+        create_reference(reference)
+        clones.mkdir()
+
+        copy_file = mcp_server._copy_file
+
+        def copy_and_edit(source, destination):
+            destination, method = copy_file(source, destination)
+            with open(destination, "a", encoding="utf-8") as f:
+                f.write("<!-- edited -->\n")
+            return destination, method
+
+        mcp_server._copy_file = copy_and_edit
+        try:
+            result = clone_from_reference(str(reference), str(clones))
+        finally:
+            mcp_server._copy_file = copy_file
+
+        assert result["target_ui"] == str(clones / "reference.ui")
+        assert result["verification"]["method"] == "structural"
+        assert result["verification"]["verified"] is True
+
+    print("✓ Structural compare used when bytes differ")
+
+
+def main():
+    """Run all tests."""
+    test_hash_verification()
+    test_structural_fallback()
+
+    print("\n✓ All clone tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test: Content-addressed Golden Image Store
+
+Tests:
+1. Store and fetch by UI content hash
+2. Deduplication of identical frames
+3. Size-bounded retention by last use, without index writes on reads
+4. analyze_ui only stores screenshots of the file the editor shows
+"""
+
+import base64
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import mcp_server
+from golden_store import GoldenImageStore
+from ui_manager import UIManager
+
+
+def create_ui(path: Path, title: str):
+    """Create a small dialog .ui file."""
+    manager = UIManager()
+    manager.create_empty_ui("QDialog", title, 400, 300)
+    manager.save(str(path))
+
+
+def test_put_and_get():
+    """Images are fetched by the UI file's current content."""
+    print("\n=== Test 1: Put and Get ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        ui_file = tmp / "dialog.ui"
+        create_ui(ui_file, "Dialog")
+
+        store = GoldenImageStore(str(tmp / "store"))
+        image_hash = store.put(str(ui_file), b"frame-1", {"renderer": "offscreen"})
+
+        assert store.get(str(ui_file), {"renderer": "offscreen"}) == b"frame-1"
+        assert store.get(str(ui_file), {"renderer": "window"}) is None
+
+        # Reopened store reads the persisted index
+        assert GoldenImageStore(str(tmp / "store")).lookup(
+            str(ui_file), {"renderer": "offscreen"}) == image_hash
+
+        # Editing the UI invalidates the lookup
+        create_ui(ui_file, "Changed")
+        assert store.get(str(ui_file), {"renderer": "offscreen"}) is None
+
+    print("✓ Lookup by UI content hash and render params")
+
+
+def test_dedupe():
+    """Identical frames from different UIs are stored once."""
+    print("\n=== Test 2: Deduplication ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        first, second = tmp / "a.ui", tmp / "b.ui"
+        create_ui(first, "A")
+        create_ui(second, "B")
+
+        store = GoldenImageStore(str(tmp / "store"))
+        store.put(str(first), b"same-frame")
+        store.put(str(second), b"same-frame")
+
+        stats = store.stats()
+        assert stats["entries"] == 2
+        assert stats["images"] == 1
+
+    print("✓ Two entries share one image")
+
+
+def test_retention():
+    """Least recently used images are evicted past the size bound."""
+    print("\n=== Test 3: Retention ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        store = GoldenImageStore(str(tmp / "store"), max_bytes=250)
+
+        for i in range(5):
+            ui_file = tmp / f"ui_{i}.ui"
+            create_ui(ui_file, f"Dialog{i}")
+            store.put(str(ui_file), bytes([i]) * 100)
+
+        assert store.total_bytes() <= 250
+        assert store.get(str(tmp / "ui_4.ui")) == bytes([4]) * 100
+        assert store.get(str(tmp / "ui_0.ui")) is None
+
+        # Reads leave the index alone but still count as use for eviction
+        index_before = store.index_path.read_bytes()
+        assert store.get(str(tmp / "ui_3.ui")) == bytes([3]) * 100
+        assert store.index_path.read_bytes() == index_before
+        ui_file = tmp / "ui_5.ui"
+        create_ui(ui_file, "Dialog5")
+        store.put(str(ui_file), bytes([5]) * 100)
+        assert store.get(str(tmp / "ui_3.ui")) == bytes([3]) * 100
+        assert store.get(str(tmp / "ui_4.ui")) is None
+
+    print("✓ Store stays within size bound; reads don't rewrite the index")
+
+
+class DisplayClient:
+    """Editor client stub showing one file and returning a fixed screenshot."""
+
+    displayed = ""
+
+    def __init__(self, host=None, port=None):
+        pass
+
+    def ping(self):
+        return True
+
+    def get_widget_tree(self):
+        return {"status": "success", "widget_tree": {}}
+
+    def get_ui_file(self):
+        return DisplayClient.displayed
+
+    def take_screenshot(self, output_path="screenshots/screenshot.png", save=True):
+        return {"status": "success", "path": output_path,
+                "screenshot_base64": base64.b64encode(b"window-frame").decode("ascii")}
+
+
+def test_analyze_ui_guard():
+    """A stale editor session doesn't put its screenshot under another file's hash."""
+    print("\n=== Test 4: analyze_ui Store Guard ===")
+
+    cwd = os.getcwd()
+    editor_client = mcp_server.EditorClient
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp).resolve()
+        ui_file = tmp / "dialog.ui"
+        create_ui(ui_file, "Dialog")
+        os.chdir(tmp)  # default store lives under ./screenshots
+        mcp_server.EditorClient = DisplayClient
+        try:
+            DisplayClient.displayed = str(tmp / "other.ui")
+            stale = mcp_server.analyze_ui(str(ui_file))
+            assert stale["status"] == "success" and "screenshot_base64" in stale
+            assert "image_hash" not in stale
+            assert GoldenImageStore().get(str(ui_file), {"renderer": "window"}) is None
+
+            DisplayClient.displayed = str(ui_file)
+            shown = mcp_server.analyze_ui(str(ui_file))
+            assert GoldenImageStore().get(str(ui_file), {"renderer": "window"}) == b"window-frame"
+            assert shown["image_hash"]
+        finally:
+            mcp_server.EditorClient = editor_client
+            os.chdir(cwd)
+
+    print("✓ Screenshot stored only when the editor shows the analyzed file")
+
+
+def main():
+    """Run all tests."""
+    test_put_and_get()
+    test_dedupe()
+    test_retention()
+    test_analyze_ui_guard()
+
+    print("\n✓ All golden store tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
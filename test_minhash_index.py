@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test: MinHash/LSH Index
+
+Tests:
+1. Signatures estimate Jaccard similarity of shingles
+2. LSH candidates are verified with compare()
+3. Persistent index skips unchanged files and prunes deleted ones
+4. Renamed copies pass verification; unreadable files are reported, not printed
+"""
+
+import io
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from minhash_index import MinHasher, MinHashIndex, estimate_similarity, shingles, verify_pair
+from ui_comparator import UIComparator
+from ui_manager import UIManager
+
+
+def create_form(path: Path, kind: int, fields: int = 12, edited: int = -1, prefix: str = ""):
+    """Form of one of several kinds; edited changes a single label text, prefix renames widgets."""
+    widget_types = ["QLineEdit", "QSpinBox", "QComboBox", "QCheckBox", "QSlider"]
+    manager = UIManager()
+    manager.create_empty_ui("QWidget", "Form", 500, fields * 35)
+    for i in range(fields):
+        manager.add_widget("QLabel", f"{prefix}label{i}", properties={
+            "text": f"Kind {kind} field {i}" + (" *" if i == edited else ""),
+            "geometry": {"x": 10, "y": i * 35, "width": 150, "height": 25}
+        })
+        manager.add_widget(widget_types[(kind + i) % len(widget_types)], f"{prefix}input{i}", properties={
+            "geometry": {"x": 170, "y": i * 35, "width": 300 - kind * 40, "height": 25}
+        })
+    manager.save(str(path))
+
+
+def create_library(tmp: Path):
+    """Five distinct form kinds, with a near-duplicate of kind 0 and kind 3."""
+    for kind in range(5):
+        create_form(tmp / f"kind{kind}.ui", kind)
+    create_form(tmp / "kind0_copy.ui", 0, edited=4)
+    create_form(tmp / "kind3_copy.ui", 3, edited=7)
+
+
+def test_signature_estimate():
+    """Estimated similarity is close to the exact Jaccard index."""
+    print("\n=== Test 1: Signature Estimate ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        create_library(tmp)
+        a = shingles(UIComparator().load_reference(str(tmp / "kind0.ui")))
+        b = shingles(UIComparator().load_reference(str(tmp / "kind0_copy.ui")))
+        c = shingles(UIComparator().load_reference(str(tmp / "kind2.ui")))
+
+    hasher = MinHasher(num_perm=256)
+    for x, y in ((a, b), (a, c)):
+        exact = len(x & y) / len(x | y)
+        estimated = estimate_similarity(hasher.signature(x), hasher.signature(y))
+        assert abs(estimated - exact) < 0.12, (estimated, exact)
+        print(f"✓ Jaccard {exact:.2f}, estimated {estimated:.2f}")
+
+    assert estimate_similarity(hasher.signature(a), hasher.signature(set(a))) == 1.0
+
+
+def test_lsh_candidates():
+    """Near-duplicates are found and confirmed; distinct kinds are not."""
+    print("\n=== Test 2: LSH Candidates ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        create_library(tmp)
+        index = MinHashIndex(str(tmp / "index.json"))
+        assert index.add_directory(str(tmp)) == {"updated": 7, "pruned": 0, "skipped": []}
+
+        duplicates = index.near_duplicates(threshold=0.9)
+        pairs = {(d["a"], d["b"]) for d in duplicates}
+        assert pairs == {(str(tmp / "kind0.ui"), str(tmp / "kind0_copy.ui")),
+                         (str(tmp / "kind3.ui"), str(tmp / "kind3_copy.ui"))}, pairs
+        assert all(d["similarity"] >= 0.9 for d in duplicates)
+
+        matches = index.query(str(tmp / "kind0.ui"), threshold=0.9)
+        assert [m["key"] for m in matches] == [str(tmp / "kind0_copy.ui")]
+
+        # Candidate set is a small fraction of the index
+        _, signature = index.signature_of(str(tmp / "kind3.ui"))
+        assert len(index.candidates(signature)) <= 3
+
+    print(f"✓ {len(duplicates)} verified duplicate pairs")
+
+
+def test_persistence():
+    """Reloaded index skips unchanged files and prunes deleted ones."""
+    print("\n=== Test 3: Persistence ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        create_library(tmp)
+        index_path = str(tmp / "cache" / "index.json")
+
+        index = MinHashIndex(index_path, num_perm=64, bands=8)
+        index.add_directory(str(tmp))
+        index.save()
+
+        reloaded = MinHashIndex(index_path)
+        assert (reloaded.num_perm, reloaded.bands) == (64, 8)
+        assert reloaded.add_file(str(tmp / "kind1.ui")) is False
+
+        create_form(tmp / "kind1.ui", 1, edited=0)
+        (tmp / "kind4.ui").unlink()
+        assert reloaded.add_directory(str(tmp)) == {"updated": 1, "pruned": 1, "skipped": []}
+        assert str(tmp / "kind4.ui") not in reloaded.entries
+        assert len(reloaded.entries) == 6
+
+    print("✓ Unchanged files skipped, deleted files pruned")
+
+
+def test_renamed_copies():
+    """Name-free shingles find renamed copies, and verification keeps them."""
+    print("\n=== Test 4: Renamed Copies ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        create_form(tmp / "form.ui", 2)
+        create_form(tmp / "form_renamed.ui", 2, prefix="settings_")
+        (tmp / "broken.ui").write_text("<ui><widget", encoding="utf-8")
+
+        index = MinHashIndex(str(tmp / "index.json"))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = index.add_directory(str(tmp))
+        assert output.getvalue() == ""
+        assert result["updated"] == 2
+        assert [s["ui_file"] for s in result["skipped"]] == [str(tmp / "broken.ui")]
+
+        duplicates = index.near_duplicates(threshold=0.9)
+        assert [(d["a"], d["b"]) for d in duplicates] == [(str(tmp / "form.ui"), str(tmp / "form_renamed.ui"))]
+        by_name = verify_pair(str(tmp / "form.ui"), str(tmp / "form_renamed.ui"), match="name")
+        assert by_name < 0.9 <= duplicates[0]["similarity"]
+
+    print(f"✓ Renamed copy verified at {duplicates[0]['similarity']:.2f} (by name: {by_name:.2f}); "
+          f"broken file reported")
+
+
+def main():
+    """Run all tests."""
+    test_signature_estimate()
+    test_lsh_candidates()
+    test_persistence()
+    test_renamed_copies()
+
+    print("\n✓ All MinHash index tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test: Perceptual Hash Index
+
+Tests:
+1. Hashes are stable under small visual changes
+2. BK-tree queries match brute force
+3. Near-duplicate grouping and on-disk round trip
+4. Indexing and querying .ui files rendered by the editor (stub client)
+"""
+
+import base64
+import contextlib
+import io
+import json
+import sys
+import random
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+import phash_index
+from golden_store import GoldenImageStore
+from image_utils import encode_png
+from phash_index import BKTree, PerceptualHashIndex, compute_hashes, hamming
+
+
+def make_dialog(buttons: int, offset: int = 0, width: int = 400, height: int = 300) -> np.ndarray:
+    """Synthetic dialog frame with a title bar and a row of buttons."""
+    frame = np.full((height, width, 4), 235, dtype=np.uint8)
+    frame[:, :, 3] = 255
+    frame[:40, :, :3] = 60
+    for i in range(buttons):
+        x = 20 + i * 90 + offset
+        frame[240:270, x:x + 80, :3] = (40, 110, 200)
+    return frame
+
+
+def test_hash_stability():
+    """Small shifts change few bits; different layouts change many."""
+    print("\n=== Test 1: Hash Stability ===")
+
+    base = compute_hashes(make_dialog(3))
+    shifted = compute_hashes(make_dialog(3, offset=2))
+    different = compute_hashes(np.rot90(make_dialog(1)).copy())
+
+    for kind in ("ahash", "dhash", "phash"):
+        near = hamming(base[kind], shifted[kind])
+        far = hamming(base[kind], different[kind])
+        print(f"   {kind}: shifted={near} different={far}")
+        assert near < far
+
+    print("✓ Perceptual hashes tolerate small changes")
+
+
+def test_bktree_matches_brute_force():
+    """BK-tree returns exactly the brute-force neighbours."""
+    print("\n=== Test 2: BK-tree Query ===")
+
+    rng = random.Random(7)
+    values = [rng.getrandbits(64) for _ in range(500)]
+    tree = BKTree()
+    for i, value in enumerate(values):
+        tree.add(value, f"ui_{i}")
+
+    probe = values[42] ^ 0b1011
+    expected = sorted((hamming(probe, v), f"ui_{i}") for i, v in enumerate(values)
+                      if hamming(probe, v) <= 20)
+    assert tree.query(probe, 20) == expected
+    print(f"✓ {len(expected)} neighbour(s) within distance 20")
+
+
+def test_index_duplicates():
+    """Near-duplicate dialogs are grouped and the index persists."""
+    print("\n=== Test 3: Near Duplicates ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = str(Path(tmp) / "index.json")
+        index = PerceptualHashIndex(index_path)
+        index.add_image("login.ui", make_dialog(2))
+        index.add_image("login_copy.ui", make_dialog(2, offset=1))
+        index.add_image("settings.ui", np.rot90(make_dialog(4)).copy())
+        index.save()
+
+        reloaded = PerceptualHashIndex(index_path)
+        groups = reloaded.near_duplicates(max_distance=6)
+        assert groups == [["login.ui", "login_copy.ui"]]
+
+        matches = reloaded.query(make_dialog(2), max_distance=6)
+        assert matches[0]["key"] == "login.ui"
+
+    print(f"✓ Groups: {groups}")
+
+
+class StubClient:
+    """Editor client rendering each .ui file to a fixed full-size PNG."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.rendered = []
+
+    def render_ui(self, ui_file, geometry=False, transport="base64"):
+        name = Path(ui_file).name
+        self.rendered.append(name)
+        png = encode_png(self.frames[name])
+        return {"status": "success", "screenshot_base64": base64.b64encode(png).decode("ascii")}
+
+
+def test_index_rendered_ui():
+    """add_ui and the CLI query hash the editor's base64 screenshots."""
+    print("\n=== Test 4: Rendered .ui Files ===")
+
+    frames = {
+        "login.ui": make_dialog(2, width=1280, height=800),
+        "login_copy.ui": make_dialog(2, offset=1, width=1280, height=800),
+        "settings.ui": np.rot90(make_dialog(4, width=1280, height=800)).copy(),
+        "probe.ui": make_dialog(2, width=1280, height=800),
+    }
+    client = StubClient(frames)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        forms = Path(tmp) / "forms"
+        forms.mkdir()
+        for name in ("login.ui", "login_copy.ui", "settings.ui"):
+            (forms / name).write_text(f'<ui version="4.0"><class>{name}</class></ui>', encoding="utf-8")
+        probe = Path(tmp) / "probe.ui"
+        probe.write_text('<ui version="4.0"/>', encoding="utf-8")
+
+        index_path = str(Path(tmp) / "index.json")
+        store = GoldenImageStore(str(Path(tmp) / "golden"))
+        index = PerceptualHashIndex(index_path)
+        assert index.add_directory(str(forms), client, store) == 3
+        assert index.add_directory(str(forms), client, store) == 0
+        assert len(client.rendered) == 3
+        assert index.near_duplicates(max_distance=6) == [[str(forms / "login.ui"), str(forms / "login_copy.ui")]]
+        index.save()
+
+        # CLI query of an unindexed .ui renders it through the editor
+        editor_client = phash_index.EditorClient
+        phash_index.EditorClient = lambda port: client
+        argv = sys.argv
+        sys.argv = ["phash_index.py", "--index", index_path, "query", str(probe), "--max-distance", "6"]
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                phash_index.main()
+        finally:
+            phash_index.EditorClient = editor_client
+            sys.argv = argv
+        matches = json.loads(output.getvalue())
+        assert matches[0] == {"key": str(forms / "login.ui"), "distance": 0}
+        assert client.rendered[-1] == "probe.ui"
+
+    print(f"✓ {len(frames)} base64 screenshots hashed; query found {Path(matches[0]['key']).name}")
+
+
+def main():
+    """Run all tests."""
+    test_hash_stability()
+    test_bktree_matches_brute_force()
+    test_index_duplicates()
+    test_index_rendered_ui()
+
+    print("\n✓ All perceptual hash tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test: Scoring Profiles
+
+Tests:
+1. Geometry tolerance and graded geometry penalties
+2. Property weights and type-equivalence classes
+3. Profiles in assignment matching and batch comparison
+4. Comparisons without a profile don't import NumPy
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from batch_compare import compare_one_to_many
+from scoring_profile import ScoringProfile
+from ui_comparator import UIComparator
+from ui_manager import UIManager
+
+
+def create_dialog(path: Path, ok_x: int = 150, ok_type: str = "QPushButton",
+                  ok_name: str = "okButton", title: str = "Settings", tooltip: str = "Apply"):
+    """Dialog with a title label and an OK button."""
+    manager = UIManager()
+    manager.create_empty_ui("QDialog", "Dialog", 400, 300)
+    manager.add_widget("QLabel", "titleLabel", properties={
+        "text": title,
+        "geometry": {"x": 20, "y": 20, "width": 200, "height": 30}
+    })
+    manager.add_widget(ok_type, ok_name, properties={
+        "text": "OK",
+        "toolTip": tooltip,
+        "geometry": {"x": ok_x, "y": 250, "width": 100, "height": 30}
+    })
+    manager.save(str(path))
+
+
+def score(reference: Path, target: Path, profile=None, match: str = "name") -> float:
+    comparator = UIComparator(profile)
+    comparator.load_reference(str(reference))
+    comparator.load_target(str(target))
+    return comparator.compare(match=match).similarity_score
+
+
+def test_geometry_tolerance():
+    """Shifts within tolerance are free; larger shifts cost more."""
+    print("\n=== Test 1: Geometry Tolerance ===")
+
+    profile = ScoringProfile(position_tolerance=2, geometry_scale=100)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        create_dialog(tmp / "reference.ui")
+        scores = {}
+        for shift in (1, 10, 60, 500):
+            create_dialog(tmp / f"shift{shift}.ui", ok_x=150 + shift)
+            scores[shift] = score(tmp / "reference.ui", tmp / f"shift{shift}.ui", profile)
+
+        # Default scoring cannot tell the shifts apart
+        default_scores = {score(tmp / "reference.ui", tmp / f"shift{s}.ui") for s in scores}
+
+    assert scores[1] == 1.0
+    assert 1.0 > scores[10] > scores[60] > scores[500]
+    assert len(default_scores) == 1
+
+    print(f"✓ Scores by shift: {', '.join(f'{k}px={v:.3f}' for k, v in scores.items())}")
+
+
+def test_property_weights_and_type_classes():
+    """Zero-weight properties are ignored; equivalent types aren't a new widget."""
+    print("\n=== Test 2: Property Weights and Type Classes ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        create_dialog(tmp / "reference.ui")
+        create_dialog(tmp / "tooltip.ui", tooltip="Apply changes")
+        create_dialog(tmp / "toolbutton.ui", ok_type="QToolButton")
+
+        ignore_tooltips = ScoringProfile(property_weights={"toolTip": 0.0})
+        assert score(tmp / "reference.ui", tmp / "tooltip.ui", ignore_tooltips) == 1.0
+        assert score(tmp / "reference.ui", tmp / "tooltip.ui", ScoringProfile()) < 1.0
+
+        buttons = ScoringProfile(type_classes=[["QPushButton", "QToolButton"]])
+        plain = ScoringProfile()
+        assert score(tmp / "reference.ui", tmp / "toolbutton.ui", buttons) == 1.0
+        assert score(tmp / "reference.ui", tmp / "toolbutton.ui", plain) < 1.0
+
+        try:
+            ScoringProfile.from_dict({"weights": {}})
+            assert False, "Unknown keys should be rejected"
+        except ValueError:
+            pass
+
+    print("✓ Weights and equivalence classes applied")
+
+
+def test_profile_in_assignment_and_batch():
+    """Type classes block assignment matching; batch records use the profile."""
+    print("\n=== Test 3: Assignment and Batch ===")
+
+    profile = {"type_classes": [["QPushButton", "QToolButton"]], "position_tolerance": 5}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        create_dialog(tmp / "reference.ui")
+        create_dialog(tmp / "renamed.ui", ok_type="QToolButton", ok_name="acceptButton", ok_x=153)
+
+        comparator = UIComparator(profile)
+        comparator.load_reference(str(tmp / "reference.ui"))
+        comparator.load_target(str(tmp / "renamed.ui"))
+        result = comparator.compare(match="assignment")
+        assert result.renamed_widgets == {"okButton": "acceptButton"}
+        assert result.similarity_score == 1.0
+
+        # Without the class the button cannot be paired across types
+        plain = UIComparator()
+        plain.load_reference(str(tmp / "reference.ui"))
+        plain.load_target(str(tmp / "renamed.ui"))
+        assert plain.compare(match="assignment").renamed_widgets == {}
+
+        records = list(compare_one_to_many(str(tmp / "reference.ui"), [str(tmp / "renamed.ui")],
+                                           workers=1, match="assignment", profile=profile))
+        assert records[0]["similarity_score"] == 1.0
+
+    print("✓ Profile used by assignment matching and batch comparison")
+
+
+def test_comparisons_without_numpy():
+    """Plain comparisons and the MCP server don't need NumPy."""
+    print("\n=== Test 4: No NumPy Without A Profile ===")
+
+    code = ("import sys; sys.modules['numpy'] = None\n"
+            "import mcp_server, batch_compare, streaming_comparator\n"
+            "from ui_comparator import UIComparator\n"
+            "UIComparator(); streaming_comparator.StreamingComparator()\n"
+            "assert 'scoring_profile' not in sys.modules\n")
+    completed = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent,
+                               capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
+
+    print("✓ scoring_profile is only imported when a profile is given")
+
+
+def main():
+    """Run all tests."""
+    test_geometry_tolerance()
+    test_property_weights_and_type_classes()
+    test_profile_in_assignment_and_batch()
+    test_comparisons_without_numpy()
+
+    print("\n✓ All scoring profile tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Test: Screenshot Analysis Rules
+
+Tests the pixel rules on synthetic frames and widget rects:
+1. Clipped text vs fitting left/right-aligned text
+2. Empty regions and zero-size widgets
+3. Verifier pass with a rendered frame (stub editor client)
+4. Full-HD frame analysis: whole-frame passes independent of widget count
+5. WCAG text contrast on a dark theme
+6. Shared-memory frame transport (no PNG round trip) and PNG fallback
+"""
+
+import base64
+import sys
+from multiprocessing import shared_memory
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from image_utils import encode_png, load_image
+import screenshot_analysis
+from screenshot_analysis import analyze_frame
+from ui_manager import UIManager
+from ui_verifier import UIVerifier
+
+
+def make_frame(width: int = 400, height: int = 300) -> np.ndarray:
+    """Light gray window."""
+    frame = np.full((height, width, 4), 235, dtype=np.uint8)
+    frame[:, :, 3] = 255
+    return frame
+
+
+def draw_text(frame: np.ndarray, x0: int, y0: int, x1: int, y1: int, color: int = 20):
+    """Glyph-like checker pattern standing in for text."""
+    yy, xx = np.mgrid[y0:y1, x0:x1]
+    ink = ((yy // 2 + xx // 3) % 2).astype(bool)
+    frame[y0:y1, x0:x1, :3][ink] = color
+
+
+def widget(name, cls, x, y, w, h, parent="Dialog", **extra):
+    return {"name": name, "class": cls, "parent": parent, "x": x, "y": y,
+            "width": w, "height": h, "visible": True, **extra}
+
+
+def geometry_for(widgets, width=400, height=300):
+    root = widget("Dialog", "QDialog", 0, 0, width, height, parent=None)
+    return {"width": width, "height": height, "device_pixel_ratio": 1.0, "widgets": [root] + widgets}
+
+
+def test_clipped_text():
+    """Only text running into both sides of its rect is clipped."""
+    print("\n=== Test 1: Clipped Text ===")
+
+    frame = make_frame()
+    # clippedLabel: text covers the whole rect; fitting labels leave a gap on one side
+    draw_text(frame, 10, 14, 110, 26)
+    draw_text(frame, 10, 54, 70, 66)
+    draw_text(frame, 150, 54, 210, 66)
+    # Button with a frame line and text that fits
+    frame[100:130, 10:110, :3] = 200
+    frame[100:130, [10, 109], :3] = 90
+    draw_text(frame, 30, 110, 90, 120)
+
+    geometry = geometry_for([
+        widget("clippedLabel", "QLabel", 10, 10, 100, 20, text="A very long label"),
+        widget("leftLabel", "QLabel", 10, 50, 100, 20, text="Name"),
+        widget("rightLabel", "QLabel", 110, 50, 100, 20, text="Name"),
+        widget("okButton", "QPushButton", 10, 100, 100, 30, text="OK"),
+        widget("nameEdit", "QLineEdit", 10, 10, 100, 20, text="Long text scrolls"),
+    ])
+    findings = [f for f in analyze_frame(frame, geometry) if f["rule"] == "clipped-text"]
+
+    assert [f["widget"] for f in findings] == ["clippedLabel"]
+    assert findings[0]["details"]["sides"] == ["left", "right"]
+    print("✓ Clipped label found; fitting labels, button and line edit ignored")
+
+
+def test_empty_regions_and_zero_size():
+    """Blank uncovered areas and collapsed widgets are reported."""
+    print("\n=== Test 2: Empty Regions and Zero Size ===")
+
+    frame = make_frame(640, 480)
+    frame[20:460, 20:300, :3] = 255  # text edit on the left
+    draw_text(frame, 30, 30, 200, 40)
+
+    geometry = geometry_for([
+        widget("notesEdit", "QTextEdit", 20, 20, 280, 440),
+        widget("placeholder", "QWidget", 320, 20, 300, 200),  # empty container: not content
+        widget("collapsedList", "QListWidget", 320, 300, 200, 0),
+        widget("hiddenButton", "QPushButton", 0, 0, 0, 0, visible=False),
+    ], 640, 480)
+    findings = analyze_frame(frame, geometry)
+
+    regions = [f for f in findings if f["rule"] == "empty-region"]
+    assert regions, "Right half should be reported as empty"
+    region = regions[0]["details"]["region"]
+    assert region["x"] >= 300 and region["width"] >= 256 and region["height"] >= 400
+
+    zero = [f["widget"] for f in findings if f["rule"] == "zero-size-widget"]
+    assert zero == ["collapsedList"]
+    print(f"✓ Empty region {region}, zero-size {zero}")
+
+
+class StubClient:
+    """Editor client returning a fixed rendered frame as PNG."""
+
+    def __init__(self, frame, geometry):
+        self.response = {
+            "status": "success",
+            "width": frame.shape[1],
+            "height": frame.shape[0],
+            "screenshot_base64": base64.b64encode(encode_png(frame)).decode("ascii"),
+            "geometry": geometry
+        }
+
+    def ping(self):
+        return True
+
+    def render_ui(self, ui_file, geometry=False, transport="base64"):
+        assert geometry
+        return self.response
+
+
+class SharedMemoryClient:
+    """Editor client exporting the raw frame into shared memory (or not at all)."""
+
+    def __init__(self, frame, geometry, export: bool = True):
+        self.frame = frame
+        self.geometry = geometry
+        self.export = export
+        self.segments = []
+        self.calls = []
+        self.released = []
+
+    def ping(self):
+        return True
+
+    def release_frame(self, name):
+        self.released.append(name)
+        return {"status": "success", "released": False}
+
+    def render_ui(self, ui_file, geometry=False, transport="base64"):
+        assert geometry
+        self.calls.append(transport)
+        height, width = self.frame.shape[:2]
+        response = {"status": "success", "width": width, "height": height, "geometry": self.geometry}
+        if transport != "shm":
+            response["screenshot_base64"] = base64.b64encode(encode_png(self.frame)).decode("ascii")
+            return response
+        if self.export:
+            segment = shared_memory.SharedMemory(create=True, size=self.frame.nbytes)
+            segment.buf[:self.frame.nbytes] = self.frame.tobytes()
+            name = segment.name
+            self.segments.append(name)
+            segment.close()
+        else:
+            name = "qtlive_missing_segment"  # exported where this process can't see it
+        response["frame"] = {"shm": name, "width": width, "height": height,
+                             "stride": width * 4, "format": "rgba8888"}
+        return response
+
+
+def test_verifier_with_frame():
+    """verify_ui runs structural and screenshot rules in one pass."""
+    print("\n=== Test 3: Verifier With Frame ===")
+
+    frame = make_frame()
+    draw_text(frame, 10, 14, 110, 26)
+    geometry = geometry_for([widget("titleLabel", "QLabel", 10, 10, 100, 20, text="Title")])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ui_file = Path(tmp) / "dialog.ui"
+        manager = UIManager()
+        manager.create_empty_ui("QDialog", "Dialog", 400, 300)
+        manager.add_widget("QLabel", "titleLabel", properties={
+            "text": "Title", "geometry": {"x": 10, "y": 10, "width": 100, "height": 20}})
+        manager.save(str(ui_file))
+
+        verifier = UIVerifier(use_cache=False)
+        verifier.client = StubClient(frame, geometry)
+        result = verifier.verify_ui(str(ui_file))
+        assert Path(result["screenshot_path"]).exists()
+
+    assert result["status"] == "success"
+    assert result["widget_count"] == 2
+    rules = {issue["rule"] for issue in result["issues"]}
+    assert "clipped-text" in rules
+    print(f"✓ {result['message']}: {sorted(rules)}")
+
+
+def count_frame_passes(frame, geometry):
+    """analyze_frame() plus the number of whole-frame passes it made."""
+    passes = {}
+    originals = {name: getattr(screenshot_analysis, name)
+                 for name in ("luminance", "relative_luminance", "integral_image")}
+
+    def counted(name):
+        def wrapper(*args, **kwargs):
+            passes[name] = passes.get(name, 0) + 1
+            return originals[name](*args, **kwargs)
+        return wrapper
+
+    for name in originals:
+        setattr(screenshot_analysis, name, counted(name))
+    try:
+        return analyze_frame(frame, geometry), passes
+    finally:
+        for name, function in originals.items():
+            setattr(screenshot_analysis, name, function)
+
+
+def test_full_hd_speed():
+    """Whole-frame passes don't grow with the widget count."""
+    print("\n=== Test 4: Full-HD Speed ===")
+
+    passes = {}
+    for count in (20, 2000):
+        frame = make_frame(1920, 1080)
+        widgets = []
+        for i in range(count):
+            x, y = (i % 40) * 48, (i // 40) * 21
+            draw_text(frame, x + 2, y + 4, x + 30, y + 14)
+            widgets.append(widget(f"label{i}", "QLabel", x, y, 46, 20, text="Label"))
+        geometry = geometry_for(widgets, 1920, 1080)
+
+        start = time.perf_counter()
+        findings, passes[count] = count_frame_passes(frame, geometry)
+        elapsed = time.perf_counter() - start
+        assert not [f for f in findings if f["rule"] in ("clipped-text", "text-contrast")]
+
+    assert passes[2000] == passes[20], passes
+    assert passes[2000] == {"luminance": 1, "relative_luminance": 1, "integral_image": 2}, passes
+    print(f"✓ Analyzed 1920x1080 frame with {len(widgets)} widgets in {elapsed * 1000:.0f} ms, "
+          f"{sum(passes[2000].values())} whole-frame passes")
+
+
+def test_text_contrast():
+    """Dim text on a dark background fails; large text has a lower bar."""
+    print("\n=== Test 5: Text Contrast ===")
+
+    frame = make_frame()
+    frame[:, :, :3] = 45  # dark theme
+    colors = {"brightLabel": 200, "dimLabel": 90, "largeLabel": 120, "smallLabel": 120, "disabledLabel": 60}
+    widgets = []
+    for i, (name, color) in enumerate(colors.items()):
+        y = 10 + i * 40
+        draw_text(frame, 14, y + 6, 90, y + 24, color)
+        extra = {"font_point_size": 18.0} if name == "largeLabel" else {"font_point_size": 9.0}
+        widgets.append(widget(name, "QLabel", 10, y, 120, 30, text=name,
+                              enabled=name != "disabledLabel", **extra))
+
+    findings = [f for f in analyze_frame(frame, geometry_for(widgets)) if f["rule"] == "text-contrast"]
+    failing = {f["widget"]: f["details"] for f in findings}
+
+    assert set(failing) == {"dimLabel", "smallLabel"}
+    assert failing["dimLabel"]["ratio"] < 3.0
+    assert failing["smallLabel"]["required"] == 4.5
+    assert 3.0 <= failing["smallLabel"]["ratio"] < 4.5
+    ratios = ", ".join(f"{name} {details['ratio']}:1" for name, details in failing.items())
+    print(f"✓ Failing: {ratios}")
+
+
+def test_shared_memory_transport():
+    """The frame is analyzed in place and the segment released afterwards."""
+    print("\n=== Test 6: Shared-Memory Transport ===")
+
+    frame = make_frame()
+    draw_text(frame, 10, 14, 110, 26)
+    geometry = geometry_for([widget("titleLabel", "QLabel", 10, 10, 100, 20, text="Title")])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ui_file = Path(tmp) / "dialog.ui"
+        manager = UIManager()
+        manager.create_empty_ui("QDialog", "Dialog", 400, 300)
+        manager.add_widget("QLabel", "titleLabel", properties={
+            "text": "Title", "geometry": {"x": 10, "y": 10, "width": 100, "height": 20}})
+        manager.save(str(ui_file))
+
+        verifier = UIVerifier(use_cache=False)
+        verifier.client = StubClient(frame, geometry)
+        expected = verifier.verify_ui(str(ui_file), save_screenshot=False)
+
+        client = SharedMemoryClient(frame, geometry)
+        verifier.client = client
+        result = verifier.verify_ui(str(ui_file), save_screenshot=False, include_screenshot=False)
+        assert not (Path(tmp) / "dialog_verify.png").exists()
+
+        # Screenshot requested: encoded once from the shared frame
+        saved = verifier.verify_ui(str(ui_file))
+        assert Path(saved["screenshot_path"]).exists()
+        assert load_image(saved["screenshot_base64"]).tobytes() == frame.tobytes()
+        assert client.calls == ["shm", "shm"]
+
+        # Segment not visible in this process: rendered again as PNG
+        unreachable = SharedMemoryClient(frame, geometry, export=False)
+        verifier.client = unreachable
+        fallback = verifier.verify_ui(str(ui_file), save_screenshot=False)
+        assert unreachable.calls == ["shm", "base64"]
+        assert unreachable.released == ["qtlive_missing_segment"]
+        assert fallback["status"] == "success"
+        assert load_image(fallback["screenshot_base64"]).tobytes() == frame.tobytes()
+
+        # Shared memory is not retried once it failed
+        verifier.verify_ui(str(ui_file), save_screenshot=False)
+        assert unreachable.calls == ["shm", "base64", "base64"]
+        assert verifier.transport == "base64"
+
+    assert result["issues"] == expected["issues"] == saved["issues"] == fallback["issues"]
+    assert "screenshot_base64" not in result and "screenshot_path" not in result
+    for name in client.segments:
+        try:
+            shared_memory.SharedMemory(name=name).close()
+            raise AssertionError(f"Segment {name} was not released")
+        except FileNotFoundError:
+            pass
+    print(f"✓ Same {len(result['issues'])} issues without PNG round trip; {len(client.segments)} segments released")
+
+
+def main():
+    """Run all tests."""
+    test_clipped_text()
+    test_empty_regions_and_zero_size()
+    test_verifier_with_frame()
+    test_full_hd_speed()
+    test_text_contrast()
+    test_shared_memory_transport()
+
+    print("\n✓ All screenshot analysis tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
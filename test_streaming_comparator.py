@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test: Streaming Comparator
+
+Tests:
+1. Streaming results equal UIComparator results
+2. Memory stays flat as files grow
+"""
+
+import io
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from streaming_comparator import StreamingComparator, compare_streaming
+from ui_comparator import UIComparator
+
+
+def write_generated_ui(path: Path, groups: int, changed=(), removed=(), extra: int = 0):
+    """Generated form: groups of a frame with a grid layout holding 4 widgets."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<ui version="4.0">\n')
+        f.write(' <class>Generated</class>\n <widget class="QWidget" name="Generated">\n')
+        f.write('  <property name="geometry"><rect><x>0</x><y>0</y>'
+                f'<width>800</width><height>{groups * 30}</height></rect></property>\n')
+        for g in range(groups):
+            if g in removed:
+                continue
+            f.write(f'  <widget class="QFrame" name="frame{g}">\n'
+                    '   <property name="geometry"><rect><x>0</x>'
+                    f'<y>{g * 30}</y><width>800</width><height>30</height></rect></property>\n'
+                    f'   <layout class="QGridLayout" name="grid{g}">\n')
+            for i, widget_type in enumerate(("QLabel", "QLineEdit", "QCheckBox", "QPushButton")):
+                text = f"Item {g}.{i}" + (" changed" if (g, i) in changed else "")
+                f.write(f'    <item row="0" column="{i}"><widget class="{widget_type}" name="w{g}_{i}">'
+                        f'<property name="text"><string>{text}</string></property></widget></item>\n')
+            f.write('   </layout>\n  </widget>\n')
+        for e in range(extra):
+            f.write(f'  <widget class="QPushButton" name="extra{e}"/>\n')
+        f.write(' </widget>\n</ui>\n')
+
+
+def test_equal_to_ui_comparator():
+    """Same diff records (in name order) and score as UIComparator."""
+    print("\n=== Test 1: Equal Results ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        reference, target = tmp / "reference.ui", tmp / "target.ui"
+        write_generated_ui(reference, 300)
+        write_generated_ui(target, 300, changed={(5, 0), (17, 3), (200, 1)},
+                           removed=(42, 43), extra=7)
+
+        for profile in (None, {"type_weights": {"QFrame": 3.0}, "geometry_scale": 10}):
+            comparator = UIComparator(profile)
+            comparator.load_reference(str(reference))
+            comparator.load_target(str(target))
+            expected_stream = io.StringIO()
+            expected = comparator.write_jsonl(expected_stream)
+
+            stream = io.StringIO()
+            summary = compare_streaming(str(reference), str(target), stream, profile)
+
+            def records(text):
+                lines = [json.loads(line) for line in text.splitlines()]
+                return sorted((r["record"], r["widget"], json.dumps(r.get("differences"), sort_keys=True))
+                              for r in lines[1:-1])
+
+            assert records(stream.getvalue()) == records(expected_stream.getvalue())
+            assert abs(summary["similarity_score"] - expected["similarity_score"]) < 1e-12
+            assert summary["counts"] == expected["counts"]
+            assert summary["changed_properties"] == expected["changed_properties"]
+
+    print(f"✓ {summary['counts']} identical to UIComparator")
+
+
+def test_bounded_memory():
+    """Peak Python memory does not grow with the number of widgets."""
+    print("\n=== Test 2: Bounded Memory ===")
+
+    peaks = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for groups in (500, 4000):
+            reference, target = tmp / f"ref{groups}.ui", tmp / f"tgt{groups}.ui"
+            write_generated_ui(reference, groups)
+            write_generated_ui(target, groups, changed={(g, 1) for g in range(0, groups, 10)})
+
+            tracemalloc.start()
+            with StreamingComparator(batch_size=1000) as comparator:
+                summary = comparator.compare(str(reference), str(target))
+            peaks[groups] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert summary["counts"]["changed"] == groups // 10
+
+    # 8x the widgets, well under 2x the memory
+    assert peaks[4000] < peaks[500] * 2, peaks
+    print(f"✓ Peak {peaks[500] / 1e6:.1f} MB at 2.5k widgets, {peaks[4000] / 1e6:.1f} MB at 20k")
+
+
+def main():
+    """Run all tests."""
+    test_equal_to_ui_comparator()
+    test_bounded_memory()
+
+    print("\n✓ All streaming comparator tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
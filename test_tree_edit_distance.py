@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test: Tree Edit Distance Similarity
+
+Tests:
+1. Zhang–Shasha on a textbook example
+2. Renamed widgets keep full structural similarity
+3. Shortcuts (identical trees, lower-bound pruning)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from mcp_server import compare_with_reference
+from tree_edit_distance import TreeNode, _hash_tree, zhang_shasha, tree_distance
+from ui_manager import UIManager
+
+
+def node(label, *children):
+    return TreeNode(label, list(children))
+
+
+def create_dialog(path: str, prefix: str = "", extra_button: bool = False):
+    """Dialog with a vertical layout of labelled inputs."""
+    manager = UIManager()
+    manager.create_empty_ui("QDialog", "Dialog", 400, 300)
+    manager.add_layout("QVBoxLayout", f"{prefix}mainLayout")
+    for i in range(3):
+        manager.add_widget("QLabel", f"{prefix}label{i}", properties={"text": f"Field {i}"})
+        manager.add_widget("QLineEdit", f"{prefix}input{i}")
+    if extra_button:
+        manager.add_widget("QPushButton", f"{prefix}applyButton", properties={"text": "Apply"})
+    manager.save(path)
+
+
+def test_textbook_example():
+    """f(d(a c(b)) e) → f(c(d(a b)) e) costs 2 edits."""
+    print("\n=== Test 1: Zhang–Shasha ===")
+
+    a = node("f", node("d", node("a"), node("c", node("b"))), node("e"))
+    b = node("f", node("c", node("d", node("a"), node("b"))), node("e"))
+    _hash_tree(a)
+    _hash_tree(b)
+
+    assert zhang_shasha(a, b) == 2
+    print("✓ Distance: 2")
+
+
+def test_rename_tolerant_similarity():
+    """Renamed widgets score 100% in tree mode but not in name mode."""
+    print("\n=== Test 2: Renamed Widgets ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = str(Path(tmp) / "reference.ui")
+        renamed = str(Path(tmp) / "renamed.ui")
+        extended = str(Path(tmp) / "extended.ui")
+        create_dialog(reference)
+        create_dialog(renamed, prefix="new_")
+        create_dialog(extended, prefix="new_", extra_button=True)
+
+        result = compare_with_reference(reference, renamed, detailed=False, similarity_mode="tree")
+        assert result["similarity_score"] == 1.0
+        assert result["name_similarity_score"] < 0.5
+        assert "Tree Similarity: 100.0% (returned as similarity_score" in result["report"]
+
+        result = compare_with_reference(reference, extended, detailed=False, similarity_mode="tree")
+        assert result["tree_distance"]["distance"] == 1
+        assert result["tree_distance"]["exact"]
+
+    print(f"✓ Tree similarity with one extra widget: {result['similarity_score']:.1%}")
+
+
+def test_shortcuts():
+    """Identical trees short-circuit; lower bound prunes distant pairs."""
+    print("\n=== Test 3: Shortcuts ===")
+
+    wide_a = node("ui", *[node("widget:QLabel") for _ in range(50)])
+    wide_b = node("ui", *[node("widget:QLabel") for _ in range(50)])
+    tall = node("ui", node("widget:QPushButton"))
+    for tree in (wide_a, wide_b, tall):
+        _hash_tree(tree)
+
+    assert tree_distance(wide_a, wide_b).method == "identical"
+
+    pruned = tree_distance(wide_a, tall, max_distance=5)
+    assert pruned.method == "lower-bound"
+    assert pruned.distance > 5
+    print(f"✓ Pruned with lower bound {pruned.distance}")
+
+
+def main():
+    """Run all tests."""
+    test_textbook_example()
+    test_rename_tolerant_similarity()
+    test_shortcuts()
+
+    print("\n✓ All tree edit distance tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Test: UI Comparator
+
+Tests widget extraction and comparison on generated .ui files.
+"""
+
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from ui_comparator import UIComparator, ComparisonSession, root_hash
+from ui_manager import UIManager
+
+
+def create_nested_ui(path: str, ok_x: int = 150):
+    """Dialog with a group box (no geometry) containing a layout and buttons."""
+    manager = UIManager()
+    manager.create_empty_ui("QDialog", "NestedDialog", 400, 300)
+    manager.add_widget("QGroupBox", "optionsGroup", properties={"title": "Options"})
+    manager.add_layout("QVBoxLayout", "optionsLayout", "optionsGroup")
+    layout = manager.root.find(".//layout[@name='optionsLayout']")
+    manager.add_widget("QCheckBox", "verboseCheck", "optionsGroup", properties={
+        "text": "Verbose",
+        "geometry": {"x": 10, "y": 20, "width": 120, "height": 25}
+    })
+    # Move the checkbox into the layout as an <item>
+    group = manager._find_widget("optionsGroup")
+    check = manager._find_widget("verboseCheck")
+    group.remove(check)
+    item = layout.makeelement("item", {})
+    layout.append(item)
+    item.append(check)
+    manager.add_widget("QPushButton", "okButton", properties={
+        "text": "OK",
+        "geometry": {"x": ok_x, "y": 200, "width": 100, "height": 40}
+    })
+    manager.save(path)
+
+
+def test_extraction_parents_and_geometry():
+    """Parents go through layouts; containers don't inherit child geometry."""
+    print("\n=== Test 1: Extraction ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ui_file = str(Path(tmp) / "nested.ui")
+        create_nested_ui(ui_file)
+
+        widgets = UIComparator().load_reference(ui_file)
+
+    assert list(widgets) == ["NestedDialog", "optionsGroup", "verboseCheck", "okButton"]
+
+    group = widgets["optionsGroup"]
+    assert group.parent == "NestedDialog"
+    assert group.depth == 1
+    assert group.geometry == {}
+    assert group.properties == {"title": "Options"}
+    assert group.children == ["verboseCheck"]
+
+    check = widgets["verboseCheck"]
+    assert check.parent == "optionsGroup"
+    assert check.depth == 2
+    assert check.geometry == {"x": 10, "y": 20, "width": 120, "height": 25}
+
+    print("✓ Parent, depth, direct geometry and properties extracted")
+
+
+def test_memoized_comparison():
+    """compare() is cached until different content is loaded."""
+    print("\n=== Test 2: Memoized Comparison ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = str(Path(tmp) / "reference.ui")
+        target = str(Path(tmp) / "target.ui")
+        create_nested_ui(reference)
+        create_nested_ui(target, ok_x=200)
+
+        comparator = UIComparator()
+        comparator.load_reference(reference)
+        comparator.load_target(target)
+        first = comparator.compare()
+        assert comparator.compare() is first
+        assert comparator.get_missing_widget_specs() == []
+
+        # Reloading identical content keeps the cached result
+        comparator.load_target(target)
+        assert comparator.compare() is first
+
+        # Different content invalidates it
+        create_nested_ui(target, ok_x=150)
+        comparator.load_target(target)
+        second = comparator.compare()
+        assert second is not first
+        assert second.property_differences == {}
+
+        # Parsed reference is shared with other comparators
+        other = UIComparator()
+        assert other.load_reference(reference) is comparator.reference_widgets
+
+    print("✓ Results and parsed models reused")
+
+
+def create_form_ui(path: str, rows: int = 20, changed=(), removed=(), added=()):
+    """Form with one group box per row, each holding a label and an input."""
+    manager = UIManager()
+    manager.create_empty_ui("QWidget", "Form", 600, rows * 40)
+    for i in range(rows):
+        if i in removed:
+            continue
+        manager.add_widget("QGroupBox", f"rowGroup{i}", properties={
+            "geometry": {"x": 0, "y": i * 40, "width": 600, "height": 40}
+        })
+        manager.add_widget("QLabel", f"rowLabel{i}", f"rowGroup{i}", properties={
+            "text": f"Field {i}" + (" (edited)" if i in changed else ""),
+            "geometry": {"x": 10, "y": 5, "width": 100, "height": 25}
+        })
+        manager.add_widget("QLineEdit", f"rowInput{i}", f"rowGroup{i}", properties={
+            "geometry": {"x": 120, "y": 5, "width": 400, "height": 25}
+        })
+    for name in added:
+        manager.add_widget("QPushButton", name, properties={"text": name})
+    manager.save(path)
+
+
+def test_subtree_hash_skipping():
+    """Identical branches are skipped; results equal a full diff."""
+    print("\n=== Test 3: Subtree Hashes ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = str(Path(tmp) / "reference.ui")
+        target = str(Path(tmp) / "target.ui")
+        create_form_ui(reference)
+        create_form_ui(target, changed=(3, 7), removed=(11,), added=("applyButton",))
+
+        comparator = UIComparator()
+        ref_widgets = comparator.load_reference(reference)
+        target_widgets = comparator.load_target(target)
+        result = comparator.compare()
+
+        # Full diff of every same-named widget for reference
+        expected = {}
+        for name in ref_widgets.keys() & target_widgets.keys():
+            diffs = comparator._compare_widgets(ref_widgets[name], target_widgets[name])
+            if diffs:
+                expected[name] = diffs
+
+        assert result.property_differences == expected
+        assert set(result.property_differences) == {"rowLabel3", "rowLabel7"}
+        assert result.missing_widgets == ["rowGroup11", "rowLabel11", "rowInput11"]
+        assert result.extra_widgets == ["applyButton"]
+        assert len(result.matching_widgets) == len(ref_widgets) - 3
+
+        # Unchanged rows share subtree hashes; the root differs
+        assert ref_widgets["rowGroup0"].subtree_hash == target_widgets["rowGroup0"].subtree_hash
+        assert ref_widgets["rowGroup3"].subtree_hash != target_widgets["rowGroup3"].subtree_hash
+        assert root_hash(ref_widgets) != root_hash(target_widgets)
+
+        create_form_ui(target)
+        assert root_hash(comparator.load_target(target)) == root_hash(ref_widgets)
+
+    print("✓ Only differing branches were diffed")
+
+
+def test_assignment_matching():
+    """Renamed widgets are paired by geometry, text and parent."""
+    print("\n=== Test 4: Assignment Matching ===")
+
+    import widget_matcher
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = str(Path(tmp) / "reference.ui")
+        target = str(Path(tmp) / "target.ui")
+        create_form_ui(reference, rows=5)
+        create_form_ui(target, rows=5, removed=(4,))
+
+        # Rename two widgets in the target without changing anything else
+        text = Path(target).read_text(encoding="utf-8")
+        text = text.replace('name="rowLabel1"', 'name="label_1"')
+        text = text.replace('name="rowInput2"', 'name="nameEdit"')
+        Path(target).write_text(text, encoding="utf-8")
+
+        comparator = UIComparator()
+        comparator.load_reference(reference)
+        comparator.load_target(target)
+
+        by_name = comparator.compare()
+        assert "rowLabel1" in by_name.missing_widgets
+        assert "label_1" in by_name.extra_widgets
+
+        # Exercise the NumPy Hungarian fallback even if scipy is installed
+        solver = widget_matcher.linear_sum_assignment
+        widget_matcher.linear_sum_assignment = None
+        try:
+            assigned = comparator.compare(match="assignment")
+        finally:
+            widget_matcher.linear_sum_assignment = solver
+
+        assert assigned.renamed_widgets == {"rowLabel1": "label_1", "rowInput2": "nameEdit"}
+        assert assigned.missing_widgets == ["rowGroup4", "rowLabel4", "rowInput4"]
+        assert assigned.extra_widgets == []
+        assert assigned.property_differences == {}
+        assert assigned.similarity_score > by_name.similarity_score
+
+        try:
+            comparator.compare(match="fuzzy")
+            assert False, "Unknown match mode should raise"
+        except ValueError:
+            pass
+
+    print("✓ Renames detected, removed row reported as missing")
+
+
+def test_comparison_session():
+    """Incremental updates equal a full re-comparison after each edit."""
+    print("\n=== Test 5: Comparison Session ===")
+
+    edits = [
+        {"changed": (2,)},
+        {"changed": (2, 5), "removed": (9,)},
+        {"changed": (5,), "removed": (9,), "added": ("helpButton",)},
+        {}
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = str(Path(tmp) / "reference.ui")
+        target = str(Path(tmp) / "target.ui")
+        create_form_ui(reference, rows=12)
+        create_form_ui(target, rows=12)
+
+        session = ComparisonSession(reference, target)
+        assert session.result.similarity_score == 1.0
+
+        for edit in edits:
+            create_form_ui(target, rows=12, **edit)
+            result = session.update()
+
+            full = UIComparator()
+            full.load_reference(reference)
+            full.load_target(target)
+            expected = full.compare()
+
+            assert set(result.matching_widgets) == set(expected.matching_widgets)
+            assert result.missing_widgets == expected.missing_widgets
+            assert result.extra_widgets == expected.extra_widgets
+            assert result.property_differences == expected.property_differences
+            assert result.similarity_score == expected.similarity_score
+            assert len(session.last_changed) <= 5
+
+        # Unchanged target: nothing re-diffed
+        assert session.update() is result
+        assert session.last_changed == set()
+
+        # Edited reference: full re-comparison
+        create_form_ui(reference, rows=12, changed=(3,))
+        result = session.update()
+        full = UIComparator()
+        full.load_reference(reference)
+        full.load_target(target)
+        expected = full.compare()
+        assert result.property_differences == expected.property_differences != {}
+        assert result.similarity_score == expected.similarity_score
+
+    print("✓ Session state matches full comparison after every edit")
+
+
+def test_jsonl_stream():
+    """Streamed records cover every difference; summary matches compare()."""
+    print("\n=== Test 6: JSONL Stream ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = str(Path(tmp) / "reference.ui")
+        target = str(Path(tmp) / "target.ui")
+        changed = tuple(range(0, 60, 3))
+        create_form_ui(reference, rows=60)
+        create_form_ui(target, rows=60, changed=changed, removed=(7, 8),
+                       added=tuple(f"extra{i}" for i in range(12)))
+
+        for profile in (None, {"position_tolerance": 2}):
+            comparator = UIComparator(profile)
+            comparator.load_reference(reference)
+            comparator.load_target(target)
+            result = comparator.compare()
+
+            stream = io.StringIO()
+            summary = comparator.write_jsonl(stream, sample_size=5)
+            records = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+            assert records[0]["record"] == "header"
+            assert records[-1] == summary
+            body = records[1:-1]
+            assert [r["widget"] for r in body if r["record"] == "changed"] == \
+                list(result.property_differences)
+            assert [r["widget"] for r in body if r["record"] == "missing"] == result.missing_widgets
+            assert [r["widget"] for r in body if r["record"] == "extra"] == result.extra_widgets
+            assert summary["similarity_score"] == result.similarity_score
+            assert summary["counts"]["changed"] == len(changed)
+            assert summary["changed_properties"] == {"text": len(changed)}
+            assert len(summary["samples"]["extra"]) == 5
+
+            # Writing the computed result gives the same stream without re-comparing
+            replay = io.StringIO()
+            comparator.iter_events = None
+            assert comparator.write_jsonl(replay, sample_size=5, result=result) == summary
+            assert replay.getvalue() == stream.getvalue()
+
+    print(f"✓ {len(body)} diff records streamed, summary equals compare()")
+
+
+def main():
+    """Run all tests."""
+    test_extraction_parents_and_geometry()
+    test_memoized_comparison()
+    test_subtree_hash_skipping()
+    test_assignment_matching()
+    test_comparison_session()
+    test_jsonl_stream()
+
+    print("\n✓ All UI comparator tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
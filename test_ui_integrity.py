@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Test: .ui Integrity Checks
+
+Tests:
+1. Designer-style file with menus, buddies, tab stops and connections is clean
+2. Each broken name or reference is reported with its path
+3. Checking work grows linearly with the tree
+4. UIManager.save(validate=True) and the MCP tools report integrity errors
+"""
+
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from mcp_server import add_widget_to_ui, check_ui_integrity
+from ui_integrity import UIIndex, check_integrity
+from ui_manager import UIManager
+from ui_schema import SchemaValidationError
+
+
+DESIGNER_UI = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>MainWindow</class>
+ <widget class="QMainWindow" name="MainWindow">
+  <widget class="QWidget" name="centralwidget">
+   <layout class="QFormLayout" name="formLayout">
+    <item row="0" column="0">
+     <widget class="QLabel" name="nameLabel">
+      <property name="buddy"><cstring>nameEdit</cstring></property>
+     </widget>
+    </item>
+    <item row="0" column="1">
+     <widget class="QLineEdit" name="nameEdit"/>
+    </item>
+    <item row="1" column="0">
+     <widget class="QRadioButton" name="smallRadio">
+      <attribute name="buttonGroup"><string notr="true">sizeGroup</string></attribute>
+     </widget>
+    </item>
+    <item row="1" column="1">
+     <spacer name="horizontalSpacer"/>
+    </item>
+   </layout>
+  </widget>
+  <widget class="QMenuBar" name="menubar">
+   <widget class="QMenu" name="menuFile">
+    <addaction name="actionOpen"/>
+    <addaction name="separator"/>
+    <addaction name="actionQuit"/>
+   </widget>
+   <addaction name="menuFile"/>
+  </widget>
+  <action name="actionOpen"/>
+  <action name="actionQuit"/>
+ </widget>
+ <tabstops>
+  <tabstop>nameEdit</tabstop>
+  <tabstop>smallRadio</tabstop>
+ </tabstops>
+ <connections>
+  <connection><sender>actionQuit</sender><signal>triggered()</signal><receiver>MainWindow</receiver><slot>close()</slot></connection>
+ </connections>
+ <buttongroups>
+  <buttongroup name="sizeGroup"/>
+ </buttongroups>
+</ui>
+"""
+
+
+def test_clean_file():
+    """A consistent Designer file has no issues."""
+    print("\n=== Test 1: Clean File ===")
+
+    assert check_integrity(ET.fromstring(DESIGNER_UI)) == []
+    print("✓ Menus, actions, buddies, button groups, tab stops and connections resolve")
+
+
+def test_issues_located():
+    """Every check fires at the right element."""
+    print("\n=== Test 2: Issues Located ===")
+
+    root = ET.fromstring(DESIGNER_UI)
+    window = root.find("widget")
+    central = window.find("widget[@name='centralwidget']")
+    form = central.find("layout")
+    ET.SubElement(ET.SubElement(form, "item"), "widget", {"class": "QLineEdit", "name": "nameEdit"})
+    ET.SubElement(form, "item")
+    ET.SubElement(central, "widget", {"class": "QPushButton", "name": "looseButton"})
+    ET.SubElement(central, "layout", {"class": "QVBoxLayout", "name": "secondLayout"})
+    form.find("item/widget[@name='nameLabel']/property/cstring").text = "missingEdit"
+    form.find("item/widget[@name='smallRadio']/attribute/string").text = "otherGroup"
+    ET.SubElement(window.find("widget[@name='menubar']/widget"), "addaction", name="actionSave")
+    ET.SubElement(root.find("tabstops"), "tabstop").text = "actionOpen"
+    ET.SubElement(root.find("tabstops"), "tabstop").text = "nameEdit"
+    root.find("connections/connection/receiver").text = "Window"
+
+    found = {(i.check, i.severity, i.name, i.path) for i in check_integrity(root)}
+    central_path = "/ui/widget[MainWindow]/widget[centralwidget]"
+    form_path = f"{central_path}/layout[formLayout]"
+    expected = {
+        ("duplicate-name", "error", "nameEdit", f"{form_path}/item/widget[nameEdit]"),
+        ("empty-layout-item", "error", "", f"{form_path}/item"),
+        ("outside-layout", "warning", "looseButton", f"{central_path}/widget[looseButton]"),
+        ("multiple-layouts", "error", "centralwidget", central_path),
+        ("dangling-buddy", "error", "nameLabel", f"{form_path}/item/widget[nameLabel]"),
+        ("dangling-buttongroup", "error", "smallRadio", f"{form_path}/item/widget[smallRadio]"),
+        ("dangling-action", "error", "actionSave",
+         "/ui/widget[MainWindow]/widget[menubar]/widget[menuFile]/addaction[actionSave]"),
+        ("dangling-tabstop", "error", "actionOpen", "/ui/tabstops/tabstop"),
+        ("duplicate-tabstop", "warning", "nameEdit", "/ui/tabstops/tabstop"),
+        ("dangling-connection", "error", "Window", "/ui/connections/connection"),
+    }
+    assert found == expected, found ^ expected
+
+    issues = check_integrity(root)
+    assert [i.severity for i in issues] == sorted((i.severity for i in issues), key=lambda s: s != "error")
+    print(f"✓ {len(found)} issues reported with their paths, errors first")
+
+
+def build_tree(count: int) -> ET.Element:
+    """Dialog with count labels, each with a buddy, tab stop and connection."""
+    root = ET.Element("ui", version="4.0")
+    dialog = ET.SubElement(root, "widget", {"class": "QDialog", "name": "Dialog"})
+    layout = ET.SubElement(dialog, "layout", {"class": "QFormLayout", "name": "formLayout"})
+    tabstops = ET.SubElement(root, "tabstops")
+    connections = ET.SubElement(root, "connections")
+    for i in range(count):
+        label = ET.SubElement(ET.SubElement(layout, "item"), "widget", {"class": "QLabel", "name": f"label{i}"})
+        ET.SubElement(ET.SubElement(label, "property", name="buddy"), "cstring").text = f"edit{i}"
+        ET.SubElement(ET.SubElement(layout, "item"), "widget", {"class": "QLineEdit", "name": f"edit{i}"})
+        ET.SubElement(tabstops, "tabstop").text = f"edit{i}"
+        connection = ET.SubElement(connections, "connection")
+        for field, text in (("sender", f"edit{i}"), ("signal", "returnPressed()"),
+                            ("receiver", "Dialog"), ("slot", "accept()")):
+            ET.SubElement(connection, field).text = text
+    return root
+
+
+class CountingElement(ET._Element_Py):
+    """Pure-Python element that counts how often children are walked."""
+    visits = 0
+
+    def __iter__(self):
+        CountingElement.visits += 1
+        return iter(self._children)
+
+    def iter(self, tag=None):
+        CountingElement.visits += 1
+        return super().iter(tag)
+
+
+def counting_copy(elem: ET.Element) -> CountingElement:
+    """Copy a tree into CountingElements."""
+    copy = CountingElement(elem.tag, dict(elem.attrib))
+    copy.text = elem.text
+    copy.extend(counting_copy(child) for child in elem)
+    return copy
+
+
+def test_linear_time():
+    """Element visits per element stay flat as the tree grows."""
+    print("\n=== Test 3: Linear Time ===")
+
+    per_element = {}
+    for count in (2500, 10000):
+        root = counting_copy(build_tree(count))
+        elements = sum(1 for _ in root.iter())
+        CountingElement.visits = 0
+        assert check_integrity(UIIndex(root)) == []
+        per_element[count] = CountingElement.visits / elements
+
+    assert per_element[10000] <= per_element[2500] * 1.01, per_element
+    assert per_element[10000] < 3, per_element
+
+    root = build_tree(10000)
+    start = time.perf_counter()
+    check_integrity(root)
+    elapsed = time.perf_counter() - start
+    print(f"✓ {per_element[10000]:.2f} element visits per element at both sizes; "
+          f"20000 widgets checked in {elapsed * 1000:.0f} ms")
+
+
+def test_save_and_tools():
+    """Integrity errors block validated saves and show up in tool responses."""
+    print("\n=== Test 4: Save And MCP Tools ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "dialog.ui"
+        manager = UIManager()
+        manager.create_empty_ui("QDialog", "Dialog")
+        manager.add_widget("QLineEdit", "nameEdit")
+        manager.add_widget("QLabel", "nameLabel")
+        manager.set_buddy("nameLabel", "nameEdt")
+
+        try:
+            manager.save(str(output), validate=True)
+            raise AssertionError("save() should reject the dangling buddy")
+        except SchemaValidationError as e:
+            assert [v.check for v in e.violations] == ["dangling-buddy"]
+            assert "nameEdt" in str(e)
+        assert not output.exists()
+
+        manager.modify_property("nameLabel", "buddy", "nameEdit")
+        manager.save(str(output), validate=True)
+
+        assert "integrity_errors" not in add_widget_to_ui(str(output), "QPushButton", "okButton")
+        result = add_widget_to_ui(str(output), "QLineEdit", "nameEdit")
+        assert result["status"] == "success"
+        assert [i["check"] for i in result["integrity_errors"]] == ["duplicate-name"]
+
+        report = check_ui_integrity(str(output))
+        assert report["status"] == "success" and report["valid"] is False
+        assert report["errors"] == 1 and report["schema"] == []
+        assert report["integrity"][0]["name"] == "nameEdit"
+        assert check_ui_integrity(str(Path(tmp) / "missing.ui"))["status"] == "error"
+
+    print("✓ Validated save refuses dangling buddy; tools report duplicate names")
+
+
+def main():
+    """Run all tests."""
+    test_clean_file()
+    test_issues_located()
+    test_linear_time()
+    test_save_and_tools()
+
+    print("\n✓ All integrity check tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
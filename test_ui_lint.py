@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test: Static UI Lint
+
+Tests:
+1. Parallel lint of a directory (no editor), bad files reported
+2. Findings cache by content hash and ruleset
+3. CLI exit status and --severity overrides
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from ui_lint import lint_paths
+from ui_manager import UIManager
+
+
+def create_ui(path: Path, buttons: int = 2, blank_button: bool = False):
+    """Dialog with a few buttons; optionally one without text."""
+    manager = UIManager()
+    manager.create_empty_ui("QDialog", "Dialog", 400, 300)
+    for i in range(buttons):
+        manager.add_widget("QPushButton", f"button{i}", properties={
+            "text": "" if blank_button and i == 0 else f"Button {i}",
+            "geometry": {"x": 10, "y": 10 + i * 40, "width": 100, "height": 30}
+        })
+    manager.save(str(path))
+
+
+def create_tree(root: Path):
+    (root / "sub").mkdir()
+    create_ui(root / "clean.ui")
+    create_ui(root / "sub" / "blank.ui", blank_button=True)
+    for i in range(4):
+        create_ui(root / "sub" / f"form{i}.ui", buttons=i + 1)
+    (root / "broken.ui").write_text("<ui><widget", encoding="utf-8")
+
+
+def test_parallel_lint():
+    """Directory lint in a process pool matches the in-process result."""
+    print("\n=== Test 1: Parallel Lint ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        create_tree(root)
+
+        serial = list(lint_paths([str(root)], workers=1, cache_path=None))
+        parallel = list(lint_paths([str(root)], workers=2, cache_path=None))
+
+    assert serial == parallel
+    assert len(serial) == 7
+    by_name = {Path(r["file"]).name: r for r in serial}
+    assert by_name["broken.ui"]["status"] == "error"
+    assert by_name["clean.ui"]["findings"] == []
+    assert by_name["blank.ui"]["counts"]["warning"] == 1
+    assert by_name["blank.ui"]["findings"][0]["widget"] == "button0"
+
+    print(f"✓ Linted {len(serial)} files, {sum(r['status'] == 'error' for r in serial)} unreadable")
+
+
+def test_cache():
+    """Unchanged files come from the cache; edits and rule changes re-lint."""
+    print("\n=== Test 2: Findings Cache ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "ui"
+        root.mkdir()
+        create_tree(root)
+        cache_path = str(Path(tmp) / "lint_cache.json")
+
+        first = list(lint_paths([str(root)], workers=1, cache_path=cache_path))
+        second = list(lint_paths([str(root)], workers=1, cache_path=cache_path))
+        assert not any(r.get("cached") for r in first)
+        assert all(r["cached"] for r in second if r["status"] == "success")
+        assert [r.get("findings") for r in first] == [r.get("findings") for r in second]
+
+        create_ui(root / "clean.ui", blank_button=True)
+        third = {Path(r["file"]).name: r for r in lint_paths([str(root)], workers=1, cache_path=cache_path)}
+        assert third["clean.ui"]["cached"] is False
+        assert third["clean.ui"]["counts"]["warning"] == 1
+        assert third["blank.ui"]["cached"] is True
+
+        relaxed = {Path(r["file"]).name: r for r in lint_paths(
+            [str(root)], workers=1, cache_path=cache_path, severities={"button-text": "off"})}
+        assert relaxed["blank.ui"]["cached"] is False
+        assert relaxed["blank.ui"]["findings"] == []
+
+    print("✓ Cache hits for unchanged files, misses after edits and ruleset changes")
+
+
+def test_cli():
+    """CLI fails on error-level findings and honors severity overrides."""
+    print("\n=== Test 3: CLI ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        create_ui(root / "blank.ui", blank_button=True)
+        cli = [sys.executable, str(Path(__file__).parent / "ui_lint.py"), str(root), "--no-cache"]
+
+        default = subprocess.run(cli, capture_output=True, text=True)
+        strict = subprocess.run(cli + ["--severity", "button-text=error"], capture_output=True, text=True)
+        as_json = subprocess.run(cli + ["--json", "--fail-on", "warning"], capture_output=True, text=True)
+
+    assert default.returncode == 0, default.stderr
+    assert "warning: [button-text]" in default.stdout
+    assert strict.returncode == 1
+    assert "error: [button-text]" in strict.stdout
+    assert as_json.returncode == 1
+    assert json.loads(as_json.stdout.splitlines()[0])["counts"]["warning"] == 1
+
+    print("✓ Exit status follows --fail-on and --severity")
+
+
+def main():
+    """Run all tests."""
+    test_parallel_lint()
+    test_cache()
+    test_cli()
+
+    print("\n✓ All lint tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test: UI Performance Advisor
+
+Tests:
+1. QObject count and nesting depth
+2. Flatten, model/view and lazy-tab recommendations ranked by cost
+3. Forms without redundancy get no recommendations
+4. UIManager and MCP tool entry points
+"""
+
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from mcp_server import analyze_ui_performance
+from ui_manager import UIManager
+from ui_performance import analyze_performance
+
+
+DESIGNER_UI = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="mainLayout">
+   <item>
+    <widget class="QWidget" name="wrapper">
+     <layout class="QHBoxLayout" name="wrapperLayout">
+      <item>
+       <widget class="QLineEdit" name="searchEdit"/>
+      </item>
+     </layout>
+    </widget>
+   </item>
+   <item>
+    <layout class="QHBoxLayout" name="outerLayout">
+     <item>
+      <layout class="QHBoxLayout" name="innerLayout">
+       <item><widget class="QPushButton" name="okButton"/></item>
+       <item><widget class="QPushButton" name="cancelButton"/></item>
+      </layout>
+     </item>
+    </layout>
+   </item>
+   <item>
+    <widget class="QTabWidget" name="tabs">
+     <property name="currentIndex"><number>1</number></property>
+     <widget class="QWidget" name="generalPage"/>
+     <widget class="QWidget" name="advancedPage"/>
+    </widget>
+   </item>
+   <item>
+    <widget class="QListWidget" name="listWidget"/>
+   </item>
+  </layout>
+  <action name="actionOpen"/>
+ </widget>
+</ui>
+"""
+
+
+def designer_root(items: int = 0, hidden_widgets: int = 0) -> ET.Element:
+    """DESIGNER_UI with static list items and widgets on the hidden tab page."""
+    root = ET.fromstring(DESIGNER_UI)
+    list_widget = root.find(".//widget[@name='listWidget']")
+    for i in range(items):
+        ET.SubElement(ET.SubElement(list_widget, "item"), "property", name="text").text = f"Item {i}"
+    page = root.find(".//widget[@name='generalPage']")
+    for i in range(hidden_widgets):
+        ET.SubElement(page, "widget", {"class": "QCheckBox", "name": f"option{i}"})
+    return root
+
+
+def test_counts():
+    """Widgets, layouts and actions are counted; depth follows widget/layout nesting."""
+    print("\n=== Test 1: Counts And Depth ===")
+
+    report = analyze_performance(designer_root(items=3))
+    assert (report.widgets, report.layouts, report.qobjects) == (9, 4, 14)
+    assert report.static_items == 3
+    assert report.max_depth == 5
+    assert report.deepest_path == ("/ui/widget[Form]/layout[mainLayout]/item/widget[wrapper]"
+                                   "/layout[wrapperLayout]/item/widget[searchEdit]")
+    print(f"✓ {report.qobjects} QObjects, depth {report.max_depth}")
+
+
+def test_ranked_recommendations():
+    """Each kind of hint is found and sorted by estimated cost."""
+    print("\n=== Test 2: Ranked Recommendations ===")
+
+    report = analyze_performance(designer_root(items=250, hidden_widgets=80))
+    found = [(r.kind, r.name, r.estimated_cost) for r in report.recommendations]
+    assert found == [
+        ("model-view", "listWidget", 250),
+        ("lazy-tabs", "tabs", 81),
+        ("flatten", "outerLayout", 4),
+        ("flatten", "wrapper", 3),
+    ], found
+
+    assert report.redundant_layouts == [
+        "/ui/widget[Form]/layout[mainLayout]/item/widget[wrapper]",
+        "/ui/widget[Form]/layout[mainLayout]/item/layout[outerLayout]",
+    ]
+    assert report.large_item_widgets == [{
+        "name": "listWidget", "class": "QListWidget", "items": 250,
+        "path": "/ui/widget[Form]/layout[mainLayout]/item/widget[listWidget]"}]
+    assert "QListView" in report.recommendations[0].message
+
+    # Table headers count as items; thresholds are configurable
+    root = ET.fromstring('<ui version="4.0"><widget class="QTableWidget" name="table">'
+                         + "<row/>" * 10 + "<column/>" * 5 + '<item row="0" column="0"/>' * 50
+                         + "</widget></ui>")
+    assert analyze_performance(root).recommendations == []
+    assert [r.estimated_cost for r in analyze_performance(root, item_threshold=60).recommendations] == [65]
+    print(f"✓ {len(found)} recommendations, highest cost first")
+
+
+def test_no_false_positives():
+    """Real containers, small lists and light hidden pages are left alone."""
+    print("\n=== Test 3: No False Positives ===")
+
+    root = designer_root(items=99, hidden_widgets=10)
+    wrapper_layout = root.find(".//layout[@name='wrapperLayout']")
+    ET.SubElement(ET.SubElement(wrapper_layout, "item"), "widget", {"class": "QPushButton", "name": "goButton"})
+    outer = root.find(".//layout[@name='outerLayout']")
+    ET.SubElement(ET.SubElement(outer, "item"), "spacer", name="spacer")
+
+    report = analyze_performance(root)
+    assert report.recommendations == [] and report.redundant_layouts == []
+    assert report.static_items == 99
+
+    # The visible page doesn't count towards lazy loading
+    root = designer_root(hidden_widgets=80)
+    root.find(".//widget[@name='tabs']/property/number").text = "0"
+    assert [r.kind for r in analyze_performance(root).recommendations] == ["flatten", "flatten"]
+    print("✓ Multi-item layouts, small lists and the current page are not flagged")
+
+
+def test_entry_points():
+    """UIManager method and MCP tool."""
+    print("\n=== Test 4: UIManager And MCP Tool ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ui_file = Path(tmp) / "form.ui"
+        ET.ElementTree(designer_root(items=150)).write(ui_file, encoding="utf-8", xml_declaration=True)
+
+        report = UIManager(str(ui_file)).analyze_performance(item_threshold=200)
+        assert [r.kind for r in report.recommendations] == ["flatten", "flatten"]
+
+        result = analyze_ui_performance(str(ui_file))
+        assert result["status"] == "success"
+        assert result["qobjects"] == 14 and result["max_depth"] == 5
+        assert result["recommendations"][0]["kind"] == "model-view"
+        assert analyze_ui_performance(str(Path(tmp) / "missing.ui"))["status"] == "error"
+
+    print("✓ UIManager.analyze_performance and analyze_ui_performance agree")
+
+
+def main():
+    """Run all tests."""
+    test_counts()
+    test_ranked_recommendations()
+    test_no_false_positives()
+    test_entry_points()
+
+    print("\n✓ All performance advisor tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
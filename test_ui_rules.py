@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Test: UI Rule Engine
+
+Tests:
+1. Built-in rules on a parsed .ui model (no editor needed)
+2. Custom rules and severity overrides
+3. Single-pass dispatch by widget class
+4. Sweep-line overlap and out-of-bounds rules
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import ui_geometry
+from ui_geometry import intersection, overlapping_pairs
+from ui_manager import UIManager
+from ui_rules import RULES, Rule, RuleEngine, register_rule
+from ui_verifier import UIVerifier
+
+
+def create_form(path: Path, buttons: int = 4, width: int = 400):
+    """Dialog with default-named buttons placed without a layout."""
+    manager = UIManager()
+    manager.create_empty_ui("QDialog", "Dialog", width, 300)
+    for i in range(buttons):
+        manager.add_widget("QPushButton", f"pushButton_{i}", properties={
+            "text": "" if i == 0 else f"Button {i}",
+            "geometry": {"x": 10, "y": 10 + i * 40, "width": 100, "height": 30}
+        })
+    manager.add_widget("QLabel", "statusLabel", properties={"text": "Ready"})
+    manager.save(str(path))
+
+
+def test_builtin_rules():
+    """The original checks run against the .ui model."""
+    print("\n=== Test 1: Built-in Rules ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ui_file = Path(tmp) / "form.ui"
+        create_form(ui_file, buttons=6, width=150)
+        issues = UIVerifier()._analyze_ui_structure(ui_file)
+
+    rules = {issue["rule"] for issue in issues}
+    assert {"top-level-layout", "default-names", "window-size", "button-text"} <= rules
+    assert "empty-ui" not in rules and "window-title" not in rules
+
+    button = next(i for i in issues if i["rule"] == "button-text")
+    assert button["widget"] == "pushButton_0"
+    assert button["severity"] == "warning" and button["category"] == "content"
+
+    severities = [issue["severity"] for issue in issues]
+    assert severities == sorted(severities, key=["error", "warning", "info"].index)
+
+    print(f"✓ {len(issues)} findings: {', '.join(sorted(rules))}")
+
+
+def test_custom_rule_and_severities():
+    """Registered rules run by default; severities can be changed or turned off."""
+    print("\n=== Test 2: Custom Rules and Severities ===")
+
+    @register_rule
+    class LabelTextRule(Rule):
+        id = "test-label-text"
+        category = "content"
+        default_severity = "info"
+        node_types = ("QLabel",)
+
+        def visit(self, widget, context):
+            if widget.properties.get("text") == "Ready":
+                yield self.finding("Placeholder label text", widget=widget.name)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            ui_file = Path(tmp) / "form.ui"
+            create_form(ui_file)
+
+            findings = RuleEngine().run_file(str(ui_file))
+            assert any(f.rule == "test-label-text" and f.widget == "statusLabel" for f in findings)
+
+            findings = RuleEngine(severities={"button-text": "error", "test-label-text": "off"}).run_file(
+                str(ui_file))
+            assert findings[0].rule == "button-text" and findings[0].severity == "error"
+            assert not any(f.rule == "test-label-text" for f in findings)
+
+            verifier = UIVerifier(severities={"button-text": "error"})
+            report = verifier.create_verification_report({
+                "status": "success", "ui_file": str(ui_file),
+                "issues": verifier._analyze_ui_structure(ui_file)
+            })
+            assert "ERRORS:" in report
+
+            try:
+                RuleEngine(severities={"button-text": "fatal"})
+                assert False, "Unknown severities should be rejected"
+            except ValueError:
+                pass
+    finally:
+        RULES.pop("test-label-text", None)
+
+    print("✓ Custom rule registered, severities overridden")
+
+
+def test_single_pass_dispatch():
+    """Each widget is visited once, only by rules subscribed to its class."""
+    print("\n=== Test 3: Single-Pass Dispatch ===")
+
+    visits = []
+
+    class CountingRule(Rule):
+        id = "test-counting"
+        node_types = ("*Button",)
+
+        def visit(self, widget, context):
+            visits.append(widget.name)
+            return ()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ui_file = Path(tmp) / "form.ui"
+        create_form(ui_file, buttons=5)
+        engine = RuleEngine([CountingRule])
+        engine.run_file(str(ui_file))
+
+    assert sorted(visits) == [f"pushButton_{i}" for i in range(5)]
+    assert engine._dispatch == {"QDialog": [], "QPushButton": engine.rules, "QLabel": []}
+
+    print(f"✓ {len(visits)} visits, dispatch table: {sorted(engine._dispatch)}")
+
+
+def test_geometry_rules():
+    """Overlapping siblings and off-parent widgets; sweep matches brute force."""
+    print("\n=== Test 4: Overlap and Out-of-Bounds ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ui_file = Path(tmp) / "overlap.ui"
+        manager = UIManager()
+        manager.create_empty_ui("QDialog", "Dialog", 400, 300)
+        rects = {
+            "nameEdit": (10, 10, 200, 25),
+            "nameCombo": (150, 20, 100, 25),   # overlaps nameEdit
+            "okButton": (210, 10, 80, 25),     # touches nameEdit only
+            "offButton": (380, 280, 80, 30),   # partly outside
+            "lostLabel": (500, 10, 50, 20),    # fully outside
+        }
+        for name, (x, y, w, h) in rects.items():
+            manager.add_widget("QLabel", name, properties={
+                "text": name, "geometry": {"x": x, "y": y, "width": w, "height": h}})
+        manager.save(str(ui_file))
+
+        findings = RuleEngine(["widget-overlap", "out-of-bounds"]).run_file(str(ui_file))
+
+    overlaps = {(f.widget, f.details["other"]) for f in findings if f.rule == "widget-overlap"}
+    assert overlaps == {("nameEdit", "nameCombo"), ("nameCombo", "okButton")}
+    bounds = {f.widget: f.details for f in findings if f.rule == "out-of-bounds"}
+    assert set(bounds) == {"offButton", "lostLabel"}
+    assert bounds["offButton"]["overflow"] == {"right": 60, "bottom": 10}
+    assert bounds["lostLabel"]["fully_outside"] is True
+
+    rng = random.Random(7)
+    for _ in range(200):
+        rects = [(rng.randint(0, 60), rng.randint(0, 60), rng.randint(0, 25), rng.randint(0, 25))
+                 for _ in range(rng.randint(0, 30))]
+        brute = [(i, j) for i in range(len(rects)) for j in range(i + 1, len(rects))
+                 if intersection(rects[i], rects[j])]
+        assert overlapping_pairs(rects) == brute
+
+    grid = [(col * 60, row * 30, 50, 25) for row in range(100) for col in range(50)]
+    grid.append((55, 20, 100, 30))  # straddles four cells
+    touches = []
+    touch = ui_geometry._StabbingTree._touch
+
+    def counted_touch(tree, node, item, add):
+        touches.append(node)
+        touch(tree, node, item, add)
+
+    ui_geometry._StabbingTree._touch = counted_touch
+    try:
+        start = time.perf_counter()
+        pairs = overlapping_pairs(grid)
+        elapsed = time.perf_counter() - start
+    finally:
+        ui_geometry._StabbingTree._touch = touch
+    assert len(pairs) == 4
+    # Insert and remove touch at most 2 log2(coordinates) tree nodes each
+    bound = 2 * 2 * len(grid) * (2 * len(grid)).bit_length()
+    assert len(touches) <= bound < len(grid) ** 2 // 40
+
+    print(f"✓ Overlaps {sorted(overlaps)}, out of bounds {sorted(bounds)}")
+    print(f"✓ 5,001-rect sweep: {len(touches):,} tree updates "
+          f"(vs {len(grid) * (len(grid) - 1) // 2:,} pair checks) in {elapsed * 1000:.0f} ms")
+
+
+def main():
+    """Run all tests."""
+    test_builtin_rules()
+    test_custom_rule_and_severities()
+    test_single_pass_dispatch()
+    test_geometry_rules()
+
+    print("\n✓ All rule engine tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Test: .ui Schema Validator
+
+Tests:
+1. Designer-style files (layouts, custom widgets, palette, connections) pass
+2. Structural errors are located and reported
+3. UIManager.save(validate=True) refuses invalid trees
+4. Validation work (each element checked once) on a large tree
+"""
+
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import ui_schema
+from ui_manager import UIManager
+from ui_schema import SchemaValidationError, validate_ui
+
+
+DESIGNER_UI = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="geometry"><rect><x>0</x><y>0</y><width>400</width><height>300</height></rect></property>
+  <property name="windowTitle"><string notr="true">Form</string></property>
+  <layout class="QGridLayout" name="gridLayout" rowstretch="1,0">
+   <property name="spacing"><number>6</number></property>
+   <item row="0" column="0">
+    <widget class="QLabel" name="nameLabel">
+     <property name="text"><string>&amp;Name</string></property>
+     <property name="buddy"><cstring>nameEdit</cstring></property>
+     <property name="alignment"><set>Qt::AlignRight|Qt::AlignVCenter</set></property>
+    </widget>
+   </item>
+   <item row="0" column="1">
+    <widget class="ColorPicker" name="nameEdit">
+     <property name="palette">
+      <palette>
+       <active><colorrole role="Base"><brush brushstyle="SolidPattern"><color alpha="255"><red>255</red><green>0</green><blue>0</blue></color></brush></colorrole></active>
+       <inactive/>
+       <disabled/>
+      </palette>
+     </property>
+    </widget>
+   </item>
+   <item row="1" column="0" colspan="2">
+    <spacer name="verticalSpacer">
+     <property name="orientation"><enum>Qt::Vertical</enum></property>
+     <property name="sizeHint" stdset="0"><size><width>20</width><height>40</height></size></property>
+    </spacer>
+   </item>
+   <item row="2" column="0">
+    <widget class="QListWidget" name="listWidget">
+     <item><property name="text"><string>First</string></property></item>
+    </widget>
+   </item>
+  </layout>
+  <action name="actionOpen">
+   <property name="icon"><iconset theme="document-open"><normaloff>:/icons/open.png</normaloff></iconset></property>
+  </action>
+ </widget>
+ <customwidgets>
+  <customwidget><class>ColorPicker</class><extends>QLineEdit</extends><header location="global">colorpicker.h</header></customwidget>
+ </customwidgets>
+ <tabstops><tabstop>nameEdit</tabstop></tabstops>
+ <resources><include location="icons.qrc"/></resources>
+ <connections>
+  <connection><sender>nameEdit</sender><signal>textChanged(QString)</signal><receiver>Form</receiver><slot>update()</slot>
+   <hints><hint type="sourcelabel"><x>10</x><y>20</y></hint></hints>
+  </connection>
+ </connections>
+</ui>
+"""
+
+
+def messages(violations):
+    return {(v.severity, v.path, v.message) for v in violations}
+
+
+def test_valid_files():
+    """Designer output and UIManager output validate cleanly."""
+    print("\n=== Test 1: Valid Files ===")
+
+    assert validate_ui(ET.fromstring(DESIGNER_UI)) == []
+
+    manager = UIManager()
+    manager.create_empty_ui("QMainWindow", "MainWindow", 800, 600)
+    manager.add_widget("QPushButton", "okButton", properties={
+        "text": "OK", "enabled": True, "geometry": {"x": 10, "y": 10, "width": 80, "height": 25},
+        "font": {"_type": "font", "family": "Arial", "pointsize": 10, "bold": True},
+        "minimumSize": {"width": 80, "height": 25}})
+    manager.add_layout("QVBoxLayout", "mainLayout")
+    manager.add_connection("okButton", "clicked()", "MainWindow", "close()")
+    manager.set_tab_order(["okButton"])
+    manager.add_resource("icons.qrc")
+    assert manager.validate() == []
+    print("✓ Designer file and UIManager tree have no violations")
+
+
+def test_errors_located():
+    """Each kind of violation is reported at the right element."""
+    print("\n=== Test 2: Errors Located ===")
+
+    root = ET.fromstring(DESIGNER_UI)
+    form = root.find("widget")
+    form.find("property[@name='geometry']/rect/width").text = "wide"
+    form.find("property[@name='geometry']/rect").remove(form.find("property[@name='geometry']/rect/height"))
+    form.find("property[@name='windowTitle']").append(ET.fromstring("<string>Second</string>"))
+    form.set("stretch", "1")
+    ET.SubElement(ET.SubElement(form, "property", name="customProperty"), "custom").text = "x"
+    ET.SubElement(form, "widget", {"class": "QFancyWidget", "name": "fancy"})
+    ET.SubElement(ET.SubElement(form, "property", name="echoMode"), "string").text = "Password"
+    layout = form.find("layout")
+    ET.SubElement(layout, "spacer", name="looseSpacer")
+    root.remove(root.find("customwidgets"))
+
+    found = messages(validate_ui(root))
+    geometry = "/ui/widget[Form]/property[geometry]/rect"
+    expected = {
+        ("error", f"{geometry}/width", "<width> must contain int, got 'wide'"),
+        ("error", geometry, "<rect> is missing <height>"),
+        ("error", "/ui/widget[Form]/property[windowTitle]", "<property> needs exactly one value element, got 2"),
+        ("error", "/ui/widget[Form]", "Unexpected attribute 'stretch' on <widget>"),
+        ("error", "/ui/widget[Form]/property[customProperty]/custom", "Unexpected element <custom> in <property>"),
+        ("error", "/ui/widget[Form]/widget[fancy]",
+         "Unknown widget class 'QFancyWidget' (not declared in <customwidgets>)"),
+        ("error", "/ui/widget[Form]/layout[gridLayout]/item/widget[nameEdit]",
+         "Unknown widget class 'ColorPicker' (not declared in <customwidgets>)"),
+        ("warning", "/ui/widget[Form]/property[echoMode]", "Property 'echoMode' expects <enum>, got <string>"),
+        ("error", "/ui/widget[Form]/layout[gridLayout]/spacer[looseSpacer]",
+         "Unexpected element <spacer> in <layout>"),
+    }
+    assert found == expected, found ^ expected
+    print(f"✓ {len(found)} violations reported with their paths")
+
+
+def test_validate_on_save():
+    """Invalid trees are not written when validation is on."""
+    print("\n=== Test 3: Validate On Save ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "dialog.ui"
+        manager = UIManager(validate_on_save=True)
+        manager.create_empty_ui("QDialog", "Dialog")
+        manager.add_widget("QLabel", "label", properties={"text": {"_xml": "<strng>typo</strng>"}})
+
+        try:
+            manager.save(str(output))
+            raise AssertionError("save() should reject the tree")
+        except SchemaValidationError as e:
+            assert len(e.violations) == 1 and "<strng>" in str(e)
+        assert not output.exists()
+
+        # Per-call override, and warnings don't block
+        manager.save(str(output), validate=False)
+        assert output.exists()
+        manager.modify_property("label", "text", "fixed")
+        manager.modify_property("label", "echoMode", "Password")
+        manager.save(str(output))
+        assert [v.severity for v in manager.validate()] == ["warning"]
+
+    print("✓ Invalid tree rejected before writing; warnings pass")
+
+
+def test_validation_cost():
+    """Each element is checked at most once; timings next to serialization."""
+    print("\n=== Test 4: Validation Cost ===")
+
+    manager = UIManager()
+    manager.create_empty_ui("QDialog", "Dialog", 1200, 800)
+    for i in range(5000):
+        manager.add_widget("QLabel" if i % 2 else "QPushButton", f"widget{i}", properties={
+            "text": f"Item {i}", "enabled": True,
+            "geometry": {"x": i % 1000, "y": i // 10, "width": 80, "height": 20}})
+
+    checked = []
+    check_local = ui_schema._check_local
+
+    def counted_check(elem, *args):
+        checked.append(id(elem))
+        check_local(elem, *args)
+
+    ui_schema._check_local = counted_check
+    try:
+        violations = manager.validate()
+    finally:
+        ui_schema._check_local = check_local
+
+    elements = list(manager.root.iter())
+    assert violations == []
+    # Attribute/text checks run once per element that has any; typed leaf
+    # values (<string>, <number>, ...) are checked inline
+    assert len(checked) == len(set(checked))
+    assert len(checked) < sum(1 for e in elements if e.attrib or (e.text and not e.text.isspace()))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        manager.save(str(Path(tmp) / "large.ui"), validate=False)
+        save_time = time.perf_counter() - start
+    start = time.perf_counter()
+    manager.validate()
+    validate_time = time.perf_counter() - start
+    print(f"✓ {len(elements)} elements, {len(checked)} generic checks: "
+          f"validate {validate_time * 1000:.0f} ms, save {save_time * 1000:.0f} ms")
+
+
+def main():
+    """Run all tests."""
+    test_valid_files()
+    test_errors_located()
+    test_validate_on_save()
+    test_validation_cost()
+
+    print("\n✓ All schema validator tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test: Verification Result Cache
+
+Tests:
+1. Content key covers referenced assets (icons, .qrc files)
+2. Re-verifying an unchanged file returns the cached result; malformed files
+   return an error result
+3. LRU and age eviction
+"""
+
+import base64
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from image_utils import encode_png
+from ui_manager import UIManager
+from ui_verifier import UIVerifier
+from verification_cache import VerificationCache, asset_paths, content_hash
+
+
+def create_ui(path: Path, title: str = "Dialog"):
+    """Dialog with a pixmap label and a resource file include."""
+    manager = UIManager()
+    manager.create_empty_ui("QDialog", "Dialog", 400, 300)
+    manager.add_widget("QLabel", "titleLabel", properties={
+        "text": title, "geometry": {"x": 10, "y": 10, "width": 200, "height": 20}})
+    manager.add_widget("QLabel", "logoLabel")
+    manager.save(str(path))
+
+    # Designer's form of a pixmap property and a resource include
+    text = path.read_text(encoding="utf-8")
+    text = text.replace('name="logoLabel" />', 'name="logoLabel"><property name="pixmap">'
+                        '<pixmap>icons/logo.png</pixmap></property></widget>')
+    text = text.replace("</ui>", '<resources><include location="app.qrc"/></resources></ui>')
+    path.write_text(text, encoding="utf-8")
+
+
+class CountingClient:
+    """Editor client stub that counts renders."""
+
+    def __init__(self):
+        frame = np.full((300, 400, 4), 235, dtype=np.uint8)
+        self.png = encode_png(frame)
+        self.renders = 0
+
+    def ping(self):
+        return True
+
+    def render_ui(self, ui_file, geometry=False, transport="base64"):
+        self.renders += 1
+        return {"status": "success", "width": 400, "height": 300,
+                "screenshot_base64": base64.b64encode(self.png).decode("ascii"),
+                "geometry": {"width": 400, "height": 300, "widgets": []}}
+
+
+def test_asset_key():
+    """Editing an icon or a .qrc-listed file changes the key."""
+    print("\n=== Test 1: Asset-Aware Content Key ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "icons").mkdir()
+        (tmp / "icons" / "logo.png").write_bytes(b"logo v1")
+        (tmp / "icons" / "open.png").write_bytes(b"open v1")
+        (tmp / "app.qrc").write_text(
+            '<RCC><qresource prefix="/"><file>icons/open.png</file></qresource></RCC>', encoding="utf-8")
+        ui_file = tmp / "dialog.ui"
+        create_ui(ui_file)
+
+        names = sorted(os.path.relpath(p, tmp) for p in asset_paths(str(ui_file)))
+        assert names == ["app.qrc", os.path.join("icons", "logo.png"), os.path.join("icons", "open.png")]
+
+        keys = [content_hash(str(ui_file))]
+        assert content_hash(str(ui_file)) == keys[0]
+        (tmp / "icons" / "logo.png").write_bytes(b"logo v2")
+        keys.append(content_hash(str(ui_file)))
+        (tmp / "icons" / "open.png").write_bytes(b"open v2")
+        keys.append(content_hash(str(ui_file)))
+        (tmp / "icons" / "open.png").unlink()
+        keys.append(content_hash(str(ui_file)))
+
+    assert len(set(keys)) == 4
+    print(f"✓ {len(names)} assets tracked, every asset edit changes the key")
+
+
+def test_cached_verification():
+    """Unchanged file, rules and render params: no render on the second call."""
+    print("\n=== Test 2: Cached Verification ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        ui_file = tmp / "dialog.ui"
+        create_ui(ui_file)
+        cache = VerificationCache(str(tmp / "cache"))
+        client = CountingClient()
+
+        verifier = UIVerifier(cache=cache)
+        verifier.client = client
+        first = verifier.verify_ui(str(ui_file))
+
+        start = time.perf_counter()
+        second = verifier.verify_ui(str(ui_file))
+        elapsed = time.perf_counter() - start
+
+        assert first["cached"] is False and second["cached"] is True
+        assert client.renders == 1
+        assert second["issues"] == first["issues"]
+        assert second["screenshot_base64"] == first["screenshot_base64"]
+        assert Path(second["screenshot_path"]).exists()
+
+        # Different ruleset or edited file: re-render
+        strict = UIVerifier(severities={"window-title": "error"}, cache=cache)
+        strict.client = client
+        assert strict.verify_ui(str(ui_file))["cached"] is False
+        create_ui(ui_file, title="Edited")
+        assert verifier.verify_ui(str(ui_file))["cached"] is False
+        assert client.renders == 3
+
+        # Truncated file: error result, no exception and no render
+        ui_file.write_text(ui_file.read_text(encoding="utf-8")[:120], encoding="utf-8")
+        broken = verifier.verify_ui(str(ui_file))
+        assert broken["status"] == "error" and "Failed to load UI" in broken["message"]
+        assert client.renders == 3
+
+    print(f"✓ Cache hit in {elapsed * 1000:.1f} ms; ruleset and content changes miss")
+
+
+def test_eviction():
+    """Least recently used entries go first; expired entries are dropped."""
+    print("\n=== Test 3: Eviction ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = VerificationCache(tmp, max_entries=3, max_age=None)
+        keys = [f"{i:02x}" * 32 for i in range(5)]
+        for i, key in enumerate(keys[:3]):
+            cache.put(key, {"n": i}, b"png")
+            os.utime(cache._paths(key)[0], (1000 + i, 1000 + i))
+
+        assert cache.get(keys[0]) is not None  # refresh the oldest entry
+        cache.put(keys[3], {"n": 3})
+        remaining = {key for key, _, _ in cache.entries()}
+        assert remaining == {keys[0], keys[2], keys[3]}
+        assert not cache._paths(keys[1])[1].exists()
+
+        aging = VerificationCache(tmp, max_entries=10, max_age=60)
+        os.utime(cache._paths(keys[2])[0], (time.time() - 120, time.time() - 120))
+        assert aging.get(keys[2]) is None
+        aging.put(keys[4], {"n": 4})
+        assert {key for key, _, _ in aging.entries()} == {keys[0], keys[3], keys[4]}
+
+    print("✓ LRU and max-age eviction")
+
+
+def main():
+    """Run all tests."""
+    test_asset_key()
+    test_cached_verification()
+    test_eviction()
+
+    print("\n✓ All verification cache tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Test: Pixel-level Visual Comparison
+
+Tests the NumPy comparison stage on synthetic frames:
+1. PNG encode/decode round trip; loading base64, data URI and path sources
+2. Identical frames
+3. Changed region detection
+4. Size mismatch handling
+5. Built-in decoder on full-HD Paeth/Average filtered PNGs (wavefront, no row loop)
+6. Rendering through shared memory, with PNG fallback
+"""
+
+import base64
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+import image_utils
+from golden_store import GoldenImageStore
+from image_utils import PNG_SIGNATURE, _decode_png_numpy, encode_png, decode_png, load_image
+from visual_comparator import VisualComparator
+
+
+def make_frame(width: int = 320, height: int = 240) -> np.ndarray:
+    """Create a gray dialog-like frame with a button."""
+    frame = np.full((height, width, 4), 230, dtype=np.uint8)
+    frame[:, :, 3] = 255
+    frame[180:210, 200:300, :3] = (70, 130, 180)
+    return frame
+
+
+def test_png_round_trip():
+    """Encoded frames decode to identical pixels."""
+    print("\n=== Test 1: PNG Round Trip ===")
+
+    frame = make_frame()
+    decoded = decode_png(encode_png(frame))
+
+    assert decoded.shape == frame.shape
+    assert np.array_equal(decoded, frame)
+
+    # Full-size screenshot as the editor sends it: base64 text far longer
+    # than any file name, plain or as a data URI, and the same PNG on disk
+    screenshot = make_frame(1920, 1080)
+    screenshot[::5, ::5, :3] = np.arange(384 * 216 * 3, dtype=np.uint32).reshape(216, 384, 3) % 251
+    png = encode_png(screenshot)
+    text = base64.b64encode(png).decode("ascii")
+    assert len(text) > 4096
+    assert np.array_equal(load_image(text), screenshot)
+    assert np.array_equal(load_image("data:image/png;base64," + text), screenshot)
+    assert np.array_equal(load_image("\n" + text), screenshot)  # wrapped text skips the prefix check
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "screenshot.png"
+        path.write_bytes(png)
+        assert np.array_equal(load_image(str(path)), screenshot)
+        assert np.array_equal(load_image(path), screenshot)
+    print(f"✓ PNG round trip preserves pixels; {len(text):,}-character base64 screenshot loads")
+
+
+def test_identical_frames():
+    """Identical frames have SSIM 1 and no changed regions."""
+    print("\n=== Test 2: Identical Frames ===")
+
+    comparator = VisualComparator()
+    result = comparator.compare_images(make_frame(), make_frame())
+
+    assert result.ssim > 0.999
+    assert result.changed_ratio == 0.0
+    assert result.changed_regions == []
+    print(f"✓ SSIM: {result.ssim:.4f}, no changed regions")
+
+
+def test_changed_region():
+    """A moved button is reported as changed regions."""
+    print("\n=== Test 3: Changed Region ===")
+
+    reference = make_frame()
+    target = make_frame()
+    target[20:50, 40:140, :3] = (200, 40, 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        heatmap_path = str(Path(tmp) / "heatmap.png")
+        comparator = VisualComparator()
+        result = comparator.compare_images(encode_png(reference), encode_png(target),
+                                           heatmap_path=heatmap_path)
+
+        assert Path(heatmap_path).exists()
+        assert decode_png(Path(heatmap_path).read_bytes()).shape == reference.shape
+
+    assert result.ssim < 1.0
+    assert result.changed_regions == [(40, 20, 100, 30)]
+    print(f"✓ Changed regions: {result.changed_regions}")
+    print(comparator.generate_report(result))
+
+
+def test_size_mismatch():
+    """Frames of different size are compared on a shared canvas."""
+    print("\n=== Test 4: Size Mismatch ===")
+
+    comparator = VisualComparator()
+    result = comparator.compare_images(make_frame(320, 240), make_frame(360, 240))
+
+    assert not result.size_match
+    assert result.changed_regions[0] == (320, 0, 40, 240)
+    print(f"✓ Size mismatch detected: {result.reference_size} → {result.target_size}")
+
+
+def encode_filtered_png(image: np.ndarray, filters: np.ndarray) -> bytes:
+    """Encode RGBA scanlines with the given filter types (as libpng/Qt do)."""
+    height = image.shape[0]
+    x = image.astype(np.int16)
+    left = np.zeros_like(x)
+    left[:, 1:] = x[:, :-1]
+    up = np.zeros_like(x)
+    up[1:] = x[:-1]
+    up_left = np.zeros_like(x)
+    up_left[1:, 1:] = x[:-1, :-1]
+    pa, pb, pc = np.abs(up - up_left), np.abs(left - up_left), np.abs(left + up - 2 * up_left)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+    predictions = np.stack([np.zeros_like(x), left, up, (left + up) >> 1, paeth])
+    filtered = ((x - predictions[filters, np.arange(height)]) & 0xFF).astype(np.uint8)
+    raw = np.concatenate([filters.astype(np.uint8)[:, None], filtered.reshape(height, -1)], axis=1)
+
+    def chunk(chunk_type: bytes, payload: bytes) -> bytes:
+        crc = zlib.crc32(chunk_type + payload) & 0xFFFFFFFF
+        return struct.pack(">I", len(payload)) + chunk_type + payload + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", image.shape[1], height, 8, 6, 0, 0, 0)
+    return PNG_SIGNATURE + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw.tobytes())) \
+        + chunk(b"IEND", b"")
+
+
+def test_filtered_full_hd_decode():
+    """Paeth and Average rows decode correctly and quickly without Pillow."""
+    print("\n=== Test 5: Full-HD Filtered PNG Decode ===")
+
+    rng = np.random.default_rng(7)
+    frame = make_frame(1920, 1080)
+    frame[::7, ::3, :3] = rng.integers(0, 256, frame[::7, ::3, :3].shape, dtype=np.uint8)
+
+    calls = []
+    originals = {name: getattr(image_utils, name) for name in ("_unfilter_row", "_unfilter_diagonals")}
+
+    def counted(name):
+        def wrapper(*args):
+            calls.append(name)
+            return originals[name](*args)
+        return wrapper
+
+    timings = {}
+    for label, filters in (("paeth", np.full(1080, 4)), ("average", np.full(1080, 3)),
+                           ("mixed", rng.integers(0, 5, 1080)), ("sub-up", rng.integers(0, 3, 1080))):
+        png = encode_filtered_png(frame, filters)
+        for name in originals:
+            setattr(image_utils, name, counted(name))
+        try:
+            start = time.perf_counter()
+            decoded = _decode_png_numpy(png)
+            timings[label] = time.perf_counter() - start
+        finally:
+            for name, function in originals.items():
+                setattr(image_utils, name, function)
+        assert np.array_equal(decoded, frame), label
+
+    # Average/Paeth images are unfiltered in one wavefront pass, not row by row
+    assert calls == ["_unfilter_diagonals"] * 3 + ["_unfilter_row"] * 1080, calls[:5]
+    print("✓ 1920x1080 decoded: " + ", ".join(f"{k} {v:.2f} s" for k, v in timings.items()))
+
+
+class SharedMemoryClient:
+    """Editor client exporting frames into shared memory (or not at all)."""
+
+    def __init__(self, frame, export: bool = True):
+        self.frame = frame
+        self.export = export
+        self.calls = []
+        self.released = []
+
+    def release_frame(self, name):
+        self.released.append(name)
+        return {"status": "success", "released": False}
+
+    def render_ui(self, ui_file, geometry=False, transport="base64"):
+        self.calls.append(transport)
+        height, width = self.frame.shape[:2]
+        response = {"status": "success", "width": width, "height": height}
+        if transport != "shm":
+            response["screenshot_base64"] = base64.b64encode(encode_png(self.frame)).decode("ascii")
+            return response
+        if self.export:
+            segment = shared_memory.SharedMemory(create=True, size=self.frame.nbytes)
+            segment.buf[:self.frame.nbytes] = self.frame.tobytes()
+            name = segment.name
+            segment.close()
+        else:
+            name = "qtlive_missing_segment"  # exported where this process can't see it
+        response["frame"] = {"shm": name, "width": width, "height": height,
+                             "stride": width * 4, "format": "rgba8888"}
+        return response
+
+
+def test_shared_memory_render():
+    """Frames arrive as raw RGBA; unreachable segments fall back to PNG."""
+    print("\n=== Test 6: Shared-Memory Render ===")
+
+    frame = make_frame()
+    with tempfile.TemporaryDirectory() as tmp:
+        ui_file = Path(tmp) / "dialog.ui"
+        ui_file.write_text('<ui version="4.0"/>', encoding="utf-8")
+        store = GoldenImageStore(str(Path(tmp) / "golden"))
+
+        client = SharedMemoryClient(frame)
+        comparator = VisualComparator(client=client, store=store)
+        assert np.array_equal(comparator.render(str(ui_file)), frame)
+        assert client.calls == ["shm"]
+        assert np.array_equal(decode_png(store.get(str(ui_file), {"renderer": "offscreen"})), frame)
+
+        client = SharedMemoryClient(frame, export=False)
+        comparator = VisualComparator(client=client)
+        assert np.array_equal(comparator.render(str(ui_file)), frame)
+        assert client.calls == ["shm", "base64"]
+        assert client.released == ["qtlive_missing_segment"]
+
+        # Shared memory is not retried once it failed
+        assert np.array_equal(comparator.render(str(ui_file)), frame)
+        assert client.calls == ["shm", "base64", "base64"]
+
+    print("✓ Rendered without PNG decode; missing segment re-rendered as PNG")
+
+
+def main():
+    """Run all tests."""
+    test_png_round_trip()
+    test_identical_frames()
+    test_changed_region()
+    test_size_mismatch()
+    test_filtered_full_hd_decode()
+    test_shared_memory_render()
+
+    print("\n✓ All visual comparison tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Tree Edit Distance - Structural similarity of .ui hierarchies
+
+Zhang–Shasha ordered tree edit distance over the widget/layout hierarchy.
+Nodes are labelled by tag and class only, so renamed widgets still match.
+
+Shortcuts that keep large UIs fast:
+- equal root hashes return 0 immediately
+- subtrees that occur identically in both trees are collapsed into single
+  weighted leaves before running Zhang–Shasha (distance becomes an upper
+  bound, exact when nothing is collapsed)
+- a label-histogram lower bound rejects pairs above max_distance without
+  running the DP
+- trees still larger than max_nodes use a top-down (Selkow) distance
+"""
+
+import hashlib
+import xml.etree.ElementTree as ET
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+# Elements that form the structural hierarchy
+STRUCTURE_TAGS = ("widget", "layout", "item", "spacer")
+
+# Largest collapsed tree size (nodes per tree) handled by Zhang–Shasha
+DEFAULT_MAX_NODES = 300
+
+
+@dataclass
+class TreeNode:
+    """Node of the structural tree."""
+    label: str
+    children: List["TreeNode"] = field(default_factory=list)
+    weight: int = 1  # number of original nodes in this subtree
+    hash: str = ""
+
+
+@dataclass
+class TreeDistanceResult:
+    """Result of a tree edit distance comparison."""
+    distance: float
+    similarity: float  # 0.0 to 1.0
+    reference_nodes: int
+    target_nodes: int
+    method: str  # "identical", "zhang-shasha", "top-down" or "lower-bound"
+    exact: bool
+
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "distance": self.distance,
+            "similarity": self.similarity,
+            "reference_nodes": self.reference_nodes,
+            "target_nodes": self.target_nodes,
+            "method": self.method,
+            "exact": self.exact
+        }
+
+
+def _structural_children(element: ET.Element):
+    """Structural child elements; <item> wrappers are transparent."""
+    for child in element:
+        if child.tag == "item":
+            yield from _structural_children(child)
+        elif child.tag in STRUCTURE_TAGS:
+            yield child
+
+
+def build_tree(element: ET.Element) -> TreeNode:
+    """
+    Build the structural tree of a .ui document.
+
+    Args:
+        element: <ui> root (or any element)
+
+    Returns:
+        Root TreeNode (synthetic "ui" node above the top-level widget)
+    """
+    root = TreeNode("ui")
+    stack = [(element, root)]
+    while stack:
+        elem, node = stack.pop()
+        for child in _structural_children(elem):
+            label = f"{child.tag}:{child.get('class', '')}"
+            if child.tag == "spacer":
+                orientation = child.find("property[@name='orientation']/enum")
+                label = f"spacer:{orientation.text if orientation is not None else ''}"
+            sub = TreeNode(label)
+            node.children.append(sub)
+            stack.append((child, sub))
+
+    _hash_tree(root)
+    return root
+
+
+def _postorder(root: TreeNode) -> List[TreeNode]:
+    """Nodes in post-order (iterative)."""
+    order = []
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(node.children))
+    return order
+
+
+def _hash_tree(root: TreeNode):
+    """Fill subtree hashes and weights bottom-up."""
+    for node in _postorder(root):
+        digest = hashlib.blake2b(node.label.encode("utf-8"), digest_size=12)
+        for child in node.children:
+            digest.update(child.hash.encode("ascii"))
+        digest.update(b")")
+        node.hash = digest.hexdigest()
+        node.weight = 1 + sum(child.weight for child in node.children)
+
+
+def _hash_counts(root: TreeNode) -> Counter:
+    return Counter(node.hash for node in _postorder(root))
+
+
+def _collapse(root: TreeNode, shared: set) -> TreeNode:
+    """Copy of the tree with maximal shared subtrees replaced by weighted leaves."""
+    if root.hash in shared and root.children:
+        return TreeNode(f"#{root.hash}", weight=root.weight, hash=root.hash)
+    copy = TreeNode(root.label, weight=root.weight, hash=root.hash)
+    copy.children = [_collapse(child, shared) for child in root.children]
+    return copy
+
+
+def _label_lower_bound(a: TreeNode, b: TreeNode) -> int:
+    """Lower bound: each edit fixes at most one label mismatch on each side."""
+    labels_a = Counter(node.label for node in _postorder(a))
+    labels_b = Counter(node.label for node in _postorder(b))
+    only_a = sum((labels_a - labels_b).values())
+    only_b = sum((labels_b - labels_a).values())
+    return max(only_a, only_b)
+
+
+def _own_cost(node: TreeNode) -> int:
+    """Insert/delete cost of a single node: its weight minus its children's."""
+    return node.weight - sum(child.weight for child in node.children)
+
+
+def _rename_cost(a: TreeNode, b: TreeNode) -> float:
+    if a.hash == b.hash:
+        return 0.0
+    collapsed_a = a.label.startswith("#")
+    collapsed_b = b.label.startswith("#")
+    if collapsed_a or collapsed_b:
+        # Collapsed subtrees can only be mapped as a whole: delete + insert
+        return float(a.weight + b.weight)
+    return 0.0 if a.label == b.label else 1.0
+
+
+def zhang_shasha(a: TreeNode, b: TreeNode) -> float:
+    """
+    Zhang–Shasha tree edit distance.
+
+    Insert/delete cost is 1 per node (the full size for a collapsed leaf);
+    rename cost is 0/1 by label.
+    """
+    nodes_a, nodes_b = _postorder(a), _postorder(b)
+    lmd_a, keyroots_a = _leftmost(nodes_a)
+    lmd_b, keyroots_b = _leftmost(nodes_b)
+    size_a, size_b = len(nodes_a), len(nodes_b)
+    weight_a = [_own_cost(node) for node in nodes_a]
+    weight_b = [_own_cost(node) for node in nodes_b]
+
+    treedist = [[0.0] * size_b for _ in range(size_a)]
+
+    for i in keyroots_a:
+        for j in keyroots_b:
+            li, lj = lmd_a[i], lmd_b[j]
+            rows, cols = i - li + 2, j - lj + 2
+            forest = [[0.0] * cols for _ in range(rows)]
+            for x in range(1, rows):
+                forest[x][0] = forest[x - 1][0] + weight_a[li + x - 1]
+            for y in range(1, cols):
+                forest[0][y] = forest[0][y - 1] + weight_b[lj + y - 1]
+
+            for x in range(1, rows):
+                ni = li + x - 1
+                row, prev = forest[x], forest[x - 1]
+                del_cost = weight_a[ni]
+                for y in range(1, cols):
+                    nj = lj + y - 1
+                    delete = prev[y] + del_cost
+                    insert = row[y - 1] + weight_b[nj]
+                    if lmd_a[ni] == li and lmd_b[nj] == lj:
+                        rename = prev[y - 1] + _rename_cost(nodes_a[ni], nodes_b[nj])
+                        best = min(delete, insert, rename)
+                        row[y] = best
+                        treedist[ni][nj] = best
+                    else:
+                        px = lmd_a[ni] - li
+                        py = lmd_b[nj] - lj
+                        row[y] = min(delete, insert, forest[px][py] + treedist[ni][nj])
+
+    return treedist[size_a - 1][size_b - 1]
+
+
+def _leftmost(nodes: List[TreeNode]) -> Tuple[List[int], List[int]]:
+    """Leftmost leaf descendant indices and keyroots for post-ordered nodes."""
+    index = {id(node): i for i, node in enumerate(nodes)}
+    lmd = [0] * len(nodes)
+    for i, node in enumerate(nodes):
+        lmd[i] = lmd[index[id(node.children[0])]] if node.children else i
+
+    seen = {}
+    for i, leftmost in enumerate(lmd):
+        seen[leftmost] = i  # highest node per leftmost leaf
+    return lmd, sorted(seen.values())
+
+
+def top_down_distance(a: TreeNode, b: TreeNode, _memo: Optional[Dict] = None) -> float:
+    """
+    Selkow top-down distance (upper bound of the edit distance).
+
+    Roots are renamed, children aligned by sequence edit distance where
+    substituting two subtrees costs their own top-down distance.
+    """
+    if a.hash == b.hash:
+        return 0.0
+    memo = {} if _memo is None else _memo
+    key = (id(a), id(b))
+    if key in memo:
+        return memo[key]
+
+    if a.label.startswith("#") or b.label.startswith("#"):
+        cost = float(a.weight + b.weight)
+        memo[key] = cost
+        return cost
+
+    cost = 0.0 if a.label == b.label else 1.0
+    ca, cb = a.children, b.children
+    prev = [0.0] * (len(cb) + 1)
+    for y, child in enumerate(cb, 1):
+        prev[y] = prev[y - 1] + child.weight
+    for child_a in ca:
+        row = [prev[0] + child_a.weight] + [0.0] * len(cb)
+        for y, child_b in enumerate(cb, 1):
+            row[y] = min(prev[y] + child_a.weight,
+                         row[y - 1] + child_b.weight,
+                         prev[y - 1] + top_down_distance(child_a, child_b, memo))
+        prev = row
+
+    memo[key] = cost + prev[-1]
+    return memo[key]
+
+
+def tree_distance(a: TreeNode, b: TreeNode, max_distance: Optional[float] = None,
+                  max_nodes: int = DEFAULT_MAX_NODES) -> TreeDistanceResult:
+    """
+    Tree edit distance with hashing shortcuts and pruning.
+
+    Args:
+        a: Reference tree
+        b: Target tree
+        max_distance: Stop early (lower bound) if the distance must exceed this
+        max_nodes: Collapsed size above which the top-down distance is used
+
+    Returns:
+        TreeDistanceResult
+    """
+    size_a, size_b = a.weight, b.weight
+    norm = float(max(size_a, size_b, 1))
+
+    def result(distance, method, exact):
+        return TreeDistanceResult(distance=distance,
+                                  similarity=max(0.0, 1.0 - distance / norm),
+                                  reference_nodes=size_a, target_nodes=size_b,
+                                  method=method, exact=exact)
+
+    if a.hash == b.hash:
+        return result(0.0, "identical", True)
+
+    if max_distance is not None:
+        bound = max(abs(size_a - size_b), _label_lower_bound(a, b))
+        if bound > max_distance:
+            return result(float(bound), "lower-bound", False)
+
+    shared = set(_hash_counts(a)) & set(_hash_counts(b))
+    small_a, small_b = _collapse(a, shared), _collapse(b, shared)
+    nodes_a, nodes_b = len(_postorder(small_a)), len(_postorder(small_b))
+    exact = nodes_a + nodes_b == size_a + size_b
+
+    if max(nodes_a, nodes_b) <= max_nodes:
+        return result(zhang_shasha(small_a, small_b), "zhang-shasha", exact)
+    return result(top_down_distance(small_a, small_b), "top-down", False)
+
+
+def tree_similarity(reference_ui: str, target_ui: str,
+                    max_distance: Optional[float] = None,
+                    max_nodes: int = DEFAULT_MAX_NODES) -> TreeDistanceResult:
+    """
+    Structural similarity of two .ui files.
+
+    Args:
+        reference_ui: Reference .ui file path
+        target_ui: Target .ui file path
+        max_distance: Optional pruning threshold
+        max_nodes: Collapsed size above which the top-down distance is used
+
+    Returns:
+        TreeDistanceResult
+    """
+    reference = build_tree(ET.parse(reference_ui).getroot())
+    target = build_tree(ET.parse(target_ui).getroot())
+    return tree_distance(reference, target, max_distance=max_distance, max_nodes=max_nodes)
+
+
+def main():
+    """Print the tree edit distance between two .ui files."""
+    import sys
+    import json
+
+    if len(sys.argv) < 3:
+        print("Usage: python tree_edit_distance.py <reference.ui> <target.ui>")
+        sys.exit(1)
+
+    result = tree_similarity(sys.argv[1], sys.argv[2])
+    print(json.dumps(result.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
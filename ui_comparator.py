@@ -6,12 +6,20 @@ Analyzes reference UI and compares with target UI to verify similarity.
 """
 
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Tuple, Optional, TextIO
+from dataclasses import dataclass, field
+import hashlib
 import json
 
 
+# Parsed widget models shared across comparators, keyed by file content hash.
+# Models are treated as read-only once cached.
+_MODEL_CACHE: "OrderedDict[str, Dict[str, WidgetInfo]]" = OrderedDict()
+MODEL_CACHE_SIZE = 64
+
+
 @dataclass
 class WidgetInfo:
     """Widget information extracted from UI."""
@@ -21,6 +29,10 @@ class WidgetInfo:
     properties: Dict[str, Any]
     parent: Optional[str] = None
     children: List[str] = None
+    depth: int = 0
+    content_hash: str = ""  # type, geometry and properties (name excluded)
+    subtree_hash: str = ""  # name + content_hash + children's subtree hashes
+    layout: Optional[str] = None  # class of the layout managing this widget
 
     def __post_init__(self):
         if self.children is None:
@@ -36,6 +48,7 @@ class ComparisonResult:
     extra_widgets: List[str]
     property_differences: Dict[str, Dict[str, Any]]
     layout_differences: List[str]
+    renamed_widgets: Dict[str, str] = field(default_factory=dict)  # reference -> target name
 
     def to_dict(self):
         """Convert to dictionary for JSON serialization."""
@@ -45,16 +58,172 @@ class ComparisonResult:
             "missing_widgets": self.missing_widgets,
             "extra_widgets": self.extra_widgets,
             "property_differences": self.property_differences,
-            "layout_differences": self.layout_differences
+            "layout_differences": self.layout_differences,
+            "renamed_widgets": self.renamed_widgets
         }
 
 
+class ComparisonSummary:
+    """
+    Running summary of streamed comparison events.
+
+    Memory is bounded by sample_size and chunk_size, not by the number of
+    widgets: only counters, a few sample names and one chunk of pending
+    profile-scored pairs are kept.
+    """
+
+    def __init__(self, reference_count: int, target_count: int, profile: Optional[Any] = None,
+                 total_weight: Optional[float] = None, sample_size: int = 20, chunk_size: int = 1024):
+        """
+        Initialize summary.
+
+        Args:
+            reference_count: Number of reference widgets
+            target_count: Number of target widgets
+            profile: Optional ScoringProfile
+            total_weight: Profile type weight of all reference widgets
+            sample_size: Widget names kept per category
+            chunk_size: Matched pairs scored per profile batch
+        """
+        self.reference_count = reference_count
+        self.target_count = target_count
+        self.profile = profile
+        self.total_weight = total_weight
+        self.sample_size = sample_size
+        self.chunk_size = chunk_size
+        self.counts = {"match": 0, "changed": 0, "missing": 0, "extra": 0, "renamed": 0}
+        self.changed_properties: Dict[str, int] = {}
+        self.samples: Dict[str, List[str]] = {"changed": [], "missing": [], "extra": [], "renamed": []}
+        self._matched_weight = 0.0
+        self._weighted_penalty = 0.0
+        self._chunk: List[Tuple["WidgetInfo", "WidgetInfo"]] = []
+
+    def add(self, kind: str, name: Optional[str], target_name: Optional[str],
+            diffs: Dict[str, Any], pair: Optional[Tuple["WidgetInfo", "WidgetInfo"]] = None):
+        """
+        Account for one comparison event.
+
+        pair holds the matched (reference, target) WidgetInfo objects and is
+        only needed for profile scoring.
+        """
+        self.counts[kind] += 1
+        sample_name = target_name if kind == "extra" else name
+        if kind in self.samples and len(self.samples[kind]) < self.sample_size:
+            self.samples[kind].append(sample_name)
+
+        if kind in ("match", "changed"):
+            if target_name != name:
+                self.counts["renamed"] += 1
+                if len(self.samples["renamed"]) < self.sample_size:
+                    self.samples["renamed"].append(f"{name} -> {target_name}")
+            for section, values in diffs.items():
+                keys = values.keys() if section in ("geometry", "properties") else (section,)
+                for key in keys:
+                    self.changed_properties[key] = self.changed_properties.get(key, 0) + 1
+            if self.profile is not None and pair is not None:
+                self._chunk.append(pair)
+                if len(self._chunk) >= self.chunk_size:
+                    self._flush()
+
+    def _flush(self):
+        if self._chunk:
+            weight, penalty = self.profile.partial_score([r for r, _ in self._chunk],
+                                                         [t for _, t in self._chunk])
+            self._matched_weight += weight
+            self._weighted_penalty += penalty
+            self._chunk = []
+
+    def similarity(self) -> float:
+        """Similarity score, equal to compare()'s for the same events."""
+        total = self.reference_count
+        if total == 0:
+            return 0.0
+        if self.profile is not None:
+            self._flush()
+            return self.profile.combine(self.total_weight or 0.0,
+                                        self._matched_weight, self._weighted_penalty)
+        matched = self.counts["match"] + self.counts["changed"]
+        matching_score = matched / total
+        property_score = 1.0 - (self.counts["changed"] / max(matched, 1))
+        return (matching_score * 0.7) + (property_score * 0.3)
+
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "similarity_score": self.similarity(),
+            "reference_widgets": self.reference_count,
+            "target_widgets": self.target_count,
+            "counts": dict(self.counts),
+            "changed_properties": dict(sorted(self.changed_properties.items(),
+                                              key=lambda item: (-item[1], item[0]))),
+            "samples": self.samples
+        }
+
+
+def _digest(payload: Any) -> str:
+    """Stable short hash of a JSON-serializable value."""
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def compute_subtree_hashes(widgets: Dict[str, WidgetInfo]):
+    """
+    Fill content_hash and subtree_hash of every widget, bottom-up.
+
+    widgets must be in document (pre-order) order, so walking it in reverse
+    visits every child before its parent. Equal subtree hashes mean equal
+    names, types, geometry and properties for the whole branch, which makes
+    them usable as cache keys outside the comparator too.
+    """
+    for widget in reversed(list(widgets.values())):
+        widget.content_hash = _digest([widget.type, widget.geometry, widget.properties])
+        children = [widgets[child].subtree_hash for child in widget.children if child in widgets]
+        widget.subtree_hash = _digest([widget.name, widget.content_hash, children])
+
+
+def root_hash(widgets: Dict[str, WidgetInfo]) -> str:
+    """Hash of the whole widget model (subtree hashes of all roots)."""
+    return _digest([w.subtree_hash for w in widgets.values()
+                    if w.parent is None or w.parent not in widgets])
+
+
+def load_scoring_profile(profile: Optional[Any]):
+    """
+    Normalize a scoring profile argument (see scoring_profile.load_profile).
+
+    scoring_profile needs NumPy, so it is only imported when a profile is
+    given; plain comparisons need nothing beyond the standard library.
+
+    Args:
+        profile: None, a ScoringProfile, a dict, or a JSON file path
+
+    Returns:
+        ScoringProfile or None
+    """
+    if profile is None:
+        return None
+    from scoring_profile import load_profile
+    return load_profile(profile)
+
+
 class UIComparator:
     """Compares UI files and provides similarity analysis."""
 
-    def __init__(self):
+    def __init__(self, profile: Optional[Any] = None):
+        """
+        Initialize comparator.
+
+        Args:
+            profile: Optional ScoringProfile (or dict / JSON path) for
+                weighted, tolerance-aware scoring
+        """
+        self.profile = load_scoring_profile(profile)
         self.reference_widgets: Dict[str, WidgetInfo] = {}
         self.target_widgets: Dict[str, WidgetInfo] = {}
+        self.reference_hash: Optional[str] = None
+        self.target_hash: Optional[str] = None
+        self._result: Optional[ComparisonResult] = None
+        self._result_key: Optional[Tuple[str, str, str]] = None
 
     def load_reference(self, ui_file: str) -> Dict[str, WidgetInfo]:
         """
@@ -66,14 +235,8 @@ class UIComparator:
         Returns:
             Dictionary of widget name -> WidgetInfo
         """
-        tree = ET.parse(ui_file)
-        root = tree.getroot()
-
-        widgets = {}
-        self._extract_widgets(root, widgets)
-        self.reference_widgets = widgets
-
-        return widgets
+        self.reference_hash, self.reference_widgets = self._load_model(ui_file)
+        return self.reference_widgets
 
     def load_target(self, ui_file: str) -> Dict[str, WidgetInfo]:
         """
@@ -85,91 +248,292 @@ class UIComparator:
         Returns:
             Dictionary of widget name -> WidgetInfo
         """
-        tree = ET.parse(ui_file)
-        root = tree.getroot()
+        self.target_hash, self.target_widgets = self._load_model(ui_file)
+        return self.target_widgets
+
+    def _load_model(self, ui_file: str) -> Tuple[str, Dict[str, WidgetInfo]]:
+        """
+        Parse a .ui file, reusing the cached model when its content is unchanged.
+
+        Returns:
+            (content hash, widget dictionary)
+        """
+        data = Path(ui_file).read_bytes()
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        widgets = _MODEL_CACHE.get(content_hash)
+        if widgets is not None:
+            _MODEL_CACHE.move_to_end(content_hash)
+            return content_hash, widgets
 
         widgets = {}
-        self._extract_widgets(root, widgets)
-        self.target_widgets = widgets
+        self._extract_widgets(ET.fromstring(data), widgets)
+        compute_subtree_hashes(widgets)
 
-        return widgets
+        _MODEL_CACHE[content_hash] = widgets
+        while len(_MODEL_CACHE) > MODEL_CACHE_SIZE:
+            _MODEL_CACHE.popitem(last=False)
+
+        return content_hash, widgets
 
     def _extract_widgets(self, element: ET.Element, widgets: Dict[str, WidgetInfo],
                         parent_name: Optional[str] = None):
-        """Recursively extract widgets from XML."""
-        # Handle both top-level widget and nested widgets
-        for widget_elem in element.findall(".//widget"):
-            self._process_widget(widget_elem, widgets, parent_name)
-
-    def _process_widget(self, element: ET.Element, widgets: Dict[str, WidgetInfo],
-                       parent_name: Optional[str] = None):
-        """Process a single widget element."""
-        if element.tag == "widget":
-            widget_type = element.get("class", "Unknown")
-            widget_name = element.get("name", "unnamed")
-
-            # Extract geometry
-            geometry = {}
-            geom_elem = element.find(".//property[@name='geometry']/rect")
-            if geom_elem is not None:
-                geometry = {
-                    "x": int(geom_elem.find("x").text or 0),
-                    "y": int(geom_elem.find("y").text or 0),
-                    "width": int(geom_elem.find("width").text or 0),
-                    "height": int(geom_elem.find("height").text or 0)
-                }
-
-            # Extract properties
-            properties = {}
-            for prop in element.findall("property"):
-                prop_name = prop.get("name")
-                if prop_name and prop_name != "geometry":
-                    # Simple property extraction
-                    for child in prop:
-                        if child.text:
-                            properties[prop_name] = child.text
-                            break
-
-            widget_info = WidgetInfo(
-                name=widget_name,
-                type=widget_type,
-                geometry=geometry,
-                properties=properties,
-                parent=parent_name
-            )
+        """
+        Extract widgets in a single pre-order traversal.
 
-            widgets[widget_name] = widget_info
+        Each widget records its nearest enclosing widget as parent (layouts
+        and layout items are transparent), the class of the layout managing
+        it, its widget depth, and only its direct properties and geometry.
+        """
+        depth = 0 if parent_name is None else widgets[parent_name].depth + 1
+        stack = [(child, parent_name, depth, None) for child in reversed(element)]
+
+        while stack:
+            elem, parent, depth, layout = stack.pop()
+            tag = elem.tag
+
+            if tag == "widget":
+                info = self._process_widget(elem, parent, depth)
+                info.layout = layout
+                widgets[info.name] = info
+                if parent is not None and parent in widgets:
+                    widgets[parent].children.append(info.name)
+                child_parent, child_depth, child_layout = info.name, depth + 1, None
+            elif tag in ("property", "attribute"):
+                continue
+            elif tag == "layout":
+                child_parent, child_depth, child_layout = parent, depth, elem.get("class")
+            else:
+                # <item> and other containers pass through
+                child_parent, child_depth, child_layout = parent, depth, layout
+
+            stack.extend((child, child_parent, child_depth, child_layout) for child in reversed(elem))
+
+    def _process_widget(self, element: ET.Element, parent_name: Optional[str] = None,
+                        depth: int = 0) -> WidgetInfo:
+        """Build WidgetInfo from a widget element's direct properties."""
+        geometry = {}
+        properties = {}
+
+        for prop in element.iterfind("property"):
+            prop_name = prop.get("name")
+            if not prop_name:
+                continue
+
+            if prop_name == "geometry":
+                rect = prop.find("rect")
+                if rect is not None:
+                    geometry = {
+                        key: int(rect.findtext(key) or 0)
+                        for key in ("x", "y", "width", "height")
+                    }
+                continue
+
+            value = self._property_value(prop)
+            if value is not None:
+                properties[prop_name] = value
+
+        return WidgetInfo(
+            name=element.get("name", "unnamed"),
+            type=element.get("class", "Unknown"),
+            geometry=geometry,
+            properties=properties,
+            parent=parent_name,
+            depth=depth
+        )
 
-    def compare(self) -> ComparisonResult:
+    @staticmethod
+    def _property_value(prop: ET.Element) -> Any:
+        """Simple value text, or a tag -> text dict for compound values (font, size, ...)."""
+        for child in prop:
+            if len(child):
+                return {sub.tag: (sub.text or "").strip() for sub in child}
+            if child.text:
+                return child.text
+        return None
+
+    def compare(self, match: str = "name") -> ComparisonResult:
         """
         Compare reference and target UIs.
 
+        The result is cached and returned again until a different reference
+        or target content is loaded.
+
+        Args:
+            match: "name" pairs widgets by object name; "assignment" pairs
+                them by optimal assignment over type, geometry, text and
+                parent, so renamed widgets still match
+
         Returns:
             ComparisonResult with detailed comparison
         """
-        ref_names = set(self.reference_widgets.keys())
-        target_names = set(self.target_widgets.keys())
+        if match not in ("name", "assignment"):
+            raise ValueError(f"Unknown match mode: {match}")
 
-        # Find matching, missing, and extra widgets
-        matching = list(ref_names & target_names)
-        missing = list(ref_names - target_names)
-        extra = list(target_names - ref_names)
+        key = (self.reference_hash, self.target_hash, match)
+        if self._result is not None and key == self._result_key and None not in key:
+            return self._result
 
-        # Compare properties of matching widgets
-        property_diffs = {}
-        layout_diffs = []
+        self._result = self._collect(self.iter_events(match))
+        self._result_key = key
+        return self._result
+
+    def iter_events(self, match: str = "name") -> Iterator[Tuple[str, str, Optional[str], Dict[str, Any]]]:
+        """
+        Yield comparison events as they are computed.
+
+        Events are (kind, reference name, target name, differences) with
+        kind "match", "changed", "missing" (target name None) or "extra"
+        (reference name None). Extra widgets come last.
 
-        for name in matching:
-            ref_widget = self.reference_widgets[name]
-            target_widget = self.target_widgets[name]
+        Args:
+            match: "name" or "assignment" (see compare())
+        """
+        if match not in ("name", "assignment"):
+            raise ValueError(f"Unknown match mode: {match}")
+        if match == "name":
+            return self._iter_name_events()
+        return self._iter_assigned_events()
+
+    def _collect(self, events) -> ComparisonResult:
+        """Assemble a ComparisonResult from comparison events."""
+        matching = []
+        missing = []
+        extra = []
+        property_diffs = {}
+        pairs = {}
+
+        for kind, name, target_name, diffs in events:
+            if kind == "missing":
+                missing.append(name)
+            elif kind == "extra":
+                extra.append(target_name)
+            else:
+                matching.append(name)
+                if diffs:
+                    property_diffs[name] = diffs
+                if target_name != name:
+                    pairs[name] = target_name
+
+        result = self._build_result(matching, missing, extra, property_diffs, [], pairs=pairs)
+        result.renamed_widgets = pairs
+        return result
+
+    def _result_events(self, result: ComparisonResult):
+        """Replay a computed ComparisonResult as events, in reference order with extras last."""
+        missing = set(result.missing_widgets)
+        renamed = result.renamed_widgets
+        property_diffs = result.property_differences
+
+        for name in self.reference_widgets:
+            if name in missing:
+                yield "missing", name, None, {}
+                continue
+            diffs = property_diffs.get(name, {})
+            yield ("changed" if diffs else "match"), name, renamed.get(name, name), diffs
+        for target_name in result.extra_widgets:
+            yield "extra", None, target_name, {}
+
+    def _iter_assigned_events(self):
+        """Events for rename-tolerant assignment matching."""
+        from widget_matcher import match_widgets
+
+        reference_widgets = self.reference_widgets
+        target_widgets = self.target_widgets
+        type_classes = self.profile.type_class_map() if self.profile else None
+        pairs = match_widgets(reference_widgets, target_widgets, type_classes=type_classes)
+
+        for name, ref_widget in reference_widgets.items():
+            target_name = pairs.get(name)
+            if target_name is None:
+                yield "missing", name, None, {}
+                continue
+            target_widget = target_widgets[target_name]
+            diffs = {}
+            if target_widget.content_hash != ref_widget.content_hash:
+                diffs = self._compare_widgets(ref_widget, target_widget)
+            yield ("changed" if diffs else "match"), name, target_name, diffs
+
+        paired_targets = set(pairs.values())
+        for name in target_widgets:
+            if name not in paired_targets:
+                yield "extra", None, name, {}
+
+    def _iter_name_events(self):
+        """
+        Events for object-name matching.
 
-            diffs = self._compare_widgets(ref_widget, target_widget)
-            if diffs:
-                property_diffs[name] = diffs
+        Walks the reference hierarchy top-down: a widget whose subtree hash
+        equals the target's is matched with all its descendants without
+        diffing, and equal content hashes skip the per-widget diff.
+        """
+        reference_widgets = self.reference_widgets
+        target_widgets = self.target_widgets
+
+        roots = [name for name, w in reference_widgets.items()
+                 if w.parent is None or w.parent not in reference_widgets]
+        stack = list(reversed(roots))
+        visited = set()
+
+        while stack:
+            name = stack.pop()
+            if name in visited:
+                continue
+            visited.add(name)
+            ref_widget = reference_widgets[name]
+            target_widget = target_widgets.get(name)
+
+            if target_widget is None:
+                yield "missing", name, None, {}
+            elif target_widget.subtree_hash == ref_widget.subtree_hash:
+                # Identical subtree: match everything below without diffing
+                identical = [name]
+                while identical:
+                    same = identical.pop()
+                    if same in visited and same != name:
+                        continue
+                    visited.add(same)
+                    yield "match", same, same, {}
+                    identical.extend(reversed(reference_widgets[same].children))
+                continue
+            else:
+                diffs = {}
+                if target_widget.content_hash != ref_widget.content_hash:
+                    diffs = self._compare_widgets(ref_widget, target_widget)
+                yield ("changed" if diffs else "match"), name, name, diffs
+
+            stack.extend(reversed(ref_widget.children))
+
+        # Widgets not reachable from a root (e.g. duplicate names)
+        for name in reference_widgets:
+            if name in visited:
+                continue
+            if name not in target_widgets:
+                yield "missing", name, None, {}
+                continue
+            diffs = self._compare_widgets(reference_widgets[name], target_widgets[name])
+            yield ("changed" if diffs else "match"), name, name, diffs
+
+        for name in target_widgets:
+            if name not in reference_widgets:
+                yield "extra", None, name, {}
+
+    def _build_result(self, matching: List[str], missing: List[str], extra: List[str],
+                      property_diffs: Dict[str, Dict[str, Any]],
+                      layout_diffs: List[str],
+                      pairs: Optional[Dict[str, str]] = None) -> ComparisonResult:
+        """
+        Score matched/missing widgets and assemble the result.
 
-        # Calculate similarity score
-        total_widgets = len(ref_names)
-        if total_widgets == 0:
+        pairs maps reference to target names when they differ (assignment
+        matching); it is only needed for profile scoring.
+        """
+        total_widgets = len(self.reference_widgets)
+        if self.profile is not None:
+            pairs = pairs or {}
+            similarity = self.profile.score(self.reference_widgets, self.target_widgets,
+                                            [(name, pairs.get(name, name)) for name in matching])
+        elif total_widgets == 0:
             similarity = 0.0
         else:
             matching_score = len(matching) / total_widgets
@@ -218,6 +582,61 @@ class UIComparator:
 
         return diffs
 
+    def write_jsonl(self, stream: TextIO, match: str = "name", include_matches: bool = False,
+                    sample_size: int = 20, result: Optional[ComparisonResult] = None) -> Dict[str, Any]:
+        """
+        Stream the comparison as JSON lines while it is computed.
+
+        Writes a header record, one record per differing widget (and per
+        unchanged match if include_matches), then a summary record. Nothing
+        is truncated, and the report is never held in memory.
+
+        Args:
+            stream: Text stream to write to
+            match: "name" or "assignment"
+            include_matches: Also emit unchanged matched widgets
+            sample_size: Widget names kept per category in the summary
+            result: ComparisonResult already computed for the loaded files;
+                written as is instead of comparing again
+
+        Returns:
+            The summary record
+        """
+        reference_widgets = self.reference_widgets
+        target_widgets = self.target_widgets
+        profile = self.profile
+        summary = ComparisonSummary(len(reference_widgets), len(target_widgets), profile,
+                                    profile.total_weight(reference_widgets) if profile else None,
+                                    sample_size)
+        write = stream.write
+
+        write(json.dumps({"record": "header", "match": match,
+                          "reference_hash": self.reference_hash,
+                          "target_hash": self.target_hash,
+                          "profile": profile.name if profile else None}) + "\n")
+
+        events = self._result_events(result) if result is not None else self.iter_events(match)
+        for kind, name, target_name, diffs in events:
+            pair = None
+            if profile is not None and kind in ("match", "changed"):
+                pair = (reference_widgets[name], target_widgets[target_name])
+            summary.add(kind, name, target_name, diffs, pair)
+            if kind == "match" and not include_matches and target_name == name:
+                continue
+            if kind == "extra":
+                record = {"record": kind, "widget": target_name, "class": target_widgets[target_name].type}
+            else:
+                record = {"record": kind, "widget": name, "class": reference_widgets[name].type}
+                if target_name is not None and target_name != name:
+                    record["target"] = target_name
+                if diffs:
+                    record["differences"] = diffs
+            write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        result = {"record": "summary", **summary.to_dict()}
+        write(json.dumps(result, ensure_ascii=False) + "\n")
+        return result
+
     def generate_report(self, result: ComparisonResult) -> str:
         """
         Generate human-readable comparison report.
@@ -241,19 +660,25 @@ class UIComparator:
         if len(result.matching_widgets) > 10:
             lines.append(f"   ... and {len(result.matching_widgets) - 10} more")
 
+        # Renamed widgets (assignment matching)
+        if result.renamed_widgets:
+            lines.append(f"\n🔁 Renamed Widgets ({len(result.renamed_widgets)}):")
+            lines.extend(f"   - {ref_name} → {target_name}"
+                         for ref_name, target_name in result.renamed_widgets.items())
+
         # Missing widgets
         if result.missing_widgets:
+            reference_widgets = self.reference_widgets
             lines.append(f"\n❌ Missing Widgets ({len(result.missing_widgets)}):")
-            for name in result.missing_widgets:
-                ref_widget = self.reference_widgets[name]
-                lines.append(f"   - {name} ({ref_widget.type})")
+            lines.extend(f"   - {name} ({reference_widgets[name].type})"
+                         for name in result.missing_widgets)
 
         # Extra widgets
         if result.extra_widgets:
+            target_widgets = self.target_widgets
             lines.append(f"\n➕ Extra Widgets ({len(result.extra_widgets)}):")
-            for name in result.extra_widgets:
-                target_widget = self.target_widgets[name]
-                lines.append(f"   - {name} ({target_widget.type})")
+            lines.extend(f"   - {name} ({target_widgets[name].type})"
+                         for name in result.extra_widgets)
 
         # Property differences
         if result.property_differences:
@@ -272,18 +697,22 @@ class UIComparator:
 
         return "\n".join(lines)
 
-    def get_missing_widget_specs(self) -> List[Dict[str, Any]]:
+    def get_missing_widget_specs(self, result: Optional[ComparisonResult] = None) -> List[Dict[str, Any]]:
         """
         Get specifications for missing widgets to help recreation.
 
+        Args:
+            result: ComparisonResult to use (defaults to the cached compare())
+
         Returns:
             List of widget specifications
         """
-        result = self.compare()
+        result = result or self.compare()
+        reference_widgets = self.reference_widgets
         specs = []
 
         for name in result.missing_widgets:
-            widget = self.reference_widgets[name]
+            widget = reference_widgets[name]
             specs.append({
                 "name": name,
                 "type": widget.type,
@@ -295,21 +724,169 @@ class UIComparator:
         return specs
 
 
+def changed_widgets(old: Dict[str, WidgetInfo], new: Dict[str, WidgetInfo]) -> set:
+    """
+    Names whose widget was added, removed or changed between two models.
+
+    Args:
+        old: Previous widget model
+        new: Current widget model
+
+    Returns:
+        Set of widget names (content hash differs, or present in only one model)
+    """
+    changed = set(old.keys() ^ new.keys())
+    changed.update(name for name in old.keys() & new.keys()
+                   if old[name].content_hash != new[name].content_hash)
+    return changed
+
+
+class ComparisonSession:
+    """
+    Incremental comparison of a fixed reference against an edited target.
+
+    Holds the reference model and the last target model; after each target
+    edit only the widgets whose content hash changed are re-diffed, and the
+    matching/missing/extra sets and the score are updated in place.
+    """
+
+    def __init__(self, reference_ui: str, target_ui: str, profile: Optional[Any] = None):
+        """
+        Load both files and run the initial (full) comparison.
+
+        Args:
+            reference_ui: Reference .ui file path
+            target_ui: Target .ui file path
+            profile: Optional scoring profile
+        """
+        self.reference_ui = reference_ui
+        self.target_ui = target_ui
+        self.comparator = UIComparator(profile)
+        self.comparator.load_reference(reference_ui)
+        self._full_compare()
+
+    def _full_compare(self):
+        """Load the target and rebuild the session state from a full compare()."""
+        self.comparator.load_target(self.target_ui)
+        self.last_changed: set = set()
+
+        result = self.comparator.compare()
+        self._matched = set(result.matching_widgets)
+        self._missing = set(result.missing_widgets)
+        self._extra = set(result.extra_widgets)
+        self._diffs = dict(result.property_differences)
+        self._result: Optional[ComparisonResult] = result
+
+    def update(self, target_ui: Optional[str] = None) -> ComparisonResult:
+        """
+        Re-compare after the target was edited.
+
+        Args:
+            target_ui: New target path (default: the session's target)
+
+        Returns:
+            Updated ComparisonResult
+        """
+        if target_ui is not None:
+            self.target_ui = target_ui
+
+        comparator = self.comparator
+        reference_hash = comparator.reference_hash
+        comparator.load_reference(self.reference_ui)
+        if comparator.reference_hash != reference_hash:
+            # Reference edited: nothing to reuse
+            self._full_compare()
+            return self.result
+
+        old_hash, old_widgets = comparator.target_hash, comparator.target_widgets
+        comparator.load_target(self.target_ui)
+        if comparator.target_hash == old_hash:
+            self.last_changed = set()
+            return self.result
+
+        self.last_changed = changed_widgets(old_widgets, comparator.target_widgets)
+        self.apply_changes(self.last_changed)
+        return self.result
+
+    def apply_changes(self, changed: set):
+        """
+        Update the comparison state for a set of changed widget names.
+
+        Args:
+            changed: Names added, removed or modified in the current target
+        """
+        reference_widgets = self.comparator.reference_widgets
+        target_widgets = self.comparator.target_widgets
+
+        for name in changed:
+            ref_widget = reference_widgets.get(name)
+            target_widget = target_widgets.get(name)
+
+            if ref_widget is None:
+                if target_widget is None:
+                    self._extra.discard(name)
+                else:
+                    self._extra.add(name)
+                continue
+
+            self._diffs.pop(name, None)
+            if target_widget is None:
+                self._matched.discard(name)
+                self._missing.add(name)
+                continue
+
+            self._missing.discard(name)
+            self._matched.add(name)
+            if target_widget.content_hash != ref_widget.content_hash:
+                diffs = self.comparator._compare_widgets(ref_widget, target_widget)
+                if diffs:
+                    self._diffs[name] = diffs
+
+        self._result = None
+
+    @property
+    def result(self) -> ComparisonResult:
+        """Current ComparisonResult (lists in document order)."""
+        if self._result is None:
+            comparator = self.comparator
+            matched, missing, extra = self._matched, self._missing, self._extra
+            matching = [name for name in comparator.reference_widgets if name in matched]
+            property_diffs = {name: self._diffs[name] for name in matching if name in self._diffs}
+            self._result = comparator._build_result(
+                matching,
+                [name for name in comparator.reference_widgets if name in missing],
+                [name for name in comparator.target_widgets if name in extra],
+                property_diffs,
+                []
+            )
+            # Keep compare() consistent with the session state
+            comparator._result = self._result
+            comparator._result_key = (comparator.reference_hash, comparator.target_hash, "name")
+        return self._result
+
+
 def main():
     """Example usage."""
     import sys
 
-    if len(sys.argv) < 3:
-        print("Usage: python ui_comparator.py <reference.ui> <target.ui>")
+    args = [arg for arg in sys.argv[1:] if arg != "--jsonl"]
+    if len(args) < 2:
+        print("Usage: python ui_comparator.py <reference.ui> <target.ui> [scoring_profile.json] [--jsonl]")
         sys.exit(1)
 
-    comparator = UIComparator()
+    comparator = UIComparator(args[2] if len(args) > 2 else None)
+
+    if "--jsonl" in sys.argv:
+        comparator.load_reference(args[0])
+        comparator.load_target(args[1])
+        comparator.write_jsonl(sys.stdout)
+        return
 
     print("Loading reference UI...")
-    comparator.load_reference(sys.argv[1])
+    comparator.load_reference(args[0])
 
     print("Loading target UI...")
-    comparator.load_target(sys.argv[2])
+    comparator.load_target(args[1])
 
     print("\nComparing...")
     result = comparator.compare()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+UI Geometry - Sweep-line overlap detection for absolute widget rects
+
+Pairwise overlap checks are O(n²), which is too slow for generated forms
+with thousands of absolutely placed widgets. overlapping_pairs() sweeps a
+vertical line across the rects (left to right) and keeps the rects crossing
+the line in two structures over their y intervals:
+
+- a segment tree over compressed y coordinates, answering "which active
+  rects contain this y" (stabbing query)
+- a sorted list of active tops, answering "which active rects start inside
+  this y range"
+
+Every overlapping pair is found exactly once by one of the two queries, so
+the sweep costs O((n + k) log n) for n rects and k overlapping pairs.
+Rects are half-open: rects that merely touch do not overlap.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+
+Rect = Tuple[int, int, int, int]  # x, y, width, height
+
+
+class _StabbingTree:
+    """Segment tree of y intervals over compressed coordinates."""
+
+    def __init__(self, coords: List[int]):
+        self.coords = coords
+        size = 1
+        while size < max(len(coords), 1):
+            size *= 2
+        self.size = size
+        self.nodes: List[Optional[Set[int]]] = [None] * (2 * size)
+
+    def _update(self, top: int, bottom: int, item: int, add: bool):
+        low = bisect_left(self.coords, top) + self.size
+        high = bisect_left(self.coords, bottom) + self.size
+        while low < high:
+            if low & 1:
+                self._touch(low, item, add)
+                low += 1
+            if high & 1:
+                high -= 1
+                self._touch(high, item, add)
+            low //= 2
+            high //= 2
+
+    def _touch(self, node: int, item: int, add: bool):
+        if add:
+            if self.nodes[node] is None:
+                self.nodes[node] = set()
+            self.nodes[node].add(item)
+        else:
+            self.nodes[node].discard(item)
+
+    def insert(self, top: int, bottom: int, item: int):
+        """Add the interval [top, bottom)."""
+        self._update(top, bottom, item, True)
+
+    def remove(self, top: int, bottom: int, item: int):
+        """Remove the interval [top, bottom)."""
+        self._update(top, bottom, item, False)
+
+    def stab(self, y: int) -> List[int]:
+        """Items whose interval contains y (y must be a known coordinate)."""
+        found = []
+        node = bisect_left(self.coords, y) + self.size
+        while node:
+            if self.nodes[node]:
+                found.extend(self.nodes[node])
+            node //= 2
+        return found
+
+
+def overlapping_pairs(rects: Sequence[Rect]) -> List[Tuple[int, int]]:
+    """
+    Find all pairs of overlapping rects.
+
+    Args:
+        rects: (x, y, width, height) tuples; empty rects never overlap
+
+    Returns:
+        (i, j) index pairs with i < j, sorted
+    """
+    boxes = [(x, y, x + w, y + h) for x, y, w, h in rects]
+    order = sorted((i for i, (left, top, right, bottom) in enumerate(boxes)
+                    if right > left and bottom > top), key=lambda i: boxes[i][0])
+    if len(order) < 2:
+        return []
+
+    tree = _StabbingTree(sorted({c for i in order for c in (boxes[i][1], boxes[i][3])}))
+    active_tops: List[Tuple[int, int]] = []  # (top, index), sorted
+    ends: List[Tuple[int, int]] = []  # heap of (right, index)
+    pairs = []
+
+    for i in order:
+        left, top, _, bottom = boxes[i]
+
+        # Rects ending at or before this left edge no longer cross the sweep line
+        while ends and ends[0][0] <= left:
+            _, j = heapq.heappop(ends)
+            tree.remove(boxes[j][1], boxes[j][3], j)
+            del active_tops[bisect_left(active_tops, (boxes[j][1], j))]
+
+        # Active rects containing this top, plus those starting strictly inside
+        overlaps = tree.stab(top)
+        start = bisect_right(active_tops, (top, len(boxes)))
+        end = bisect_left(active_tops, (bottom, -1))
+        overlaps.extend(j for _, j in active_tops[start:end])
+        pairs.extend((min(i, j), max(i, j)) for j in overlaps)
+
+        tree.insert(top, bottom, i)
+        insort(active_tops, (top, i))
+        heapq.heappush(ends, (boxes[i][2], i))
+
+    return sorted(pairs)
+
+
+def intersection(a: Rect, b: Rect) -> Optional[Rect]:
+    """Overlap of two rects, or None if they don't overlap."""
+    left, top = max(a[0], b[0]), max(a[1], b[1])
+    right, bottom = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    if right <= left or bottom <= top:
+        return None
+    return left, top, right - left, bottom - top
+
+
+def outside_bounds(rect: Rect, width: int, height: int) -> Optional[Dict[str, int]]:
+    """
+    How far a child rect extends past its parent's (0, 0, width, height).
+
+    Returns:
+        Overflow per side ("left", "top", "right", "bottom"; only sides that
+        overflow), or None if the rect is inside
+    """
+    x, y, w, h = rect
+    overflow = {"left": -x, "top": -y, "right": x + w - width, "bottom": y + h - height}
+    overflow = {side: amount for side, amount in overflow.items() if amount > 0}
+    return overflow or None
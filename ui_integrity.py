@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+UI Integrity - Object name and reference checks for .ui files
+
+QUiLoader accepts files whose references don't resolve and then silently
+misbehaves: a second widget with an existing object name shadows the
+first, buddies and tab stops naming missing widgets are dropped, and
+connections to unknown objects never fire. This module finds those
+problems without Qt:
+
+- duplicate-name: two objects (widgets, layouts, spacers, actions, groups)
+  with the same name
+- dangling-buddy / dangling-tabstop / dangling-connection / dangling-action /
+  dangling-buttongroup: references to names that don't exist (or aren't
+  widgets where a widget is required)
+- duplicate-tabstop: a widget listed twice in <tabstops>
+- outside-layout: a widget placed next to its parent's layout instead of in it
+- multiple-layouts: a widget with more than one top-level layout
+- empty-layout-item: a layout <item> without widget, layout or spacer
+
+UIIndex collects names and references in one pass over the tree; every
+check is then a dict lookup, so the whole pass is linear in the file size.
+
+Usage:
+    python ui_integrity.py dialog.ui forms/*.ui
+"""
+
+import argparse
+import sys
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Elements whose name attribute is an object name
+OBJECT_TAGS = frozenset(("widget", "layout", "spacer", "action", "actiongroup", "buttongroup"))
+
+
+@dataclass
+class IntegrityIssue:
+    """A broken name or reference."""
+    check: str  # e.g. "duplicate-name"
+    severity: str  # "error" or "warning"
+    name: str  # object name the issue is about
+    message: str
+    path: str = ""  # e.g. /ui/widget[Dialog]/widget[okButton]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    """Stripped text of an element, or of its single value child."""
+    if elem is None:
+        return ""
+    if len(elem):
+        elem = elem[0]
+    return (elem.text or "").strip()
+
+
+class UIIndex:
+    """Object names and references of a .ui tree, collected in one pass."""
+
+    def __init__(self, root: ET.Element):
+        """
+        Build the index.
+
+        Args:
+            root: The <ui> element
+        """
+        self.root = root
+        self.objects: Dict[str, List[ET.Element]] = {}
+        self.buddies: List[Tuple[ET.Element, str]] = []  # (label, buddy name)
+        self.button_groups: List[Tuple[ET.Element, str]] = []  # (button, group name)
+        self.addactions: List[Tuple[ET.Element, str]] = []  # (<addaction>, action name)
+        self.loose_widgets: List[ET.Element] = []  # widgets beside their parent's layout
+        self.layout_counts: List[Tuple[ET.Element, int]] = []  # widgets with > 1 layout
+        self.empty_items: List[ET.Element] = []
+
+        for parent in root.iter():
+            is_widget = parent.tag == "widget"
+            layouts = 0
+            children = []
+            for child in parent:
+                tag = child.tag
+                if tag in OBJECT_TAGS:
+                    name = child.get("name")
+                    if name:
+                        self.objects.setdefault(name, []).append(child)
+                    if is_widget:
+                        if tag == "widget":
+                            children.append(child)
+                        elif tag == "layout":
+                            layouts += 1
+                elif tag == "addaction":
+                    self.addactions.append((child, child.get("name", "")))
+                elif is_widget and tag in ("property", "attribute"):
+                    name = child.get("name")
+                    if name == "buddy" and tag == "property":
+                        self.buddies.append((parent, _text(child)))
+                    elif name == "buttonGroup" and tag == "attribute":
+                        self.button_groups.append((parent, _text(child)))
+                elif tag == "item" and parent.tag == "layout" and not len(child):
+                    self.empty_items.append(child)
+            if layouts:
+                self.loose_widgets.extend(children)
+                if layouts > 1:
+                    self.layout_counts.append((parent, layouts))
+
+        self.tabstops = [(elem, _text(elem)) for elem in root.iterfind("tabstops/tabstop")]
+        self.connections = [(connection, {field: _text(connection.find(field))
+                                          for field in ("sender", "signal", "receiver", "slot")})
+                            for connection in root.iterfind("connections/connection")]
+
+    def kinds(self, name: str) -> List[str]:
+        """Element tags of the objects with this name."""
+        return [elem.tag for elem in self.objects.get(name, ())]
+
+    def is_widget(self, name: str) -> bool:
+        return "widget" in self.kinds(name)
+
+
+def check_integrity(source) -> List[IntegrityIssue]:
+    """
+    Check names and references of a .ui file.
+
+    Args:
+        source: Path to .ui file, parsed <ui> element or UIIndex
+
+    Returns:
+        List of IntegrityIssue (errors first)
+    """
+    if isinstance(source, UIIndex):
+        index = source
+    elif isinstance(source, ET.Element):
+        index = UIIndex(source)
+    else:
+        index = UIIndex(ET.parse(str(source)).getroot())
+
+    issues: List[Tuple[IntegrityIssue, ET.Element]] = []
+
+    def add(check: str, severity: str, name: str, message: str, elem: ET.Element):
+        issues.append((IntegrityIssue(check, severity, name, message), elem))
+
+    for name, elems in index.objects.items():
+        if len(elems) > 1:
+            kinds = ", ".join(elem.get("class") or elem.tag for elem in elems)
+            add("duplicate-name", "error", name,
+                f"Object name '{name}' is used {len(elems)} times ({kinds})", elems[1])
+
+    for label, buddy in index.buddies:
+        if not index.is_widget(buddy):
+            add("dangling-buddy", "error", label.get("name", ""),
+                f"Buddy of '{label.get('name')}' is '{buddy}', which is not a widget", label)
+
+    for button, group in index.button_groups:
+        if "buttongroup" not in index.kinds(group):
+            add("dangling-buttongroup", "error", button.get("name", ""),
+                f"'{button.get('name')}' belongs to unknown button group '{group}'", button)
+
+    for elem, action in index.addactions:
+        if action != "separator" and not {"action", "actiongroup", "widget"} & set(index.kinds(action)):
+            add("dangling-action", "error", action, f"<addaction> references unknown action '{action}'", elem)
+
+    seen = set()
+    for elem, name in index.tabstops:
+        if not index.is_widget(name):
+            add("dangling-tabstop", "error", name, f"Tab stop '{name}' is not a widget", elem)
+        elif name in seen:
+            add("duplicate-tabstop", "warning", name, f"Tab stop '{name}' is listed more than once", elem)
+        seen.add(name)
+
+    for elem, connection in index.connections:
+        signature = f"{connection['sender']}.{connection['signal']} -> " \
+                    f"{connection['receiver']}.{connection['slot']}"
+        for role in ("sender", "receiver"):
+            name = connection[role]
+            if name not in index.objects:
+                add("dangling-connection", "error", name,
+                    f"Connection {signature}: unknown {role} '{name}'", elem)
+
+    for widget, count in index.layout_counts:
+        add("multiple-layouts", "error", widget.get("name", ""),
+            f"'{widget.get('name')}' has {count} top-level layouts; Qt uses only one", widget)
+
+    for widget in index.loose_widgets:
+        add("outside-layout", "warning", widget.get("name", ""),
+            f"'{widget.get('name')}' sits beside its parent's layout and is not managed by it", widget)
+
+    for item in index.empty_items:
+        add("empty-layout-item", "error", "", "Layout <item> has no widget, layout or spacer", item)
+
+    # Paths only for flagged elements; the parent map costs one more pass
+    if issues:
+        parents = {child: parent for parent in index.root.iter() for child in parent}
+        for issue, elem in issues:
+            issue.path = _element_path(elem, parents)
+
+    result = [issue for issue, _ in issues]
+    result.sort(key=lambda issue: issue.severity != "error")
+    return result
+
+
+def _element_path(elem: ET.Element, parents: Dict[ET.Element, ET.Element]) -> str:
+    parts = []
+    while elem is not None:
+        name = elem.get("name")
+        parts.append(f"{elem.tag}[{name}]" if name else elem.tag)
+        elem = parents.get(elem)
+    return "/" + "/".join(reversed(parts))
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Check object names and references in .ui files")
+    parser.add_argument("paths", nargs="+", help=".ui files")
+    parser.add_argument("--strict", action="store_true", help="Fail on warnings too")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.paths:
+        issues = check_integrity(path)
+        for issue in issues:
+            print(f"{path}: {issue.severity}: {issue.check}: {issue.message} ({issue.path})")
+        if any(issue.severity == "error" or args.strict for issue in issues):
+            failed = True
+        elif not issues:
+            print(f"{path}: ok")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
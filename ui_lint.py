@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+UI Lint - Editor-free static verification of .ui files
+
+Runs the structural verification rules (ui_rules) directly on parsed .ui
+files, so no Live Editor or Qt process is needed. Directories are linted in
+a process pool, and findings are cached by file content hash together with
+the active ruleset, so re-linting an unchanged tree only hashes files.
+
+Usage:
+    python ui_lint.py path/to/uis/ [more.ui ...]
+    python ui_lint.py ui/ --severity default-names=off --fail-on warning
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+from batch_compare import expand_ui_paths
+from golden_store import hash_file
+from ui_rules import RuleEngine, SEVERITIES, SEVERITY_ORDER
+
+
+DEFAULT_CACHE_PATH = ".ui_cache/lint_cache.json"
+
+# Rule engine of the current (worker) process
+_WORKER_ENGINE: Optional[RuleEngine] = None
+
+
+class LintCache:
+    """Persistent findings cache keyed by file path and content hash."""
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH, ruleset: str = ""):
+        """
+        Initialize cache.
+
+        Args:
+            cache_path: JSON cache file
+            ruleset: Active ruleset identifier; entries from another ruleset
+                are discarded
+        """
+        self.cache_path = Path(cache_path)
+        self.ruleset = ruleset
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("ruleset") == ruleset:
+                self.entries = data.get("entries", {})
+
+    def get(self, ui_file: str, ui_hash: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached findings, or None if the file changed since it was linted."""
+        entry = self.entries.get(ui_file)
+        if entry is not None and entry["ui_hash"] == ui_hash:
+            return entry["findings"]
+        return None
+
+    def put(self, ui_file: str, ui_hash: str, findings: List[Dict[str, Any]]):
+        """Store findings for a file."""
+        self.entries[ui_file] = {"ui_hash": ui_hash, "findings": findings}
+        self.dirty = True
+
+    def save(self):
+        """Write cache to disk (if changed)."""
+        if not self.dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "ruleset": self.ruleset, "entries": self.entries}, f)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+
+def _init_worker(severities: Optional[Dict[str, str]]):
+    """Pool initializer: build the rule engine once per worker."""
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = RuleEngine(severities=severities)
+
+
+def _lint_entry(ui_file: str) -> Dict[str, Any]:
+    """Pool task: lint one file, returning an error record instead of raising."""
+    try:
+        findings = _WORKER_ENGINE.run_file(ui_file)
+    except Exception as e:
+        return {"file": ui_file, "status": "error", "message": str(e)}
+    return {"file": ui_file, "status": "success", "findings": [f.to_dict() for f in findings]}
+
+
+def _counts(findings: List[Dict[str, Any]]) -> Dict[str, int]:
+    counts = dict.fromkeys(SEVERITIES, 0)
+    for finding in findings:
+        counts[finding["severity"]] += 1
+    return counts
+
+
+def lint_paths(paths: Iterable[str], workers: Optional[int] = None,
+               severities: Optional[Dict[str, str]] = None,
+               cache_path: Optional[str] = DEFAULT_CACHE_PATH) -> Iterator[Dict[str, Any]]:
+    """
+    Lint .ui files and directories.
+
+    Args:
+        paths: .ui files and/or directories
+        workers: Worker processes (default: CPU count, 1 = in-process)
+        severities: Rule id -> severity override ("error", "warning", "info", "off")
+        cache_path: Findings cache file (None disables caching)
+
+    Yields:
+        One record per file, in path order:
+        {"file", "status", "cached", "findings", "counts"} or an error record
+    """
+    files = expand_ui_paths(paths)
+    engine = RuleEngine(severities=severities)
+    cache = LintCache(cache_path, engine.ruleset_version) if cache_path else None
+
+    hashes, cached, pending = {}, {}, []
+    for ui_file in files:
+        try:
+            hashes[ui_file] = hash_file(ui_file)
+        except OSError as e:
+            cached[ui_file] = {"file": ui_file, "status": "error", "message": str(e)}
+            continue
+        findings = cache.get(ui_file, hashes[ui_file]) if cache else None
+        if findings is None:
+            pending.append(ui_file)
+        else:
+            cached[ui_file] = {"file": ui_file, "status": "success", "cached": True,
+                               "findings": findings, "counts": _counts(findings)}
+
+    workers = workers or os.cpu_count() or 1
+    pool = None
+    if workers <= 1 or len(pending) <= 1:
+        _init_worker(severities)
+        results = map(_lint_entry, pending)
+    else:
+        chunksize = max(1, len(pending) // (workers * 4))
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(severities,))
+        results = pool.map(_lint_entry, pending, chunksize=chunksize)
+
+    try:
+        for ui_file in files:
+            record = cached.get(ui_file)
+            if record is None:
+                record = next(results)
+                if record["status"] == "success":
+                    record["cached"] = False
+                    record["counts"] = _counts(record["findings"])
+                    if cache:
+                        cache.put(ui_file, hashes[ui_file], record["findings"])
+            yield record
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if cache:
+            cache.save()
+
+
+def format_record(record: Dict[str, Any]) -> List[str]:
+    """Compiler-style text lines for one lint record."""
+    if record["status"] != "success":
+        return [f"{record['file']}: error: {record['message']}"]
+    lines = []
+    for finding in record["findings"]:
+        widget = f" ({finding['widget']})" if finding.get("widget") else ""
+        lines.append(f"{record['file']}: {finding['severity']}: [{finding['rule']}] "
+                     f"{finding['message']}{widget}")
+    return lines
+
+
+def main():
+    """Lint CLI; exits non-zero when findings reach the --fail-on severity."""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Static .ui lint (no Qt / Live Editor needed)")
+    parser.add_argument("paths", nargs="+", help=".ui files or directories")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--severity", action="append", default=[], metavar="RULE=LEVEL",
+                        help="Override a rule's severity (error, warning, info, off)")
+    parser.add_argument("--fail-on", default="error", choices=SEVERITIES,
+                        help="Lowest severity that fails the run (default: error)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Findings cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the findings cache")
+    parser.add_argument("--json", action="store_true", help="Write JSON-line records")
+    args = parser.parse_args()
+
+    severities = {}
+    for override in args.severity:
+        rule_id, _, level = override.partition("=")
+        severities[rule_id] = level
+
+    fail_rank = SEVERITY_ORDER[args.fail_on]
+    totals = dict.fromkeys(SEVERITIES, 0)
+    failed = False
+    files = errors = 0
+
+    try:
+        records = lint_paths(args.paths, workers=args.workers, severities=severities,
+                             cache_path=None if args.no_cache else args.cache)
+        for record in records:
+            files += 1
+            if args.json:
+                print(json.dumps(record, ensure_ascii=False))
+            else:
+                for line in format_record(record):
+                    print(line)
+            if record["status"] != "success":
+                errors += 1
+                failed = True
+                continue
+            for severity, count in record["counts"].items():
+                totals[severity] += count
+                if count and SEVERITY_ORDER[severity] <= fail_rank:
+                    failed = True
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if not args.json:
+        print(f"{files} file(s): {totals['error']} error(s), {totals['warning']} warning(s), "
+              f"{totals['info']} info" + (f", {errors} unreadable" if errors else ""),
+              file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,20 +8,26 @@ import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+from ui_integrity import check_integrity
+from ui_performance import analyze_performance
+from ui_schema import SchemaValidationError, validate_ui
+
 
 class UIManager:
     """Manages .ui file creation and modification through XML manipulation."""
 
-    def __init__(self, ui_file: Optional[str] = None):
+    def __init__(self, ui_file: Optional[str] = None, validate_on_save: bool = False):
         """
         Initialize UIManager.
 
         Args:
             ui_file: Path to existing .ui file (optional)
+            validate_on_save: Check the tree's schema and integrity on every save
         """
         self.ui_file = ui_file
         self.tree = None
         self.root = None
+        self.validate_on_save = validate_on_save
 
         if ui_file and Path(ui_file).exists():
             self.load(ui_file)
@@ -32,12 +38,17 @@ class UIManager:
         self.tree = ET.parse(ui_file)
         self.root = self.tree.getroot()
 
-    def save(self, output_path: Optional[str] = None):
+    def save(self, output_path: Optional[str] = None, validate: Optional[bool] = None):
         """
         Save .ui file.
 
         Args:
             output_path: Output file path (defaults to self.ui_file)
+            validate: Check the tree's schema and integrity first
+                (defaults to self.validate_on_save)
+
+        Raises:
+            SchemaValidationError: If validation finds errors (nothing is written)
         """
         if output_path is None:
             output_path = self.ui_file
@@ -45,10 +56,47 @@ class UIManager:
         if output_path is None:
             raise ValueError("No output path specified")
 
+        if self.validate_on_save if validate is None else validate:
+            errors = [v for v in self.validate() + self.check_integrity() if v.severity == "error"]
+            if errors:
+                raise SchemaValidationError(errors)
+
         # Ensure proper XML formatting
         self._indent(self.root)
         self.tree.write(output_path, encoding='utf-8', xml_declaration=True)
 
+    def validate(self) -> list:
+        """
+        Check the tree against the Designer .ui 4.0 schema.
+
+        Returns:
+            List of SchemaViolation (errors and warnings)
+        """
+        return validate_ui(self.root)
+
+    def check_integrity(self) -> list:
+        """
+        Check object names and references (duplicates, buddies, tab stops,
+        connections, actions, layout membership).
+
+        Returns:
+            List of IntegrityIssue (errors and warnings)
+        """
+        return check_integrity(self.root)
+
+    def analyze_performance(self, **thresholds):
+        """
+        Count QObjects and nesting depth and rank optimization hints
+        (flatten layouts, model/view for static items, lazy tab pages).
+
+        Args:
+            **thresholds: item_threshold / page_threshold overrides
+
+        Returns:
+            PerformanceReport
+        """
+        return analyze_performance(self.root, **thresholds)
+
     def _indent(self, elem, level=0):
         """Add indentation to XML for readable output."""
         indent = "\n" + "  " * level
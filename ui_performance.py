@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+UI Performance - Widget count and nesting advisor for .ui files
+
+Opening a form costs roughly one construction per QObject and per static
+view item, and every resize walks the layout tree. This module reports,
+from the XML alone:
+
+- qobjects: widgets, layouts, actions and groups declared in the file
+- max_depth: deepest widget/layout nesting (and where it is)
+- redundant layouts: a layout whose only item is another layout, or a
+  plain QWidget wrapper whose layout holds a single item
+- large item widgets: QListWidget/QTableWidget/QTreeWidget with many
+  static items
+
+and ranks recommendations by estimated cost, in objects constructed at
+load (or laid out again on each resize) that the change would save:
+
+- flatten: drop the redundant layout or wrapper
+- model-view: move static items into a model behind a QListView/QTableView/QTreeView
+- lazy-tabs: build the hidden pages of a QTabWidget/QStackedWidget/QToolBox
+  when they are first shown
+
+Usage:
+    python ui_performance.py dialog.ui [--json]
+"""
+
+import argparse
+import json
+import sys
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Any, List
+
+
+# Elements that become QObjects when the form is loaded
+QOBJECT_TAGS = frozenset(("widget", "layout", "action", "actiongroup", "buttongroup"))
+
+# Convenience views with static items, and their model/view replacement
+ITEM_WIDGETS = {"QListWidget": "QListView", "QTableWidget": "QTableView", "QTreeWidget": "QTreeView"}
+
+# Containers that show one page at a time
+PAGED_WIDGETS = frozenset(("QTabWidget", "QStackedWidget", "QToolBox"))
+
+DEFAULT_ITEM_THRESHOLD = 100  # static items
+DEFAULT_PAGE_THRESHOLD = 50  # QObjects on hidden pages
+
+
+@dataclass
+class Recommendation:
+    """A suggested change and what it would save."""
+    kind: str  # "flatten", "model-view" or "lazy-tabs"
+    name: str
+    path: str
+    message: str
+    estimated_cost: int  # objects constructed or laid out that the change saves
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class PerformanceReport:
+    """Widget count, nesting and ranked recommendations for one form."""
+    qobjects: int = 0
+    widgets: int = 0
+    layouts: int = 0
+    static_items: int = 0
+    max_depth: int = 0
+    deepest_path: str = ""
+    redundant_layouts: List[str] = field(default_factory=list)  # paths
+    large_item_widgets: List[Dict[str, Any]] = field(default_factory=list)
+    recommendations: List[Recommendation] = field(default_factory=list)  # highest cost first
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["recommendations"] = [r.to_dict() for r in self.recommendations]
+        return result
+
+
+def _number_property(widget: ET.Element, name: str, default: int = 0) -> int:
+    number = widget.find(f"property[@name='{name}']/number")
+    try:
+        return int(number.text)
+    except (AttributeError, TypeError, ValueError):
+        return default
+
+
+class _Analyzer:
+    """One post-order pass collecting counts, depth and recommendations."""
+
+    def __init__(self, item_threshold: int, page_threshold: int):
+        self.item_threshold = item_threshold
+        self.page_threshold = page_threshold
+        self.report = PerformanceReport()
+        self.labels: List[str] = []  # path of the element being visited
+
+    def path(self) -> str:
+        return "/" + "/".join(self.labels)
+
+    def recommend(self, kind: str, name: str, message: str, cost: int):
+        self.report.recommendations.append(Recommendation(kind, name, self.path(), message, cost))
+
+    def visit(self, elem: ET.Element, depth: int = 0, in_layout: bool = False) -> int:
+        """
+        Visit elem and its subtree.
+
+        Returns:
+            QObjects in the subtree, elem included
+        """
+        tag = elem.tag
+        name = elem.get("name")
+        self.labels.append(f"{tag}[{name}]" if name else tag)
+        report = self.report
+
+        count = 0
+        if tag in QOBJECT_TAGS:
+            count = 1
+            if tag == "widget":
+                report.widgets += 1
+            elif tag == "layout":
+                report.layouts += 1
+            if tag in ("widget", "layout"):
+                depth += 1
+                if depth > report.max_depth:
+                    report.max_depth = depth
+                    report.deepest_path = self.path()
+
+        pages = []
+        for child in elem:
+            child_count = self.visit(child, depth, in_layout=tag == "item")
+            count += child_count
+            if child.tag == "widget":
+                pages.append(child_count)
+
+        if tag == "widget":
+            cls = elem.get("class", "")
+            if cls in ITEM_WIDGETS:
+                self._item_widget(elem, cls)
+            elif cls in PAGED_WIDGETS and len(pages) > 1:
+                self._paged_widget(elem, cls, pages)
+            elif cls == "QWidget" and in_layout:
+                self._wrapper(elem, count)
+        elif tag == "layout":
+            self._nested_layout(elem, count)
+
+        self.labels.pop()
+        return count
+
+    def _item_widget(self, widget: ET.Element, cls: str):
+        # Tree items nest; table header <row>/<column> entries are items too
+        items = sum(1 for _ in widget.iter("item")) + len(widget.findall("row")) + len(widget.findall("column"))
+        self.report.static_items += items
+        if items < self.item_threshold:
+            return
+        name = widget.get("name", "")
+        self.report.large_item_widgets.append({"name": name, "class": cls, "items": items, "path": self.path()})
+        self.recommend("model-view", name,
+                       f"{cls} '{name}' creates {items} static items at load; "
+                       f"use a {ITEM_WIDGETS[cls]} with a model", items)
+
+    def _paged_widget(self, widget: ET.Element, cls: str, pages: List[int]):
+        current = _number_property(widget, "currentIndex")
+        if not 0 <= current < len(pages):
+            current = 0
+        hidden = sum(pages) - pages[current]
+        if hidden < self.page_threshold:
+            return
+        name = widget.get("name", "")
+        self.recommend("lazy-tabs", name,
+                       f"{cls} '{name}' builds {hidden} objects on {len(pages) - 1} hidden pages at load; "
+                       f"create pages when first shown", hidden)
+
+    def _wrapper(self, widget: ET.Element, count: int):
+        # A plain QWidget in a layout whose own layout holds a single item
+        children = [child for child in widget if child.tag in ("widget", "layout")]
+        if len(children) != 1 or children[0].tag != "layout" or len(children[0].findall("item")) != 1:
+            return
+        name = widget.get("name", "")
+        self._redundant(name, f"'{name}' only wraps one item; put it in the parent layout directly", count)
+
+    def _nested_layout(self, layout: ET.Element, count: int):
+        items = layout.findall("item")
+        if len(items) != 1 or items[0].find("layout") is None:
+            return
+        name = layout.get("name", "")
+        inner = items[0].find("layout").get("name", "")
+        self._redundant(name, f"Layout '{name}' only holds layout '{inner}'; merge them", count)
+
+    def _redundant(self, name: str, message: str, count: int):
+        # Saves the extra objects at load and a layout level for everything below on resize
+        self.report.redundant_layouts.append(self.path())
+        self.recommend("flatten", name, message, count)
+
+
+def analyze_performance(source, item_threshold: int = DEFAULT_ITEM_THRESHOLD,
+                        page_threshold: int = DEFAULT_PAGE_THRESHOLD) -> PerformanceReport:
+    """
+    Count objects and nesting of a form and rank optimization recommendations.
+
+    Args:
+        source: Path to .ui file or parsed <ui> element
+        item_threshold: Static items from which an item widget is reported
+        page_threshold: Objects on hidden pages from which lazy pages are recommended
+
+    Returns:
+        PerformanceReport with recommendations sorted by estimated cost
+    """
+    root = source if isinstance(source, ET.Element) else ET.parse(str(source)).getroot()
+    analyzer = _Analyzer(item_threshold, page_threshold)
+    report = analyzer.report
+    report.qobjects = analyzer.visit(root)
+    report.recommendations.sort(key=lambda r: r.estimated_cost, reverse=True)
+    return report
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Report widget count, nesting and optimization hints for .ui files")
+    parser.add_argument("path", help=".ui file")
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEM_THRESHOLD, help="Static item threshold")
+    parser.add_argument("--pages", type=int, default=DEFAULT_PAGE_THRESHOLD, help="Hidden page object threshold")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = analyze_performance(args.path, args.items, args.pages)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+        return 0
+
+    print(f"{args.path}: {report.qobjects} QObjects ({report.widgets} widgets, {report.layouts} layouts), "
+          f"{report.static_items} static items, max depth {report.max_depth} ({report.deepest_path})")
+    for rank, rec in enumerate(report.recommendations, 1):
+        print(f"  {rank}. [{rec.kind}] ~{rec.estimated_cost}: {rec.message}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
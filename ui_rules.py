@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+UI Rules - Pluggable single-pass rule engine for UI verification
+
+Rules subscribe to widget classes (exact names, "*" or fnmatch patterns
+such as "*Button"). The engine walks the widget model once and dispatches
+each widget only to the rules subscribed to its class, so the cost stays
+linear in nodes × subscribed rules. Rules emit structured Finding objects;
+severities can be overridden (or rules turned "off") per engine.
+
+Adding a rule:
+
+    from ui_rules import Rule, Finding, register_rule
+
+    @register_rule
+    class NoTooltipRule(Rule):
+        id = "missing-tooltip"
+        category = "accessibility"
+        default_severity = "info"
+        node_types = ("QToolButton",)
+
+        def visit(self, widget, context):
+            if "toolTip" not in widget.properties:
+                yield self.finding(f"{widget.name} has no tooltip", widget=widget.name,
+                                   suggestion="Set toolTip for icon-only buttons")
+"""
+
+import fnmatch
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Type
+
+from ui_comparator import UIComparator, WidgetInfo
+from ui_geometry import intersection, outside_bounds, overlapping_pairs
+
+
+SEVERITIES = ("error", "warning", "info")
+SEVERITY_ORDER = {severity: i for i, severity in enumerate(SEVERITIES)}
+
+# Registered rule classes by id
+RULES: Dict[str, Type["Rule"]] = {}
+
+
+@dataclass
+class Finding:
+    """A single rule violation."""
+    rule: str
+    severity: str
+    category: str
+    message: str
+    suggestion: str = ""
+    widget: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization."""
+        result = {
+            "rule": self.rule,
+            "severity": self.severity,
+            "category": self.category,
+            "message": self.message,
+            "suggestion": self.suggestion
+        }
+        if self.widget is not None:
+            result["widget"] = self.widget
+        if self.details:
+            result["details"] = self.details
+        return result
+
+
+@dataclass
+class RuleContext:
+    """State shared by all rules during one traversal."""
+    widgets: Dict[str, WidgetInfo]
+    root: Optional[WidgetInfo]
+    ui_file: Optional[str] = None
+    frame: Optional[Any] = None  # rendered RGBA frame (H x W x 4 uint8), if available
+    geometry: Optional[Dict[str, Any]] = None  # rendered widget rects from the Live Editor
+    cache: Dict[str, Any] = field(default_factory=dict)  # derived data shared between rules
+
+
+class Rule:
+    """
+    Base class for verification rules.
+
+    Subclasses set id, category, default_severity and node_types, and
+    implement visit() (called per subscribed widget) and/or finish()
+    (called once after the traversal).
+    """
+    id = "rule"
+    category = "general"
+    default_severity = "warning"
+    node_types = ("*",)
+    version = 1  # bump when the rule's behaviour changes (cache keys)
+
+    def __init__(self, severity: Optional[str] = None):
+        self.severity = severity or self.default_severity
+
+    @classmethod
+    def matches(cls, widget_type: str) -> bool:
+        """True if the rule subscribes to a widget class."""
+        return any(pattern == "*" or pattern == widget_type or
+                   (("*" in pattern or "?" in pattern) and fnmatch.fnmatchcase(widget_type, pattern))
+                   for pattern in cls.node_types)
+
+    def start(self, context: RuleContext):
+        """Reset per-run state."""
+
+    def visit(self, widget: WidgetInfo, context: RuleContext) -> Iterable[Finding]:
+        """Check one widget."""
+        return ()
+
+    def finish(self, context: RuleContext) -> Iterable[Finding]:
+        """Emit findings that need the whole model."""
+        return ()
+
+    def finding(self, message: str, suggestion: str = "", widget: Optional[str] = None,
+                **details) -> Finding:
+        """Build a Finding with this rule's id, severity and category."""
+        return Finding(rule=self.id, severity=self.severity, category=self.category,
+                       message=message, suggestion=suggestion, widget=widget, details=details)
+
+
+def register_rule(rule_class: Type[Rule]) -> Type[Rule]:
+    """
+    Register a rule class (usable as a decorator).
+
+    Raises:
+        ValueError: If another rule class already uses the id
+    """
+    existing = RULES.get(rule_class.id)
+    if existing is not None and existing is not rule_class:
+        raise ValueError(f"Rule id already registered: {rule_class.id}")
+    RULES[rule_class.id] = rule_class
+    return rule_class
+
+
+class RuleEngine:
+    """Runs rules over a widget model in a single traversal."""
+
+    def __init__(self, rules: Optional[Iterable[Any]] = None,
+                 severities: Optional[Dict[str, str]] = None):
+        """
+        Initialize engine.
+
+        Args:
+            rules: Rule ids, classes or instances (default: all registered)
+            severities: Rule id -> "error", "warning", "info" or "off"
+        """
+        severities = severities or {}
+        for rule_id, severity in severities.items():
+            if severity not in SEVERITIES and severity != "off":
+                raise ValueError(f"Unknown severity for {rule_id}: {severity}")
+
+        self.rules: List[Rule] = []
+        for rule in (RULES.values() if rules is None else rules):
+            if isinstance(rule, str):
+                rule = RULES[rule]
+            rule_id = rule.id
+            if severities.get(rule_id) == "off":
+                continue
+            if isinstance(rule, type):
+                rule = rule(severities.get(rule_id))
+            elif rule_id in severities:
+                rule.severity = severities[rule_id]
+            self.rules.append(rule)
+
+        self._dispatch: Dict[str, List[Rule]] = {}
+
+    @property
+    def ruleset_version(self) -> str:
+        """Identifier of the active rules, severities and versions."""
+        return ",".join(f"{rule.id}@{rule.version}:{rule.severity}"
+                        for rule in sorted(self.rules, key=lambda r: r.id))
+
+    def _rules_for(self, widget_type: str) -> List[Rule]:
+        rules = self._dispatch.get(widget_type)
+        if rules is None:
+            rules = [rule for rule in self.rules if rule.matches(widget_type)]
+            self._dispatch[widget_type] = rules
+        return rules
+
+    def run(self, widgets: Dict[str, WidgetInfo], ui_file: Optional[str] = None,
+            frame: Optional[Any] = None, geometry: Optional[Dict[str, Any]] = None) -> List[Finding]:
+        """
+        Run all rules over a widget model.
+
+        Args:
+            widgets: Widget model (pre-order, as extracted by UIComparator)
+            ui_file: Source file, for rules that need it
+            frame: Rendered RGBA frame, for screenshot rules
+            geometry: Rendered widget rects (Live Editor get_widget_geometry)
+
+        Returns:
+            Findings sorted by severity (errors first), in document order
+        """
+        root = next(iter(widgets.values()), None)
+        context = RuleContext(widgets=widgets, root=root, ui_file=ui_file,
+                              frame=frame, geometry=geometry)
+        findings: List[Finding] = []
+
+        for rule in self.rules:
+            rule.start(context)
+
+        rules_for = self._rules_for
+        for widget in widgets.values():
+            for rule in rules_for(widget.type):
+                findings.extend(rule.visit(widget, context))
+
+        for rule in self.rules:
+            findings.extend(rule.finish(context))
+
+        findings.sort(key=lambda f: SEVERITY_ORDER[f.severity])
+        return findings
+
+    def run_file(self, ui_file: str, frame: Optional[Any] = None,
+                 geometry: Optional[Dict[str, Any]] = None) -> List[Finding]:
+        """Parse a .ui file (cached by content hash) and run all rules."""
+        _, widgets = UIComparator()._load_model(ui_file)
+        return self.run(widgets, ui_file, frame, geometry)
+
+
+# ---------------------------------------------------------------------------
+# Built-in rules
+# ---------------------------------------------------------------------------
+
+DEFAULT_NAME_PREFIXES = ("pushButton_", "label_", "lineEdit_")
+
+
+@register_rule
+class EmptyUIRule(Rule):
+    """The top-level widget has no child widgets."""
+    id = "empty-ui"
+    category = "structure"
+    default_severity = "warning"
+    node_types = ()
+
+    def finish(self, context):
+        if len(context.widgets) <= 1:
+            yield self.finding("UI has no widgets", "Add widgets to the UI")
+
+
+@register_rule
+class TopLevelLayoutRule(Rule):
+    """Many top-level widgets placed without a layout."""
+    id = "top-level-layout"
+    category = "layout"
+    default_severity = "info"
+    max_unmanaged = 5
+
+    def start(self, context):
+        self.unmanaged = []
+
+    def visit(self, widget, context):
+        root = context.root
+        if root is not None and widget.parent == root.name and widget.layout is None:
+            self.unmanaged.append(widget.name)
+        return ()
+
+    def finish(self, context):
+        if len(self.unmanaged) > self.max_unmanaged:
+            yield self.finding(
+                f"{len(self.unmanaged)} top-level widgets detected",
+                "Consider using a layout (QVBoxLayout, QHBoxLayout, QGridLayout) to organize widgets",
+                widgets=self.unmanaged)
+
+
+@register_rule
+class DefaultNamesRule(Rule):
+    """Widgets keeping Designer's default object names."""
+    id = "default-names"
+    category = "naming"
+    default_severity = "info"
+    max_default_names = 3
+
+    def start(self, context):
+        self.names = []
+
+    def visit(self, widget, context):
+        if widget.name.startswith(DEFAULT_NAME_PREFIXES):
+            self.names.append(widget.name)
+        return ()
+
+    def finish(self, context):
+        if len(self.names) > self.max_default_names:
+            yield self.finding(
+                f"{len(self.names)} widgets have default names",
+                "Use descriptive names for widgets (e.g., 'loginButton' instead of 'pushButton_1')",
+                widgets=self.names)
+
+
+@register_rule
+class WindowTitleRule(Rule):
+    """Top-level window without a title."""
+    id = "window-title"
+    category = "properties"
+    default_severity = "info"
+    node_types = ()
+
+    def finish(self, context):
+        root = context.root
+        if root is not None and not root.properties.get("windowTitle"):
+            yield self.finding("Window has no title", "Set windowTitle property for better UX",
+                               widget=root.name)
+
+
+@register_rule
+class WindowSizeRule(Rule):
+    """Top-level window very small or larger than a 1080p screen."""
+    id = "window-size"
+    category = "size"
+    default_severity = "warning"
+    node_types = ()
+    min_size = (200, 100)
+    max_size = (1920, 1080)
+
+    def finish(self, context):
+        root = context.root
+        if root is None:
+            return
+        width = root.geometry.get("width", 0)
+        height = root.geometry.get("height", 0)
+        if width < self.min_size[0] or height < self.min_size[1]:
+            yield self.finding(f"Window is very small ({width}x{height})",
+                               "Consider increasing window size for better usability", widget=root.name)
+        elif width > self.max_size[0] or height > self.max_size[1]:
+            yield self.finding(f"Window is very large ({width}x{height})",
+                               "Window might not fit on smaller screens", widget=root.name)
+
+
+@register_rule
+class ButtonTextRule(Rule):
+    """Buttons with neither text nor icon."""
+    id = "button-text"
+    category = "content"
+    default_severity = "warning"
+    node_types = ("*Button",)
+
+    def visit(self, widget, context):
+        if not widget.properties.get("text") and "icon" not in widget.properties:
+            yield self.finding(f"Button '{widget.name}' has no text",
+                               "Add text property to buttons for clarity", widget=widget.name)
+
+
+# Containers that position their children themselves (pages, docks, central widget)
+POSITIONING_CONTAINERS = frozenset({
+    "QMainWindow", "QTabWidget", "QStackedWidget", "QToolBox", "QSplitter",
+    "QScrollArea", "QDockWidget", "QMdiArea", "QWizard"
+})
+
+
+def absolute_rect(widget: WidgetInfo, context: RuleContext) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Rect of a widget placed by its own geometry, relative to its parent.
+
+    Returns:
+        (x, y, width, height), or None for the top-level widget, widgets
+        without geometry and widgets managed by a layout or container
+    """
+    if not widget.geometry or widget.layout is not None or widget.parent is None:
+        return None
+    parent = context.widgets.get(widget.parent)
+    if parent is None or parent.type in POSITIONING_CONTAINERS:
+        return None
+    geometry = widget.geometry
+    return (geometry.get("x", 0), geometry.get("y", 0),
+            geometry.get("width", 0), geometry.get("height", 0))
+
+
+@register_rule
+class WidgetOverlapRule(Rule):
+    """Absolutely placed siblings whose rects overlap (sweep line per parent)."""
+    id = "widget-overlap"
+    category = "layout"
+    default_severity = "warning"
+
+    def start(self, context):
+        self.siblings: Dict[str, List[Tuple[str, Tuple[int, int, int, int]]]] = {}
+
+    def visit(self, widget, context):
+        rect = absolute_rect(widget, context)
+        if rect is not None:
+            self.siblings.setdefault(widget.parent, []).append((widget.name, rect))
+        return ()
+
+    def finish(self, context):
+        for parent, entries in self.siblings.items():
+            rects = [rect for _, rect in entries]
+            for i, j in overlapping_pairs(rects):
+                (name_a, rect_a), (name_b, rect_b) = entries[i], entries[j]
+                x, y, width, height = intersection(rect_a, rect_b)
+                yield self.finding(
+                    f"'{name_a}' overlaps '{name_b}' by {width}x{height}px",
+                    "Move or resize one of the widgets, or place them in a layout",
+                    widget=name_a, other=name_b, parent=parent,
+                    intersection={"x": x, "y": y, "width": width, "height": height})
+
+
+@register_rule
+class OutOfBoundsRule(Rule):
+    """Absolutely placed widgets extending outside their parent's rect."""
+    id = "out-of-bounds"
+    category = "layout"
+    default_severity = "warning"
+
+    def visit(self, widget, context):
+        rect = absolute_rect(widget, context)
+        if rect is None:
+            return
+        # Parents without geometry (e.g. a central widget) take their nearest sized ancestor's size
+        parent = context.widgets.get(widget.parent)
+        while parent is not None and not parent.geometry:
+            parent = context.widgets.get(parent.parent) if parent.parent else None
+        if parent is None:
+            return
+
+        width, height = parent.geometry.get("width", 0), parent.geometry.get("height", 0)
+        overflow = outside_bounds(rect, width, height)
+        if overflow:
+            x, y, w, h = rect
+            fully_outside = x >= width or y >= height or x + w <= 0 or y + h <= 0
+            where = "outside" if fully_outside else "partly outside"
+            yield self.finding(
+                f"'{widget.name}' is {where} its parent '{widget.parent}' ({width}x{height})",
+                "Move the widget inside its parent or enlarge the parent",
+                widget=widget.name, parent=widget.parent, overflow=overflow,
+                fully_outside=fully_outside)
+
+
+def default_engine(severities: Optional[Dict[str, str]] = None) -> RuleEngine:
+    """Engine with all registered rules."""
+    return RuleEngine(severities=severities)
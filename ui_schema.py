@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+UI Schema - Structural validator for the Qt Designer .ui 4.0 format
+
+QUiLoader rejects files with unexpected elements or attributes, and
+silently drops properties whose value element doesn't fit. This module
+checks a .ui tree against a description of the format (after Qt's ui4.xsd)
+without Qt:
+
+- allowed child elements and attributes per element type
+- required children (rect needs x/y/width/height, ...)
+- text of typed leaves (int, bool, double, enum, set)
+- exactly one value element per <property>/<attribute>
+- widget and layout classes (standard Qt classes plus <customwidgets>)
+- value element of well-known properties (geometry is a rect, ...)
+
+SCHEMA is compiled once into ElementType objects whose child tables point
+directly at other ElementTypes, so validation is a single pass with one
+dict lookup per element and attribute.
+
+Usage:
+    python ui_schema.py dialog.ui forms/*.ui
+"""
+
+import argparse
+import re
+import sys
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+
+# Text validators for leaf elements and attributes
+_INT = re.compile(r"\s*[-+]?\d+\s*$")
+_IDENTIFIER = r"\s*[A-Za-z_][\w:]*\s*"
+_ENUM = re.compile(_IDENTIFIER + "$")
+_SET = re.compile(f"({_IDENTIFIER}(\\|{_IDENTIFIER})*)?$")
+
+
+def _is_double(text: str) -> bool:
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+# Each check returns a truthy value for valid text
+TEXT_TYPES: Dict[str, Callable[[str], Any]] = {
+    "text": lambda text: True,
+    "int": _INT.match,
+    "bool": frozenset(("true", "false")).__contains__,
+    "double": _is_double,
+    "enum": _ENUM.match,
+    "set": _SET.match,
+}
+
+
+def _type(attributes: str = "", children: str = "", text: Optional[str] = None,
+          required: str = "", value: bool = False) -> Dict[str, Any]:
+    """
+    Schema entry.
+
+    Args:
+        attributes: "name:type ..." (types from TEXT_TYPES)
+        children: "tag:Type ..." (schema types or TEXT_TYPES for leaves)
+        text: TEXT_TYPES entry for the element text (None: no text)
+        required: Child tags that must be present
+        value: Element holds exactly one child (property-style value)
+    """
+    return {"attributes": attributes, "children": children, "text": text,
+            "required": required, "value": value}
+
+
+# Value elements of <property> and <attribute>
+_VALUES = ("bool:bool color:Color cstring:text cursor:int cursorShape:enum enum:enum "
+           "font:Font iconset:IconSet pixmap:ResourcePixmap palette:Palette point:Point "
+           "rect:Rect set:set locale:Locale sizepolicy:SizePolicy size:Size string:String "
+           "stringlist:StringList number:int float:double double:double date:Date "
+           "time:Time datetime:DateTime pointf:PointF rectf:RectF sizef:SizeF "
+           "longlong:int char:Char url:Url UInt:int uLongLong:int brush:Brush")
+
+_STRING_ATTRIBUTES = "notr:text comment:text extracomment:text id:text"
+_PIXMAP_STATES = " ".join(f"{state}:ResourcePixmap" for state in (
+    "normaloff", "normalon", "disabledoff", "disabledon",
+    "activeoff", "activeon", "selectedoff", "selectedon"))
+
+SCHEMA: Dict[str, Dict[str, Any]] = {
+    "UI": _type(
+        "version:text language:text displayname:text idbasedtr:bool "
+        "connectslotsbyname:bool stdsetdef:int stdSetDef:int",
+        "author:text comment:text exportmacro:text class:text widget:Widget "
+        "layoutdefault:LayoutDefault layoutfunction:LayoutFunction pixmapfunction:text "
+        "customwidgets:CustomWidgets tabstops:TabStops includes:Includes resources:Resources "
+        "connections:Connections designerdata:DesignerData slots:Slots "
+        "buttongroups:ButtonGroups",
+        required="widget"),
+    "Widget": _type(
+        "class:text name:text native:bool",
+        "class:text property:Property attribute:Property row:Row column:Row "
+        "item:Item layout:Layout widget:Widget action:Action actiongroup:ActionGroup "
+        "addaction:AddAction zorder:text"),
+    "Layout": _type(
+        "class:text name:text stretch:text rowstretch:text columnstretch:text "
+        "rowminimumheight:text columnminimumwidth:text",
+        "property:Property attribute:Property item:LayoutItem"),
+    "LayoutItem": _type(
+        "row:int column:int rowspan:int colspan:int alignment:set",
+        "widget:Widget layout:Layout spacer:Spacer"),
+    "Spacer": _type("name:text", "property:Property"),
+    "Item": _type("row:int column:int", "property:Property item:Item"),
+    "Row": _type(children="property:Property"),
+    "Property": _type("name:text stdset:int", _VALUES, value=True),
+    "Action": _type("name:text menu:text", "property:Property attribute:Property"),
+    "ActionGroup": _type("name:text", "action:Action actiongroup:ActionGroup "
+                                      "property:Property attribute:Property"),
+    "AddAction": _type("name:text"),
+    "LayoutDefault": _type("spacing:int margin:int"),
+    "LayoutFunction": _type("spacing:text margin:text"),
+    "CustomWidgets": _type(children="customwidget:CustomWidget"),
+    "CustomWidget": _type(
+        children="class:text extends:text header:Header sizehint:Size addpagemethod:text "
+                 "container:int sizepolicy:SizePolicy pixmap:text script:text "
+                 "properties:text slots:Slots propertyspecifications:PropertySpecifications",
+        required="class"),
+    "Header": _type("location:text", text="text"),
+    "PropertySpecifications": _type(children="tooltip:NamedText stringpropertyspecification:NamedText"),
+    "NamedText": _type("name:text type:text notr:text"),
+    "TabStops": _type(children="tabstop:text"),
+    "Includes": _type(children="include:Include"),
+    "Resources": _type("name:text", "include:Include"),
+    "Include": _type("location:text impldecl:text", text="text"),
+    "Connections": _type(children="connection:Connection"),
+    "Connection": _type(children="sender:text signal:text receiver:text slot:text hints:Hints",
+                        required="sender signal receiver slot"),
+    "Hints": _type(children="hint:Hint"),
+    "Hint": _type("type:text", "x:int y:int"),
+    "DesignerData": _type(children="property:Property"),
+    "Slots": _type(children="signal:text slot:text"),
+    "ButtonGroups": _type(children="buttongroup:ButtonGroup"),
+    "ButtonGroup": _type("name:text", "property:Property attribute:Property"),
+
+    # Property values
+    "String": _type(_STRING_ATTRIBUTES, text="text"),
+    "StringList": _type(_STRING_ATTRIBUTES, "string:text"),
+    "Rect": _type(children="x:int y:int width:int height:int", required="x y width height"),
+    "RectF": _type(children="x:double y:double width:double height:double",
+                   required="x y width height"),
+    "Point": _type(children="x:int y:int", required="x y"),
+    "PointF": _type(children="x:double y:double", required="x y"),
+    "Size": _type(children="width:int height:int", required="width height"),
+    "SizeF": _type(children="width:double height:double", required="width height"),
+    "Color": _type("alpha:int", "red:int green:int blue:int", required="red green blue"),
+    "Font": _type(children="family:text pointsize:int weight:int italic:bool bold:bool "
+                           "underline:bool strikeout:bool antialiasing:bool stylestrategy:text "
+                           "kerning:bool hintingpreference:text fontweight:text"),
+    "SizePolicy": _type("hsizetype:text vsizetype:text",
+                        "hsizetype:int vsizetype:int horstretch:int verstretch:int"),
+    "ResourcePixmap": _type("resource:text alias:text", text="text"),
+    "IconSet": _type("theme:text resource:text", _PIXMAP_STATES, text="text"),
+    "Palette": _type(children="active:ColorGroup inactive:ColorGroup disabled:ColorGroup",
+                     required="active inactive disabled"),
+    "ColorGroup": _type(children="colorrole:ColorRole color:Color"),
+    "ColorRole": _type("role:text", "brush:Brush"),
+    "Brush": _type("brushstyle:text", "color:Color texture:Property gradient:Gradient"),
+    "Gradient": _type("startx:double starty:double endx:double endy:double "
+                      "centralx:double centraly:double focalx:double focaly:double "
+                      "radius:double focalradius:double angle:double type:text "
+                      "spread:text coordinatemode:text", "gradientstop:GradientStop"),
+    "GradientStop": _type("position:double", "color:Color", required="color"),
+    "Locale": _type("language:text country:text"),
+    "Date": _type(children="year:int month:int day:int", required="year month day"),
+    "Time": _type(children="hour:int minute:int second:int", required="hour minute second"),
+    "DateTime": _type(children="hour:int minute:int second:int year:int month:int day:int",
+                      required="hour minute second year month day"),
+    "Char": _type(children="unicode:int", required="unicode"),
+    "Url": _type(children="string:String", required="string"),
+}
+
+# Required attributes per schema type
+REQUIRED_ATTRIBUTES = {
+    "Widget": ("class",),
+    "Layout": ("class",),
+    "Property": ("name",),
+    "ColorRole": ("role",),
+}
+
+WIDGET_CLASSES = frozenset("""
+    QWidget QDialog QMainWindow QFrame Line QLabel QPushButton QToolButton
+    QRadioButton QCheckBox QCommandLinkButton QDialogButtonBox QLineEdit QTextEdit
+    QPlainTextEdit QTextBrowser QSpinBox QDoubleSpinBox QTimeEdit QDateEdit
+    QDateTimeEdit QDial QScrollBar QSlider QKeySequenceEdit QComboBox QFontComboBox
+    QListView QTreeView QTableView QColumnView QUndoView QListWidget QTreeWidget
+    QTableWidget QGroupBox QScrollArea QToolBox QTabWidget QStackedWidget QMdiArea
+    QDockWidget QGraphicsView QCalendarWidget QLCDNumber QProgressBar QOpenGLWidget
+    QQuickWidget QWebEngineView QMenuBar QMenu QToolBar QStatusBar QSplitter
+    QWizard QWizardPage QAxWidget
+""".split())
+
+LAYOUT_CLASSES = frozenset("QVBoxLayout QHBoxLayout QBoxLayout QGridLayout QFormLayout QStackedLayout".split())
+
+# Value elements accepted for well-known properties
+PROPERTY_TYPES: Dict[str, Tuple[str, ...]] = {
+    **{name: ("rect",) for name in ("geometry", "frameGeometry", "normalGeometry")},
+    **{name: ("size",) for name in ("minimumSize", "maximumSize", "baseSize", "sizeIncrement",
+                                    "iconSize", "sizeHint", "gridSize")},
+    **{name: ("string",) for name in ("text", "windowTitle", "toolTip", "statusTip",
+                                      "whatsThis", "styleSheet", "placeholderText", "title",
+                                      "inputMask", "suffix", "prefix", "specialValueText",
+                                      "displayFormat", "accessibleName", "accessibleDescription",
+                                      "html", "plainText", "windowIconText")},
+    **{name: ("bool",) for name in ("enabled", "visible", "checkable", "checked", "readOnly",
+                                    "flat", "autoDefault", "default", "modal", "wordWrap",
+                                    "scaledContents", "openExternalLinks", "autoFillBackground",
+                                    "sortingEnabled", "tristate", "exclusive", "clearButtonEnabled")},
+    **{name: ("number",) for name in ("currentIndex", "maxLength", "maximum", "minimum", "value",
+                                      "singleStep", "pageStep", "spacing", "margin", "indent",
+                                      "lineWidth", "midLineWidth", "maxVisibleItems", "rowCount",
+                                      "columnCount", "horizontalSpacing", "verticalSpacing",
+                                      "leftMargin", "topMargin", "rightMargin", "bottomMargin")},
+    **{name: ("enum",) for name in ("orientation", "frameShape", "frameShadow", "echoMode",
+                                    "layoutDirection", "focusPolicy", "contextMenuPolicy",
+                                    "selectionMode", "selectionBehavior", "sizeConstraint",
+                                    "windowModality", "textFormat", "tabPosition",
+                                    "horizontalScrollBarPolicy", "verticalScrollBarPolicy")},
+    **{name: ("set",) for name in ("alignment", "standardButtons", "textInteractionFlags",
+                                   "labelAlignment", "formAlignment")},
+    "font": ("font",),
+    "palette": ("palette",),
+    "sizePolicy": ("sizepolicy",),
+    "icon": ("iconset",),
+    "windowIcon": ("iconset",),
+    "pixmap": ("pixmap",),
+    "cursor": ("cursor", "cursorShape"),
+    "buddy": ("cstring", "string"),
+    "shortcut": ("string",),
+    "locale": ("locale",),
+}
+
+
+@dataclass
+class SchemaViolation:
+    """One place where a .ui tree doesn't fit the format."""
+    severity: str  # "error" (QUiLoader fails or drops data) or "warning"
+    path: str  # e.g. /ui/widget[Dialog]/property[geometry]/rect
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SchemaValidationError(ValueError):
+    """
+    Raised when a tree fails validation (e.g. on UIManager.save).
+
+    violations holds SchemaViolation and, from UIManager.save, IntegrityIssue
+    entries; both have severity, path and message.
+    """
+
+    def __init__(self, violations: List[SchemaViolation]):
+        self.violations = violations
+        details = "; ".join(f"{v.path}: {v.message}" for v in violations[:5])
+        more = f" (+{len(violations) - 5} more)" if len(violations) > 5 else ""
+        super().__init__(f"Invalid .ui structure: {details}{more}")
+
+
+class ElementType:
+    """Compiled schema entry with direct references to child types."""
+
+    __slots__ = ("name", "attributes", "children", "text", "check", "required", "value",
+                 "required_attributes", "leaf")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.attributes: Dict[str, Tuple[str, Optional[Callable[[str], Any]]]] = {}
+        self.children: Dict[str, "ElementType"] = {}
+        self.text: Optional[str] = None  # TEXT_TYPES name; None: no text allowed
+        self.check: Optional[Callable[[str], Any]] = None  # None: any text passes
+        self.required: Tuple[str, ...] = ()
+        self.value = False
+        self.required_attributes: Tuple[str, ...] = ()
+        self.leaf = False  # no child elements: checked inline by the parent
+
+
+def _pairs(spec: str) -> List[Tuple[str, str]]:
+    return [tuple(item.split(":", 1)) for item in spec.split()]
+
+
+def compile_schema(schema: Dict[str, Dict[str, Any]] = SCHEMA, root: str = "UI") -> ElementType:
+    """
+    Resolve a schema into linked ElementTypes.
+
+    Args:
+        schema: Type name -> _type() entry
+        root: Type of the document element
+
+    Returns:
+        ElementType for the root element
+
+    Raises:
+        ValueError: If the schema references unknown types
+    """
+    types = {name: ElementType(name) for name in schema}
+    leaves: Dict[str, ElementType] = {}
+
+    def leaf(text_type: str) -> ElementType:
+        if text_type not in leaves:
+            element = ElementType(text_type)
+            element.text = text_type
+            element.check = None if text_type == "text" else TEXT_TYPES[text_type]
+            element.leaf = True
+            leaves[text_type] = element
+        return leaves[text_type]
+
+    for name, entry in schema.items():
+        element = types[name]
+        for attribute, text_type in _pairs(entry["attributes"]):
+            if text_type not in TEXT_TYPES:
+                raise ValueError(f"{name}@{attribute}: unknown text type '{text_type}'")
+            element.attributes[attribute] = (text_type, None if text_type == "text" else TEXT_TYPES[text_type])
+        for tag, child_type in _pairs(entry["children"]):
+            if child_type in types:
+                element.children[tag] = types[child_type]
+            elif child_type in TEXT_TYPES:
+                element.children[tag] = leaf(child_type)
+            else:
+                raise ValueError(f"{name}/{tag}: unknown type '{child_type}'")
+        if entry["text"]:
+            element.text = entry["text"]
+            element.check = None if entry["text"] == "text" else TEXT_TYPES[entry["text"]]
+        element.required = tuple(entry["required"].split())
+        element.value = entry["value"]
+        element.required_attributes = REQUIRED_ATTRIBUTES.get(name, ())
+        element.leaf = not (element.children or element.required or element.value
+                            or element.required_attributes)
+
+    return types[root]
+
+
+class UISchemaValidator:
+    """Single-pass structural validator for .ui trees."""
+
+    def __init__(self, schema: Optional[Dict[str, Dict[str, Any]]] = None,
+                 widget_classes: Optional[frozenset] = None,
+                 layout_classes: Optional[frozenset] = None):
+        """
+        Initialize validator.
+
+        Args:
+            schema: Schema to compile (default: SCHEMA)
+            widget_classes: Known widget classes (default: WIDGET_CLASSES);
+                classes declared in <customwidgets> are always accepted
+            layout_classes: Known layout classes (default: LAYOUT_CLASSES)
+        """
+        self.root_type = compile_schema(schema or SCHEMA)
+        self.widget_classes = widget_classes or WIDGET_CLASSES
+        self.layout_classes = layout_classes or LAYOUT_CLASSES
+
+    def validate(self, root: ET.Element) -> List[SchemaViolation]:
+        """
+        Validate a parsed .ui tree.
+
+        Args:
+            root: The <ui> element
+
+        Returns:
+            Violations (errors and warnings)
+        """
+        violations: List[SchemaViolation] = []
+        if root.tag != "ui":
+            return [SchemaViolation("error", f"/{root.tag}", "Root element must be <ui>")]
+        if root.get("version") != "4.0":
+            violations.append(SchemaViolation("warning", "/ui",
+                                              f"Expected version=\"4.0\", got {root.get('version')!r}"))
+
+        def add(severity: str, entry, message: str):
+            violations.append(SchemaViolation(severity, _path(entry), message))
+
+        widget_type = self.root_type.children["widget"]
+        layout_type = widget_type.children["layout"]
+        classes = []  # (entry, class, is_layout), checked once customwidgets are known
+        stack = [(root, self.root_type, None)]
+        pop, push = stack.pop, stack.append
+        while stack:
+            entry = pop()
+            elem, etype, parent = entry
+
+            attrib = elem.attrib
+            text = elem.text
+            if attrib or etype.required_attributes or etype.check is not None \
+                    or (text and not text.isspace()):
+                _check_local(elem, etype, entry, add)
+
+            # Children; leaves are checked here instead of being pushed
+            allowed = etype.children
+            for child in elem:
+                child_type = allowed.get(child.tag)
+                if child_type is None:
+                    add("error", (child, None, entry), f"Unexpected element <{child.tag}> in <{elem.tag}>")
+                elif child_type.leaf and not len(child):
+                    check = child_type.check
+                    if child.attrib or (check is None and child_type.text is None and child.text):
+                        _check_local(child, child_type, (child, child_type, entry), add)
+                    elif check is not None and not check(child.text or ""):
+                        add("error", (child, None, entry),
+                            f"<{child.tag}> must contain {child_type.text}, got {child.text!r}")
+                else:
+                    push((child, child_type, entry))
+
+            if etype.required:
+                missing = [tag for tag in etype.required if elem.find(tag) is None]
+                if missing:
+                    add("error", entry, f"<{elem.tag}> is missing {', '.join(f'<{t}>' for t in missing)}")
+            if etype.value:
+                if len(elem) != 1:
+                    add("error", entry, f"<{elem.tag}> needs exactly one value element, got {len(elem)}")
+                else:
+                    # Value element of well-known properties
+                    expected = PROPERTY_TYPES.get(attrib.get("name"))
+                    if expected and elem[0].tag not in expected and parent[1].name != "Brush":
+                        add("warning", entry, f"Property '{attrib.get('name')}' expects "
+                                              f"{' or '.join(f'<{t}>' for t in expected)}, got <{elem[0].tag}>")
+            elif etype is widget_type or etype is layout_type:
+                if "class" in attrib:
+                    classes.append((entry, attrib["class"], etype is layout_type))
+
+        custom = {elem.text.strip() for elem in root.iterfind("customwidgets/customwidget/class") if elem.text}
+        for entry, class_name, is_layout in classes:
+            known = self.layout_classes if is_layout else self.widget_classes
+            if class_name not in known and class_name not in custom:
+                kind = "layout" if is_layout else "widget"
+                add("error", entry, f"Unknown {kind} class '{class_name}' (not declared in <customwidgets>)")
+
+        return violations
+
+    def validate_file(self, ui_file: str) -> List[SchemaViolation]:
+        """
+        Validate a .ui file.
+
+        Returns:
+            Violations; a single error if the file is not well-formed XML
+        """
+        try:
+            root = ET.parse(ui_file).getroot()
+        except ET.ParseError as e:
+            return [SchemaViolation("error", "/", f"Malformed XML: {e}")]
+        return self.validate(root)
+
+
+def _check_local(elem: ET.Element, etype: ElementType, entry, add):
+    """Check an element's attributes and text against its type."""
+    attrib = elem.attrib
+    if attrib or etype.required_attributes:
+        for attribute, value in attrib.items():
+            spec = etype.attributes.get(attribute)
+            if spec is None:
+                add("error", entry, f"Unexpected attribute '{attribute}' on <{elem.tag}>")
+            elif spec[1] is not None and not spec[1](value):
+                add("error", entry, f"Attribute '{attribute}' must be {spec[0]}, got {value!r}")
+        for attribute in etype.required_attributes:
+            if attribute not in attrib:
+                add("error", entry, f"<{elem.tag}> requires attribute '{attribute}'")
+
+    text = elem.text
+    if etype.check is not None:
+        if not etype.check(text or ""):
+            add("error", entry, f"<{elem.tag}> must contain {etype.text}, got {text!r}")
+    elif text and etype.text is None and not text.isspace():
+        add("error", entry, f"Unexpected text in <{elem.tag}>: {text.strip()[:40]!r}")
+
+
+def _path(entry) -> str:
+    """Path of a stack entry: /ui/widget[Dialog]/property[geometry]/rect."""
+    parts = []
+    while entry is not None:
+        elem = entry[0]
+        name = elem.get("name")
+        parts.append(f"{elem.tag}[{name}]" if name else elem.tag)
+        entry = entry[2]
+    return "/" + "/".join(reversed(parts))
+
+
+_default_validator: Optional[UISchemaValidator] = None
+
+
+def default_validator() -> UISchemaValidator:
+    """Shared validator compiled from SCHEMA on first use."""
+    global _default_validator
+    if _default_validator is None:
+        _default_validator = UISchemaValidator()
+    return _default_validator
+
+
+def validate_ui(source) -> List[SchemaViolation]:
+    """
+    Validate a .ui file path or parsed <ui> element with the default schema.
+
+    Args:
+        source: Path to .ui file or ET.Element
+
+    Returns:
+        List of SchemaViolation
+    """
+    if isinstance(source, ET.Element):
+        return default_validator().validate(source)
+    return default_validator().validate_file(str(source))
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Validate .ui files against the Designer 4.0 format")
+    parser.add_argument("paths", nargs="+", help=".ui files")
+    parser.add_argument("--strict", action="store_true", help="Fail on warnings too")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.paths:
+        violations = validate_ui(path)
+        for violation in violations:
+            print(f"{path}: {violation.severity}: {violation.path}: {violation.message}")
+        if any(v.severity == "error" or args.strict for v in violations):
+            failed = True
+        elif not violations:
+            print(f"{path}: ok")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
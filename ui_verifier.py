@@ -10,30 +10,65 @@ This module provides automatic UI verification by:
 
 import base64
 import json
+import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+import screenshot_analysis  # registers the screenshot rules
 from editor_client import EditorClient
+from image_utils import encode_png, load_image, shared_frame
+from ui_comparator import UIComparator
+from ui_rules import Finding, RuleEngine
+from verification_cache import VerificationCache
+
+
+# Parameters that affect the rendered frame (part of the cache key)
+RENDER_PARAMS = {"renderer": "offscreen", "geometry": True}
 
 
 class UIVerifier:
     """Automatic UI verification system"""
 
-    def __init__(self, editor_port: int = 7010):
+    def __init__(self, editor_port: int = 7010, rules: Optional[List[Any]] = None,
+                 severities: Optional[Dict[str, str]] = None,
+                 cache: Optional[VerificationCache] = None, use_cache: bool = True,
+                 transport: str = "shm"):
         """
         Initialize UI verifier.
 
         Args:
             editor_port: Port where Live UI Editor is running
+            rules: Rule ids, classes or instances (default: all registered rules)
+            severities: Rule id -> severity override ("error", "warning", "info", "off")
+            cache: Verification result cache (default: .ui_cache/verification)
+            use_cache: Reuse results for unchanged files, rules and render params
+            transport: How the editor hands over the frame: "shm" (raw RGBA
+                in shared memory, analyzed in place) or "base64" (PNG);
+                switches to "base64" if a shared frame can't be mapped
         """
         self.editor_port = editor_port
         self.client = EditorClient(port=editor_port)
+        self.engine = RuleEngine(rules, severities)
+        self.cache = (cache or VerificationCache()) if use_cache else None
+        self.transport = transport
 
-    def verify_ui(self, ui_file: str) -> Dict[str, Any]:
+    def verify_ui(self, ui_file: str, save_screenshot: bool = True,
+                  include_screenshot: bool = True) -> Dict[str, Any]:
         """
         Verify a UI file by loading it and analyzing screenshot.
 
+        The rendered frame is analyzed in memory. It is only encoded as PNG
+        when the screenshot is saved or returned.
+
+        Results are cached by the content of the file and its assets, the
+        ruleset and the render params; a cache hit doesn't need the editor.
+
         Args:
             ui_file: Path to .ui file
+            save_screenshot: Write <stem>_verify.png next to the .ui file
+            include_screenshot: Return the screenshot as base64 PNG
 
         Returns:
             Verification result with issues and suggestions
@@ -48,6 +83,27 @@ class UIVerifier:
                 "screenshot": None
             }
 
+        screenshot_path = ui_path.parent / f"{ui_path.stem}_verify.png"
+        keep_png = save_screenshot or include_screenshot
+        cache_key = None
+        if self.cache is not None:
+            try:
+                cache_key = self.cache.key(str(ui_path), self.engine.ruleset_version, RENDER_PARAMS)
+            except (ET.ParseError, OSError) as e:
+                return {
+                    "status": "error",
+                    "message": f"Failed to load UI: {e}",
+                    "issues": [],
+                    "screenshot": None
+                }
+            cached = self.cache.get(cache_key)
+            # Entries stored without a screenshot can't serve callers that want one
+            if cached is not None and (cached[1] is not None or not keep_png):
+                result, png_data = cached
+                result.update({"ui_file": str(ui_file), "cached": True})
+                return self._attach_screenshot(result, png_data, screenshot_path,
+                                               save_screenshot, include_screenshot)
+
         # Check if Live Editor is running
         if not self.client.ping():
             return {
@@ -58,128 +114,125 @@ class UIVerifier:
                 "suggestion": f"Start Live Editor: rez-env pyside6 -- python live_ui_editor.py --ui {ui_file} --port {self.editor_port}"
             }
 
-        # Load UI in editor
-        reload_result = self.client.reload_ui(str(ui_path.absolute()))
-        if not reload_result.get("success"):
+        # Render the file off-screen, with the rendered widget rects
+        render_result = self.client.render_ui(str(ui_path.absolute()), geometry=True,
+                                              transport=self.transport)
+        if render_result.get("status") != "success":
             return {
                 "status": "error",
-                "message": f"Failed to load UI: {reload_result.get('message')}",
+                "message": f"Failed to load UI: {render_result.get('message')}",
                 "issues": [],
                 "screenshot": None
             }
 
-        # Get widget tree for analysis
-        widget_tree = self.client.get_widget_tree()
-
-        # Capture screenshot
-        screenshot_path = ui_path.parent / f"{ui_path.stem}_verify.png"
-        screenshot_result = self.client.take_screenshot(str(screenshot_path))
-
-        screenshot_base64 = None
-        if screenshot_result.get("success") and screenshot_path.exists():
-            with open(screenshot_path, "rb") as f:
-                screenshot_base64 = base64.b64encode(f.read()).decode('utf-8')
-
-        # Analyze for issues
-        issues = self._analyze_ui_structure(widget_tree, ui_path)
-
-        return {
+        # Analyze structure and rendered frame in one rule pass
+        geometry = render_result.get("geometry")
+        screenshot_base64 = render_result.get("screenshot_base64")
+        issues = None
+        if "frame" in render_result:
+            try:
+                with shared_frame(render_result["frame"]) as frame:
+                    issues = self._analyze_ui_structure(ui_path, frame, geometry)
+                    png_data = encode_png(frame) if keep_png else None
+            except OSError:
+                # Segment not visible here (other host or /dev/shm namespace):
+                # have the editor free it and send PNGs from now on
+                self.client.release_frame(render_result["frame"]["shm"])
+                self.transport = "base64"
+                render_result = self.client.render_ui(str(ui_path.absolute()), geometry=True,
+                                                      transport=self.transport)
+                if render_result.get("status") != "success":
+                    return {
+                        "status": "error",
+                        "message": f"Failed to load UI: {render_result.get('message')}",
+                        "issues": [],
+                        "screenshot": None
+                    }
+                geometry = render_result.get("geometry")
+                screenshot_base64 = render_result.get("screenshot_base64")
+        if issues is None:
+            # Base64 transport (or no shared memory here): decode the PNG once
+            png_data = base64.b64decode(screenshot_base64)
+            issues = self._analyze_ui_structure(ui_path, load_image(png_data), geometry)
+        _, widgets = UIComparator()._load_model(str(ui_path))
+
+        result = {
             "status": "success",
             "ui_file": str(ui_file),
-            "screenshot_path": str(screenshot_path) if screenshot_path.exists() else None,
-            "screenshot_base64": screenshot_base64,
-            "widget_count": len(widget_tree.get("widgets", [])),
+            "widget_count": len(widgets),
             "issues": issues,
             "verification_type": "automatic",
             "message": f"Found {len(issues)} potential issues" if issues else "No issues detected"
         }
+        if cache_key is not None:
+            self.cache.put(cache_key, result, png_data if keep_png else None)
+
+        return self._attach_screenshot({**result, "cached": False}, png_data if keep_png else None,
+                                       screenshot_path, save_screenshot, include_screenshot,
+                                       screenshot_base64)
 
-    def _analyze_ui_structure(self, widget_tree: Dict, ui_path: Path) -> List[Dict[str, str]]:
+    @staticmethod
+    def _attach_screenshot(result: Dict[str, Any], png_data: Optional[bytes], screenshot_path: Path,
+                           save: bool, include: bool,
+                           screenshot_base64: Optional[str] = None) -> Dict[str, Any]:
         """
-        Analyze UI structure for common issues.
+        Write and/or embed the screenshot of a verification result.
+
+        Args:
+            result: Verification result (updated in place)
+            png_data: Screenshot PNG bytes, or None if not available
+            screenshot_path: Where to write the screenshot
+            save: Write the screenshot (skipped if the file is already identical)
+            include: Add screenshot_base64 to the result
+            screenshot_base64: Already encoded screenshot, reused if given
+
+        Returns:
+            The result
+        """
+        if png_data is None:
+            return result
+        if save:
+            if not screenshot_path.exists() or screenshot_path.read_bytes() != png_data:
+                screenshot_path.write_bytes(png_data)
+            result["screenshot_path"] = str(screenshot_path)
+        if include:
+            result["screenshot_base64"] = screenshot_base64 or base64.b64encode(png_data).decode('utf-8')
+        return result
+
+    def _analyze_ui_structure(self, ui_path: Path, frame: Optional[np.ndarray] = None,
+                              geometry: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Analyze UI structure (and rendered frame) for common issues.
+
+        Runs the rule engine over the widget model parsed from the .ui file.
 
         Args:
-            widget_tree: Widget tree from Live Editor
             ui_path: Path to UI file
+            frame: Rendered RGBA frame, enables the screenshot rules
+            geometry: Rendered widget rects from the Live Editor
 
         Returns:
             List of issues found
         """
-        issues = []
-        widgets = widget_tree.get("widgets", [])
-
-        # Check 1: Empty UI
-        if not widgets:
-            issues.append({
-                "severity": "warning",
-                "category": "structure",
-                "message": "UI has no widgets",
-                "suggestion": "Add widgets to the UI"
-            })
-            return issues
-
-        # Check 2: Too many top-level widgets (might need layout)
-        top_level_widgets = [w for w in widgets if w.get("parent") == widget_tree.get("root")]
-        if len(top_level_widgets) > 5:
-            issues.append({
-                "severity": "info",
-                "category": "layout",
-                "message": f"{len(top_level_widgets)} top-level widgets detected",
-                "suggestion": "Consider using a layout (QVBoxLayout, QHBoxLayout, QGridLayout) to organize widgets"
-            })
-
-        # Check 3: Widgets with default names
-        default_names = [w for w in widgets if w.get("name", "").startswith(("pushButton_", "label_", "lineEdit_"))]
-        if len(default_names) > 3:
-            issues.append({
-                "severity": "info",
-                "category": "naming",
-                "message": f"{len(default_names)} widgets have default names",
-                "suggestion": "Use descriptive names for widgets (e.g., 'loginButton' instead of 'pushButton_1')"
-            })
-
-        # Check 4: Missing window title
-        root_widget = widget_tree.get("root_properties", {})
-        if not root_widget.get("windowTitle"):
-            issues.append({
-                "severity": "info",
-                "category": "properties",
-                "message": "Window has no title",
-                "suggestion": "Set windowTitle property for better UX"
-            })
-
-        # Check 5: Very small or very large window
-        geometry = root_widget.get("geometry", {})
-        width = geometry.get("width", 0)
-        height = geometry.get("height", 0)
-
-        if width < 200 or height < 100:
-            issues.append({
-                "severity": "warning",
-                "category": "size",
-                "message": f"Window is very small ({width}x{height})",
-                "suggestion": "Consider increasing window size for better usability"
-            })
-        elif width > 1920 or height > 1080:
-            issues.append({
-                "severity": "warning",
-                "category": "size",
-                "message": f"Window is very large ({width}x{height})",
-                "suggestion": "Window might not fit on smaller screens"
-            })
-
-        # Check 6: Buttons without text
-        buttons = [w for w in widgets if w.get("class", "").endswith("Button")]
-        buttons_no_text = [b for b in buttons if not b.get("text")]
-        if buttons_no_text:
-            issues.append({
-                "severity": "warning",
-                "category": "content",
-                "message": f"{len(buttons_no_text)} button(s) have no text",
-                "suggestion": "Add text property to buttons for clarity"
-            })
-
-        return issues
+        return [finding.to_dict() for finding in self.analyze(str(ui_path), frame, geometry)]
+
+    def analyze(self, ui_file: str, frame: Optional[np.ndarray] = None,
+                geometry: Optional[Dict[str, Any]] = None) -> List[Finding]:
+        """
+        Run the verification rules on a .ui file.
+
+        Without a frame only the structural rules produce findings, so no
+        editor is needed.
+
+        Args:
+            ui_file: Path to .ui file
+            frame: Rendered RGBA frame
+            geometry: Rendered widget rects from the Live Editor
+
+        Returns:
+            Findings, errors first
+        """
+        return self.engine.run_file(ui_file, frame, geometry)
 
     def create_verification_report(self, verification_result: Dict) -> str:
         """
@@ -223,9 +276,18 @@ class UIVerifier:
             report.append("")
 
             # Group by severity
+            errors = [i for i in issues if i.get("severity") == "error"]
             warnings = [i for i in issues if i.get("severity") == "warning"]
             infos = [i for i in issues if i.get("severity") == "info"]
 
+            if errors:
+                report.append("ERRORS:")
+                for idx, issue in enumerate(errors, 1):
+                    report.append(f"  {idx}. [{issue.get('category', 'general')}] {issue.get('message')}")
+                    if issue.get('suggestion'):
+                        report.append(f"     → {issue.get('suggestion')}")
+                report.append("")
+
             if warnings:
                 report.append("WARNINGS:")
                 for idx, issue in enumerate(warnings, 1):
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Verification Cache - Memoized UIVerifier results
+
+A verification result depends only on the .ui content, the assets it
+references (images, icons, .qrc files and the files they list, stylesheet
+urls), the active ruleset and the render parameters. Results are stored on
+disk under a key derived from all four, so re-verifying an unchanged file
+returns immediately without talking to the Live Editor.
+
+Layout:
+    <root>/<first 2 hex>/<key>.json   result (without the screenshot)
+    <root>/<first 2 hex>/<key>.png    rendered screenshot
+
+Entries are evicted least recently used first once the cache exceeds
+max_entries or max_bytes; entries older than max_age are dropped too.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from golden_store import hash_file
+
+
+DEFAULT_CACHE_DIR = ".ui_cache/verification"
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600  # seconds
+
+_URL_PATTERN = re.compile(r"url\(\s*['\"]?([^'\")]+)['\"]?\s*\)")
+
+
+def asset_paths(ui_file: str) -> List[str]:
+    """
+    Files a .ui file depends on besides itself.
+
+    Covers pixmap/iconset paths, stylesheet url(...) references, .qrc
+    resource files (included or named by a pixmap/iconset) and the files
+    listed in them. Resource paths (":/...") are covered through their
+    .qrc files.
+
+    Args:
+        ui_file: Path to .ui file
+
+    Returns:
+        Sorted list of asset paths (may include missing files)
+    """
+    base = Path(ui_file).parent
+    references = set()
+    qrc_files = []
+
+    for elem in ET.parse(ui_file).getroot().iter():
+        if elem.tag == "include" and elem.get("location"):
+            qrc_files.append(base / elem.get("location"))
+        elif elem.tag in ("pixmap", "normaloff", "normalon", "disabledoff", "disabledon",
+                          "activeoff", "activeon", "selectedoff", "selectedon", "iconset"):
+            if elem.text and elem.text.strip():
+                references.add(elem.text.strip())
+            if elem.get("resource"):
+                qrc_files.append(base / elem.get("resource"))
+        elif elem.tag == "string" and elem.text and "url(" in elem.text:
+            references.update(_URL_PATTERN.findall(elem.text))
+
+    paths = {str(base / ref) for ref in references if not ref.startswith(":")}
+    for qrc in qrc_files:
+        paths.add(str(qrc))
+        if qrc.is_file():
+            try:
+                for file_elem in ET.parse(qrc).getroot().iter("file"):
+                    if file_elem.text:
+                        paths.add(str(qrc.parent / file_elem.text.strip()))
+            except ET.ParseError:
+                pass
+    return sorted(paths)
+
+
+def content_hash(ui_file: str) -> str:
+    """SHA-256 over the .ui file and all referenced assets."""
+    digest = hashlib.sha256(hash_file(ui_file).encode("ascii"))
+    base = Path(ui_file).parent
+    for path in asset_paths(ui_file):
+        asset_hash = hash_file(path) if Path(path).is_file() else "missing"
+        digest.update(f"\0{os.path.relpath(path, base)}\0{asset_hash}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class VerificationCache:
+    """On-disk verification results with LRU / age eviction."""
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_age: Optional[float] = DEFAULT_MAX_AGE):
+        """
+        Initialize verification cache.
+
+        Args:
+            root: Cache directory (created on first write)
+            max_entries: Entries kept before least recently used are evicted
+            max_bytes: Total bytes kept (results + screenshots)
+            max_age: Seconds since last use after which entries expire (None: never)
+        """
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @staticmethod
+    def key(ui_file: str, ruleset: str, render_params: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key for a file's current content, a ruleset and render params."""
+        params = json.dumps(render_params or {}, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{content_hash(ui_file)}\0{ruleset}\0{params}".encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        directory = self.root / key[:2]
+        return directory / f"{key}.json", directory / f"{key}.png"
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], Optional[bytes]]]:
+        """
+        Fetch a cached result.
+
+        Returns:
+            (result, screenshot PNG bytes or None), or None on a miss
+        """
+        result_path, image_path = self._paths(key)
+        try:
+            with open(result_path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        if self.max_age is not None and time.time() - result_path.stat().st_mtime > self.max_age:
+            self._remove(key)
+            return None
+
+        image = image_path.read_bytes() if image_path.exists() else None
+        os.utime(result_path)  # mark as recently used
+        return result, image
+
+    def put(self, key: str, result: Dict[str, Any], image: Optional[bytes] = None):
+        """Store a result (and its screenshot), then enforce retention."""
+        result_path, image_path = self._paths(key)
+        result_path.parent.mkdir(parents=True, exist_ok=True)
+        if image is not None:
+            tmp_path = image_path.with_suffix(".png.tmp")
+            tmp_path.write_bytes(image)
+            os.replace(tmp_path, image_path)
+        tmp_path = result_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp_path, result_path)
+        self.enforce_retention()
+
+    def _remove(self, key: str):
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def entries(self) -> List[Tuple[str, float, int]]:
+        """(key, last use time, bytes) of all entries."""
+        entries = []
+        for result_path in self.root.glob("*/*.json"):
+            try:
+                stat = result_path.stat()
+            except FileNotFoundError:
+                continue
+            image_path = result_path.with_suffix(".png")
+            size = stat.st_size + (image_path.stat().st_size if image_path.exists() else 0)
+            entries.append((result_path.stem, stat.st_mtime, size))
+        return entries
+
+    def enforce_retention(self) -> List[str]:
+        """
+        Evict expired entries, then least recently used ones until both
+        max_entries and max_bytes are met.
+
+        Returns:
+            Evicted keys
+        """
+        if not self.root.exists():
+            return []
+        now = time.time()
+        entries = sorted(self.entries(), key=lambda entry: entry[1])
+        count, total = len(entries), sum(size for _, _, size in entries)
+
+        evicted = []
+        for key, last_used, size in entries:
+            expired = self.max_age is not None and now - last_used > self.max_age
+            if not expired and count <= self.max_entries and total <= self.max_bytes:
+                continue
+            self._remove(key)
+            evicted.append(key)
+            count -= 1
+            total -= size
+        return evicted
+
+    def clear(self) -> int:
+        """Remove all entries; returns the number removed."""
+        keys = [key for key, _, _ in self.entries()]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
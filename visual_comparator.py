@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Visual Comparator - Pixel-level UI comparison
+
+Renders reference and target UIs through the Live UI Editor and compares
+the frames with vectorized NumPy operations: per-pixel difference, SSIM,
+a heat-map image and bounding boxes of changed regions.
+
+Complements UIComparator, which only compares the XML structure.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+import base64
+import json
+
+import numpy as np
+
+from editor_client import EditorClient
+from golden_store import GoldenImageStore, hash_file
+from image_utils import (ImageSource, load_image, encode_png, luminance, box_filter, find_regions,
+                         shared_frame)
+
+
+# SSIM stabilisation constants for 8-bit data
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+
+# Render params recorded with images produced by the render_ui command
+RENDER_PARAMS = {"renderer": "offscreen"}
+
+
+@dataclass
+class VisualComparisonResult:
+    """Result of a pixel-level comparison."""
+    ssim: float  # 0.0 to 1.0
+    changed_ratio: float  # fraction of pixels above threshold
+    mean_difference: float  # mean absolute difference, 0..255
+    size_match: bool
+    reference_size: Tuple[int, int]
+    target_size: Tuple[int, int]
+    changed_regions: List[Tuple[int, int, int, int]] = field(default_factory=list)
+    heatmap: Optional[np.ndarray] = None
+    heatmap_path: Optional[str] = None
+
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "ssim": self.ssim,
+            "changed_ratio": self.changed_ratio,
+            "mean_difference": self.mean_difference,
+            "size_match": self.size_match,
+            "reference_size": list(self.reference_size),
+            "target_size": list(self.target_size),
+            "changed_regions": [
+                {"x": x, "y": y, "width": w, "height": h}
+                for x, y, w, h in self.changed_regions
+            ],
+            "heatmap_path": self.heatmap_path
+        }
+
+
+class VisualComparator:
+    """Compares rendered UIs pixel by pixel."""
+
+    def __init__(self, editor_port: int = 7010, threshold: int = 16,
+                 ssim_window: int = 7, region_block: int = 8,
+                 client: Optional[EditorClient] = None,
+                 store: Optional[GoldenImageStore] = None,
+                 transport: str = "shm"):
+        """
+        Initialize visual comparator.
+
+        Args:
+            editor_port: Port where Live UI Editor is running
+            threshold: Per-pixel difference (0-255) counted as a change
+            ssim_window: SSIM window size in pixels
+            region_block: Grid size used to group changed pixels into regions
+            client: Optional pre-configured editor client
+            store: Optional golden image store for rendered frames
+            transport: How the editor hands over frames: "shm" (raw RGBA in
+                shared memory, no PNG to decode) or "base64" (PNG); switches
+                to "base64" if a shared frame can't be mapped
+        """
+        self.editor_port = editor_port
+        self.threshold = threshold
+        self.ssim_window = ssim_window
+        self.region_block = region_block
+        self.client = client or EditorClient(port=editor_port)
+        self.store = store
+        self.transport = transport
+
+    def render(self, ui_file: str, use_golden: bool = False) -> np.ndarray:
+        """
+        Render a .ui file through the Live UI Editor.
+
+        Args:
+            ui_file: Path to .ui file
+            use_golden: Return the stored golden image for the file's
+                current content instead of re-rendering, if available
+
+        Returns:
+            RGBA frame as uint8 array
+        """
+        ui_hash = hash_file(ui_file) if self.store is not None else None
+
+        if use_golden and self.store is not None:
+            golden = self.store.get(ui_file, RENDER_PARAMS, ui_hash=ui_hash)
+            if golden is not None:
+                return load_image(golden)
+
+        path = str(Path(ui_file).absolute())
+        response = self.client.render_ui(path, transport=self.transport)
+        if response.get("status") != "success":
+            raise RuntimeError(f"Failed to render {ui_file}: {response.get('message')}")
+
+        if "frame" in response:
+            try:
+                with shared_frame(response["frame"]) as view:
+                    image = view.copy()
+            except OSError:
+                # Segment not visible here (other host or /dev/shm namespace):
+                # have the editor free it and send PNGs from now on
+                self.client.release_frame(response["frame"]["shm"])
+                self.transport = "base64"
+                response = self.client.render_ui(path, transport=self.transport)
+                if response.get("status") != "success":
+                    raise RuntimeError(f"Failed to render {ui_file}: {response.get('message')}")
+            else:
+                if self.store is not None:
+                    self.store.put(ui_file, encode_png(image), RENDER_PARAMS, ui_hash=ui_hash)
+                return image
+
+        png_data = base64.b64decode(response["screenshot_base64"])
+        if self.store is not None:
+            self.store.put(ui_file, png_data, RENDER_PARAMS, ui_hash=ui_hash)
+        return load_image(png_data)
+
+    def compare_files(self, reference_ui: str, target_ui: str,
+                      heatmap_path: Optional[str] = None,
+                      use_golden: bool = True) -> VisualComparisonResult:
+        """
+        Render and compare two .ui files.
+
+        Args:
+            reference_ui: Reference .ui file path
+            target_ui: Target .ui file path
+            heatmap_path: Optional path to write the heat-map PNG
+            use_golden: Fetch the reference from the golden store when possible
+
+        Returns:
+            VisualComparisonResult
+        """
+        return self.compare_images(self.render(reference_ui, use_golden=use_golden),
+                                   self.render(target_ui),
+                                   heatmap_path=heatmap_path)
+
+    def compare_images(self, reference: ImageSource, target: ImageSource,
+                       heatmap_path: Optional[str] = None) -> VisualComparisonResult:
+        """
+        Compare two frames.
+
+        Frames of different size are compared on a shared canvas; the
+        uncovered area counts as changed.
+
+        Args:
+            reference: Reference image (array, PNG bytes, base64 or path)
+            target: Target image (array, PNG bytes, base64 or path)
+            heatmap_path: Optional path to write the heat-map PNG
+
+        Returns:
+            VisualComparisonResult
+        """
+        ref = load_image(reference)
+        tgt = load_image(target)
+        ref_size = (ref.shape[1], ref.shape[0])
+        tgt_size = (tgt.shape[1], tgt.shape[0])
+
+        if ref.shape != tgt.shape:
+            ref, tgt = self._pad_to_common(ref, tgt)
+
+        # Per-pixel difference: max over channels
+        diff = np.abs(ref.astype(np.int16) - tgt.astype(np.int16)).max(axis=2).astype(np.uint8)
+        changed = diff > self.threshold
+
+        result = VisualComparisonResult(
+            ssim=self._ssim(luminance(ref), luminance(tgt)),
+            changed_ratio=float(changed.mean()) if changed.size else 0.0,
+            mean_difference=float(diff.mean()) if diff.size else 0.0,
+            size_match=ref_size == tgt_size,
+            reference_size=ref_size,
+            target_size=tgt_size,
+            changed_regions=find_regions(changed, block=self.region_block),
+            heatmap=self._heatmap(diff, tgt)
+        )
+
+        if heatmap_path:
+            Path(heatmap_path).parent.mkdir(parents=True, exist_ok=True)
+            Path(heatmap_path).write_bytes(encode_png(result.heatmap))
+            result.heatmap_path = str(heatmap_path)
+
+        return result
+
+    def _pad_to_common(self, ref: np.ndarray, tgt: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Pad both frames to the same canvas size with transparent black."""
+        height = max(ref.shape[0], tgt.shape[0])
+        width = max(ref.shape[1], tgt.shape[1])
+        padded = []
+        for image in (ref, tgt):
+            canvas = np.zeros((height, width, 4), dtype=np.uint8)
+            canvas[:image.shape[0], :image.shape[1]] = image
+            padded.append(canvas)
+        return padded[0], padded[1]
+
+    def _ssim(self, ref: np.ndarray, tgt: np.ndarray) -> float:
+        """Mean structural similarity with a uniform window."""
+        window = min(self.ssim_window, ref.shape[0], ref.shape[1])
+        if window < 1:
+            return 1.0
+
+        mu_x = box_filter(ref, window)
+        mu_y = box_filter(tgt, window)
+        sigma_x = box_filter(ref * ref, window) - mu_x * mu_x
+        sigma_y = box_filter(tgt * tgt, window) - mu_y * mu_y
+        sigma_xy = box_filter(ref * tgt, window) - mu_x * mu_y
+
+        numerator = (2 * mu_x * mu_y + _SSIM_C1) * (2 * sigma_xy + _SSIM_C2)
+        denominator = (mu_x * mu_x + mu_y * mu_y + _SSIM_C1) * (sigma_x + sigma_y + _SSIM_C2)
+        return float(np.clip((numerator / denominator).mean(), 0.0, 1.0))
+
+    def _heatmap(self, diff: np.ndarray, background: np.ndarray) -> np.ndarray:
+        """Colorize the difference (black → red → yellow) over a dimmed target."""
+        level = diff.astype(np.float32) / 255.0
+        heat = np.empty(diff.shape + (4,), dtype=np.float32)
+        heat[:, :, 0] = np.clip(level * 3.0, 0.0, 1.0)
+        heat[:, :, 1] = np.clip(level * 3.0 - 1.0, 0.0, 1.0)
+        heat[:, :, 2] = np.clip(level * 3.0 - 2.0, 0.0, 1.0)
+        heat[:, :, 3] = 1.0
+
+        base = luminance(background)[:, :, None] / 255.0 * 0.3
+        alpha = np.clip(level * 4.0, 0.0, 1.0)[:, :, None]
+        heat[:, :, :3] = base * (1.0 - alpha) + heat[:, :, :3] * alpha
+        return (heat * 255.0).astype(np.uint8)
+
+    def generate_report(self, result: VisualComparisonResult) -> str:
+        """
+        Generate human-readable comparison report.
+
+        Args:
+            result: VisualComparisonResult from compare_images()
+
+        Returns:
+            Formatted report string
+        """
+        lines = []
+        lines.append("=" * 70)
+        lines.append("Visual Comparison Report")
+        lines.append("=" * 70)
+        lines.append(f"\n📊 SSIM: {result.ssim:.4f}")
+        lines.append(f"   Changed pixels: {result.changed_ratio:.2%}")
+        lines.append(f"   Mean difference: {result.mean_difference:.2f}")
+
+        if not result.size_match:
+            lines.append(f"\n⚠️  Size mismatch: {result.reference_size[0]}x{result.reference_size[1]}"
+                         f" → {result.target_size[0]}x{result.target_size[1]}")
+
+        if result.changed_regions:
+            lines.append(f"\n🔍 Changed Regions ({len(result.changed_regions)}):")
+            for x, y, w, h in result.changed_regions[:10]:
+                lines.append(f"   - ({x}, {y}) {w}x{h}")
+            if len(result.changed_regions) > 10:
+                lines.append(f"   ... and {len(result.changed_regions) - 10} more")
+
+        if result.heatmap_path:
+            lines.append(f"\n🗺️  Heat-map: {result.heatmap_path}")
+
+        lines.append("\n" + "=" * 70)
+
+        return "\n".join(lines)
+
+
+def main():
+    """Compare two .ui files (via Live Editor) or two PNG screenshots."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pixel-level UI comparison")
+    parser.add_argument("reference", help="Reference .ui or .png")
+    parser.add_argument("target", help="Target .ui or .png")
+    parser.add_argument("--port", type=int, default=7010, help="Live Editor port")
+    parser.add_argument("--threshold", type=int, default=16, help="Per-pixel change threshold")
+    parser.add_argument("--heatmap", help="Write heat-map PNG to this path")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of report")
+    parser.add_argument("--store", help="Golden image store directory (reuse reference renders)")
+    args = parser.parse_args()
+
+    store = GoldenImageStore(args.store) if args.store else None
+    comparator = VisualComparator(editor_port=args.port, threshold=args.threshold, store=store)
+
+    if args.reference.endswith(".ui") or args.target.endswith(".ui"):
+        result = comparator.compare_files(args.reference, args.target, heatmap_path=args.heatmap)
+    else:
+        result = comparator.compare_images(args.reference, args.target, heatmap_path=args.heatmap)
+
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2))
+    else:
+        print(comparator.generate_report(result))
+
+
+if __name__ == "__main__":
+    main()
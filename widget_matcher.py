@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Widget Matcher - Rename-tolerant widget matching
+
+Pairs reference and target widgets by optimal assignment over a cost matrix
+built with NumPy from geometry overlap (IoU), text, parent and name. Widgets
+are blocked by type (or type-equivalence class), so each assignment problem
+only covers widgets that could plausibly be the same.
+
+Uses scipy.optimize.linear_sum_assignment when available, otherwise a
+NumPy implementation of the Hungarian algorithm (shortest augmenting path).
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # Optional dependency
+    linear_sum_assignment = None
+
+from ui_comparator import WidgetInfo
+
+
+# Properties treated as the widget's visible text
+TEXT_PROPERTIES = ("text", "title", "windowTitle", "placeholderText")
+
+DEFAULT_WEIGHTS = {
+    "geometry": 0.4,
+    "text": 0.3,
+    "parent": 0.2,
+    "name": 0.1
+}
+
+# Pairs costing more than this stay unmatched (missing + extra)
+DEFAULT_MAX_COST = 0.6
+
+
+def _widget_text(widget: WidgetInfo) -> Optional[str]:
+    for prop in TEXT_PROPERTIES:
+        value = widget.properties.get(prop)
+        if isinstance(value, str):
+            return value
+    return None
+
+
+def _rect_array(widgets: List[WidgetInfo]) -> np.ndarray:
+    """(n, 4) array of x, y, width, height; NaN rows for missing geometry."""
+    rects = np.full((len(widgets), 4), np.nan)
+    for i, widget in enumerate(widgets):
+        geometry = widget.geometry
+        if geometry:
+            rects[i] = (geometry.get("x", 0), geometry.get("y", 0),
+                        geometry.get("width", 0), geometry.get("height", 0))
+    return rects
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise intersection-over-union of rect arrays.
+
+    Args:
+        a: (n, 4) rects
+        b: (m, 4) rects
+
+    Returns:
+        (n, m) IoU; NaN where either rect is missing
+    """
+    ax0, ay0 = a[:, 0:1], a[:, 1:2]
+    ax1, ay1 = ax0 + a[:, 2:3], ay0 + a[:, 3:4]
+    bx0, by0 = b[None, :, 0], b[None, :, 1]
+    bx1, by1 = bx0 + b[None, :, 2], by0 + b[None, :, 3]
+
+    inter_w = np.clip(np.minimum(ax1, bx1) - np.maximum(ax0, bx0), 0, None)
+    inter_h = np.clip(np.minimum(ay1, by1) - np.maximum(ay0, by0), 0, None)
+    inter = inter_w * inter_h
+    union = a[:, 2:3] * a[:, 3:4] + b[None, :, 2] * b[None, :, 3] - inter
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        iou = np.where(union > 0, inter / union, 1.0)
+    iou[np.isnan(a[:, 0])] = np.nan
+    iou[:, np.isnan(b[:, 0])] = np.nan
+    return iou
+
+
+def _codes(values: List[Optional[str]], vocabulary: Dict[Optional[str], int]) -> np.ndarray:
+    """Map strings to integer codes (shared vocabulary) for vectorized equality."""
+    return np.array([vocabulary.setdefault(v, len(vocabulary)) for v in values], dtype=np.int64)
+
+
+def cost_matrix(reference: List[WidgetInfo], target: List[WidgetInfo],
+                reference_widgets: Dict[str, WidgetInfo],
+                target_widgets: Dict[str, WidgetInfo],
+                weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Matching cost between every reference/target widget of one block.
+
+    Returns:
+        (n, m) cost matrix, 0.0 (identical) to 1.0 (unrelated)
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    total = sum(weights.values()) or 1.0
+
+    # Geometry: 1 - IoU, neutral 0.5 when geometry is missing
+    iou = iou_matrix(_rect_array(reference), _rect_array(target))
+    geometry_cost = np.where(np.isnan(iou), 0.5, 1.0 - iou)
+
+    vocabulary: Dict[Optional[str], int] = {None: 0}
+
+    # Text: equal text 0, both empty 0.5, otherwise 1
+    ref_text = _codes([_widget_text(w) for w in reference], vocabulary)
+    tgt_text = _codes([_widget_text(w) for w in target], vocabulary)
+    text_cost = np.where(ref_text[:, None] == tgt_text[None, :],
+                         np.where(ref_text[:, None] == 0, 0.5, 0.0), 1.0)
+
+    # Parent: same name 0, same type 0.5, otherwise 1
+    ref_parent = _codes([w.parent for w in reference], vocabulary)
+    tgt_parent = _codes([w.parent for w in target], vocabulary)
+    ref_parent_type = _codes([reference_widgets[w.parent].type if w.parent in reference_widgets else None
+                              for w in reference], vocabulary)
+    tgt_parent_type = _codes([target_widgets[w.parent].type if w.parent in target_widgets else None
+                              for w in target], vocabulary)
+    parent_cost = np.where(ref_parent[:, None] == tgt_parent[None, :], 0.0,
+                           np.where(ref_parent_type[:, None] == tgt_parent_type[None, :], 0.5, 1.0))
+
+    # Name: exact match keeps unchanged widgets paired with themselves
+    ref_name = _codes([w.name for w in reference], vocabulary)
+    tgt_name = _codes([w.name for w in target], vocabulary)
+    name_cost = (ref_name[:, None] != tgt_name[None, :]).astype(np.float64)
+
+    return (weights["geometry"] * geometry_cost + weights["text"] * text_cost
+            + weights["parent"] * parent_cost + weights["name"] * name_cost) / total
+
+
+def solve_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum-cost assignment of a rectangular cost matrix.
+
+    Returns:
+        (row indices, column indices) of the assigned pairs
+    """
+    if cost.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    if linear_sum_assignment is not None:
+        return linear_sum_assignment(cost)
+
+    transposed = cost.shape[0] > cost.shape[1]
+    rows, cols = _hungarian(cost.T if transposed else cost)
+    return (cols, rows) if transposed else (rows, cols)
+
+
+def _hungarian(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Hungarian algorithm with potentials, n <= m; inner loop vectorized over columns."""
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)  # p[j]: row (1-based) assigned to column j
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            current = cost[i0 - 1] - u[i0] - v[1:]
+            improve = free & (current < minv[1:])
+            minv[1:][improve] = current[improve]
+            way[1:][improve] = j0
+
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(p[1:])
+    rows = p[1:][cols] - 1
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def match_widgets(reference_widgets: Dict[str, WidgetInfo],
+                  target_widgets: Dict[str, WidgetInfo],
+                  weights: Optional[Dict[str, float]] = None,
+                  max_cost: float = DEFAULT_MAX_COST,
+                  type_classes: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Rename-tolerant optimal matching of reference to target widgets.
+
+    Args:
+        reference_widgets: Reference widget model
+        target_widgets: Target widget model
+        weights: Cost weights (geometry, text, parent, name)
+        max_cost: Pairs above this cost stay unmatched
+        type_classes: Optional widget type -> equivalence class name
+
+    Returns:
+        Dict of reference name -> target name
+    """
+    type_classes = type_classes or {}
+
+    def block_key(widget: WidgetInfo) -> str:
+        return type_classes.get(widget.type, widget.type)
+
+    blocks: Dict[str, Tuple[List[WidgetInfo], List[WidgetInfo]]] = {}
+    for widget in reference_widgets.values():
+        blocks.setdefault(block_key(widget), ([], []))[0].append(widget)
+    for widget in target_widgets.values():
+        blocks.setdefault(block_key(widget), ([], []))[1].append(widget)
+
+    pairs = {}
+    for reference, target in blocks.values():
+        if not reference or not target:
+            continue
+        cost = cost_matrix(reference, target, reference_widgets, target_widgets, weights)
+        rows, cols = solve_assignment(cost)
+        for row, col in zip(rows, cols):
+            if cost[row, col] <= max_cost:
+                pairs[reference[row].name] = target[col].name
+
+    return pairs